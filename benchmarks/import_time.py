@@ -0,0 +1,59 @@
+"""
+Benchmark the cold import time of the project's packages.
+
+Each import runs in a fresh interpreter, so nothing is shared between samples.
+Usage: python benchmarks/import_time.py [--repeat N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+TARGETS = [
+    ("models", "import models"),
+    ("data_io", "import data_io"),
+    ("scraper (lazy package)", "import scraper"),
+    ("scraper.parsing", "import scraper.parsing"),
+    ("cli", "import cli"),
+    ("scraper.scrape_books (Selenium)", "from scraper import scrape_books"),
+]
+
+_PROBE = (
+    "import sys, time; start = time.perf_counter(); {statement}; "
+    "print(time.perf_counter() - start, 'selenium' in sys.modules)"
+)
+
+
+def measure(statement, repeat):
+    samples = []
+    loads_selenium = False
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(statement=statement)],
+            cwd=PROJECT_ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        samples.append(float(output[0]))
+        loads_selenium = output[1] == "True"
+    return statistics.median(samples), loads_selenium
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per target")
+    args = parser.parse_args(argv)
+
+    print(f"{'target':<34} {'median ms':>10}  selenium loaded")
+    for label, statement in TARGETS:
+        seconds, loads_selenium = measure(statement, args.repeat)
+        print(f"{label:<34} {seconds * 1000:>10.1f}  {'yes' if loads_selenium else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
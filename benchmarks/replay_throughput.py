@@ -0,0 +1,62 @@
+"""
+Benchmark scraping and enrichment throughput against the local replay server.
+
+Each configuration scrapes a synthetic library and enriches every book over the
+http backend, with the server adding latency, errors and 429 throttling.
+Usage: python benchmarks/replay_throughput.py [--books N] [--latency S] [--error-rate R] [--rate-limit RPS]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from replay import ReplayServer, ReplaySite  # noqa: E402
+from scraper.enrichment import fill_isbn_and_original_titles  # noqa: E402
+from scraper.profile_scraper import scrape_books  # noqa: E402
+from settings import RunConfig  # noqa: E402
+
+CONFIGURATIONS = [
+    ("sequential", {"workers": 1}),
+    ("4 workers", {"workers": 4}),
+    ("8 workers", {"workers": 8}),
+    ("adaptive 1-16", {"workers": 16, "adaptive": True}),
+]
+
+
+def run(site, options, args):
+    server = ReplayServer(
+        site, latency=args.latency, jitter=args.latency, error_rate=args.error_rate, rate_limit=args.rate_limit,
+        retry_after=0.5, seed=0,
+    )
+    with server, contextlib.redirect_stdout(io.StringIO()):
+        list_url = RunConfig(profile_url=server.profile_url).list_url
+        started = time.perf_counter()
+        books = scrape_books(list_url, log_every=0, backend="http", **options)
+        scraped = time.perf_counter()
+        fill_isbn_and_original_titles(books, min_delay=0, max_delay=0, log_every=0, backend="http", **options)
+        finished = time.perf_counter()
+    return len(books), scraped - started, finished - scraped, dict(server.stats)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--books", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.05, help="server latency and jitter (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="server requests/s before 429; 0 = none")
+    args = parser.parse_args(argv)
+
+    site = ReplaySite.synthetic(books=args.books)
+    print(f"{'configuration':<16} {'books':>6} {'scrape s':>9} {'enrich s':>9} {'books/s':>8}  server")
+    for label, options in CONFIGURATIONS:
+        count, scrape_s, enrich_s, stats = run(site, options, args)
+        print(f"{label:<16} {count:>6} {scrape_s:>9.2f} {enrich_s:>9.2f} {count / enrich_s:>8.1f}  {stats}")
+
+
+if __name__ == "__main__":
+    main()
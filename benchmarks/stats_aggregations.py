@@ -0,0 +1,87 @@
+"""
+Benchmark loading and aggregating a large synthetic multi-profile library.
+
+Writes books CSV exports for several profiles, loads them once, saves the
+columnar form and times reloading it plus every `stats` report.
+Usage: python benchmarks/stats_aggregations.py [--rows N] [--profiles N]
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.book import CSV_HEADERS  # noqa: E402
+from stats import Library, load_library  # noqa: E402
+
+
+def write_profile(path, rows, rng):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, mode="w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_HEADERS)
+        for idx in range(rows):
+            read = rng.random() < 0.7
+            writer.writerow([
+                str(idx),
+                f"Tytuł {rng.randrange(200000)}",
+                f"Autor {rng.randrange(5000)}",
+                "",
+                f"Cykl {rng.randrange(3000)} (tom {rng.randint(1, 8)})" if rng.random() < 0.3 else "",
+                f"{rng.randint(10, 95) / 10}".replace(".", ","),
+                f"{rng.randrange(20000):,}".replace(",", " "),
+                str(rng.randrange(50000)),
+                str(rng.randrange(500)),
+                str(rng.randint(1, 10)) if read else "",
+                f"https://lubimyczytac.pl/ksiazka/{idx}/x",
+                f"Przeczytał: {rng.randint(2005, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" if read else "",
+                "Przeczytane" if read else "Chcę przeczytać",
+                "",
+                "",
+                "",
+                "",
+            ])
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<28} {(time.perf_counter() - start) * 1000:>9.1f} ms")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="total rows across profiles")
+    parser.add_argument("--profiles", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, f"profile-{idx}", "books.csv") for idx in range(args.profiles)]
+        for path in paths:
+            write_profile(path, args.rows // args.profiles, rng)
+
+        library = timed("parse CSV exports", lambda: load_library(paths))
+        columnar = os.path.join(tmp, "columnar")
+        library.save(columnar)
+        library = timed("load columnar", lambda: Library.load(columnar))
+        print(f"{len(library)} rows")
+
+        start = time.perf_counter()
+        timed("books_read_per_year", library.books_read_per_year)
+        timed("rating_distribution", library.rating_distribution)
+        timed("rating_deltas", library.rating_deltas)
+        timed("top_authors", library.top_authors)
+        timed("cycle_completion", library.cycle_completion)
+        timed("one profile per year", lambda: library.books_read_per_year(profile="profile-0"))
+        print(f"{'all reports':<28} {(time.perf_counter() - start) * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+Command-line interface for the Lubimyczytac.pl pipeline.
+
+Usage:
+    lubimy scrape  [--profiles FILE] [--output books.csv]
+    lubimy enrich  [--input books.csv] [--output books_enriched.csv] [--resume]
+    lubimy export  [--input books_enriched.csv] [--output goodreads.csv]
+    lubimy sync    (runs the phases listed in the `steps` setting)
+    lubimy index   --dump FILE [--dump FILE ...] [--output index.sqlite]
+    lubimy coordinate [--profiles FILE] [--resume]   (seed the shared task queue, wait, write CSVs)
+    lubimy worker                                    (run queued tasks; start on any number of hosts)
+
+Every RunConfig setting is also accepted as a flag, e.g. `--workers 4 --rate 2`.
+`--profile [FILE]` times the scraper hot paths and writes a collapsed-stack file.
+Scraper modules are imported inside the commands that need them, so `export`
+never loads Selenium.
+"""
+
+import argparse
+import itertools
+import os
+import re
+import sys
+from dataclasses import replace
+
+from settings import add_config_arguments, load_config
+
+
+def read_profile_list(path):
+    """Read profile URLs from a text file, one per line; blank lines and # comments are skipped."""
+    with open(path, mode="r", encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip() and not line.lstrip().startswith("#")]
+
+
+def profile_key(profile_url):
+    """Return a filesystem-friendly key such as '605200-stokuj' for a profile URL."""
+    match = re.search(r"/profil/(\d+)(?:/([^/?#]+))?", profile_url)
+    if not match:
+        return re.sub(r"[^\w-]+", "_", profile_url).strip("_")
+    return "-".join(part for part in match.groups() if part)
+
+
+def _profile_path(path, profile_url, many):
+    if not many:
+        return path
+    return os.path.join(os.path.dirname(path), profile_key(profile_url), os.path.basename(path))
+
+
+def _profiles(args, config):
+    if args.profiles:
+        return read_profile_list(args.profiles)
+    if not config.profile_url:
+        raise SystemExit("No profile given: set profile_url in config.ini, --profile-url or --profiles.")
+    return [config.profile_url]
+
+
+def _run_scrape(config, profile_url, output):
+    from data_io.csv_utils import save_books_to_csv
+    from scraper.locators import LocatorStats
+    from scraper.page_cache import PageCache
+    from scraper.profile_scraper import scrape_books
+
+    list_url = replace(config, profile_url=profile_url).list_url
+    page_cache = None
+    if config.reuse_pages:
+        page_cache = PageCache(os.path.join(config.cache_dir, "list_pages.sqlite"), list_url)
+    locators_path = os.path.join(config.cache_dir, "locators.json")
+    locator_stats = LocatorStats.load(locators_path) if config.backend == "selenium" else None
+    try:
+        books = scrape_books(
+            list_url,
+            log_every=config.scrape_log_every,
+            parse_workers=config.parse_workers,
+            backend=config.backend,
+            consent_timeout=config.consent_timeout,
+            page_timeout=config.page_timeout,
+            http_timeout=config.http_timeout,
+            http_retries=config.http_retries,
+            rate=config.rate,
+            workers=config.workers,
+            adaptive=config.adaptive,
+            min_workers=config.min_workers,
+            page_cache=page_cache,
+            locator_stats=locator_stats,
+        )
+    finally:
+        if page_cache is not None:
+            page_cache.close()
+        if locator_stats is not None:
+            locator_stats.save(locators_path)
+    save_books_to_csv(books, output)
+    print(f"Scraped {len(books)} books and saved to '{output}'")
+
+
+def _enrich_options(config, cache, resolver):
+    return {
+        "min_delay": config.min_delay,
+        "max_delay": config.max_delay,
+        "log_every": config.enrich_log_every,
+        "parse_workers": config.parse_workers,
+        "backend": config.backend,
+        "workers": config.workers,
+        "rate": config.rate,
+        "timeout": config.http_timeout if config.backend == "http" else config.detail_timeout,
+        "retries": config.http_retries,
+        "adaptive": config.adaptive,
+        "min_workers": config.min_workers,
+        "cache": cache,
+        "resolver": resolver,
+    }
+
+
+def _run_enrich(config, input_file, output, resume=False, cache=None):
+    resolver = None
+    if config.metadata_index and os.path.exists(config.metadata_index):
+        from metadata import DumpIndex
+
+        resolver = DumpIndex(config.metadata_index)
+    try:
+        if config.enrich_window:
+            _run_enrich_streaming(config, input_file, output, resume, _enrich_options(config, cache, resolver))
+        else:
+            _run_enrich_in_memory(config, input_file, output, resume, _enrich_options(config, cache, resolver))
+    finally:
+        if resolver is not None:
+            resolver.close()
+
+
+def _run_enrich_in_memory(config, input_file, output, resume, options):
+    from data_io.csv_utils import load_books_from_csv, save_books_to_csv
+    from scraper.enrichment import fill_isbn_and_original_titles
+
+    books = load_books_from_csv(input_file)
+    print(f"Loaded {len(books)} books from '{input_file}'")
+
+    pending = books
+    if resume and os.path.exists(output):
+        done = {(book.book_id, book.link): book for book in load_books_from_csv(output) if book.title}
+        for idx, book in enumerate(books):
+            books[idx] = done.get((book.book_id, book.link), book)
+        pending = [book for book in books if not book.title]
+        print(f"Resuming: {len(books) - len(pending)} books already enriched in '{output}'")
+
+    fill_isbn_and_original_titles(pending, **options)
+    save_books_to_csv(books, output)
+    print(f"Saved enriched books to '{output}'")
+
+
+def _run_enrich_streaming(config, input_file, output, resume, options):
+    """Enrich through a SQLite queue next to `output`, appending each finished window to it."""
+    from data_io.book_queue import BookQueue
+    from data_io.csv_utils import iter_books_from_csv, save_books_to_csv
+    from scraper.enrichment import iter_enriched_books
+
+    queue_path = os.path.splitext(output)[0] + ".queue.sqlite"
+    with BookQueue(queue_path) as queue:
+        if resume and os.path.exists(output):
+            # The output is the record of what is done, in input order: a window appended just
+            # before a crash may still be queued, and a finished run leaves no queue at all.
+            written = sum(1 for _ in iter_books_from_csv(output))
+            if len(queue):
+                queue.drop(written - queue.done)
+                print(f"Resuming: {len(queue)} books still queued in '{queue_path}'")
+            else:
+                queue.clear(done=written)
+                queued = queue.push(itertools.islice(iter_books_from_csv(input_file), written, None))
+                print(f"Resuming: {written} books already in '{output}', queued {queued} more")
+        else:
+            queue.clear()
+            print(f"Queued {queue.push(iter_books_from_csv(input_file))} books from '{input_file}'")
+            save_books_to_csv([], output)
+
+        window = []
+        for book in iter_enriched_books(queue, window=config.enrich_window, total=len(queue), **options):
+            window.append(book)
+            if len(window) == config.enrich_window:
+                save_books_to_csv(window, output, append=True)
+                queue.ack(len(window))
+                window.clear()
+        save_books_to_csv(window, output, append=True)
+        queue.ack(len(window))
+        finished = len(queue) == 0
+    if finished:
+        os.remove(queue_path)
+    print(f"Saved enriched books to '{output}'")
+
+
+def _run_export(config, input_file, output, report=None):
+    from data_io.csv_utils import convert_books_to_goodreads
+
+    if "goodreads" not in config.output_formats:
+        return
+    if config.goodreads_library:
+        from metadata.goodreads_match import reconcile_goodreads
+
+        report = report or config.match_report_csv
+        statuses = reconcile_goodreads(
+            input_file, config.goodreads_library, output, report, min_score=config.min_match_score
+        )
+        summary = ", ".join(f"{count} {status}" for status, count in sorted(statuses.items()))
+        print(f"Saved reconciled Goodreads export to '{output}' ({summary}); report in '{report}'")
+        return
+    convert_books_to_goodreads(input_file, output)
+    print(f"Saved Goodreads export to '{output}'")
+
+
+def cmd_scrape(args, config):
+    profiles = _profiles(args, config)
+    for profile_url in profiles:
+        _run_scrape(config, profile_url, _profile_path(args.output or config.books_csv, profile_url, len(profiles) > 1))
+
+
+def cmd_enrich(args, config):
+    _run_enrich(config, args.input or config.books_csv, args.output or config.enriched_csv, resume=args.resume)
+
+
+def cmd_export(args, config):
+    _run_export(config, args.input or config.enriched_csv, args.output or config.goodreads_csv)
+
+
+def cmd_sync(args, config):
+    profiles = _profiles(args, config) if "scrape" in config.steps or args.profiles else [config.profile_url]
+    many = len(profiles) > 1
+    cache = None
+    if "enrich" in config.steps:
+        from scraper.dedup import BookDetailsCache
+
+        # Shared across profiles so a book on several lists is fetched once.
+        cache = BookDetailsCache()
+    for profile_url in profiles:
+        books_csv = _profile_path(config.books_csv, profile_url, many)
+        enriched_csv = _profile_path(config.enriched_csv, profile_url, many)
+        if "scrape" in config.steps:
+            _run_scrape(config, profile_url, books_csv)
+        if "enrich" in config.steps:
+            _run_enrich(config, books_csv, enriched_csv, resume=args.resume, cache=cache)
+        if "export" in config.steps:
+            _run_export(
+                config,
+                enriched_csv,
+                _profile_path(config.goodreads_csv, profile_url, many),
+                _profile_path(config.match_report_csv, profile_url, many),
+            )
+
+
+def cmd_index(args, config):
+    from metadata import build_index
+
+    if not args.dump:
+        raise SystemExit("Give at least one --dump FILE to index.")
+    output = args.output or config.metadata_index or os.path.join(config.cache_dir, "metadata_index.sqlite")
+    count = build_index(args.dump, output)
+    print(f"Indexed {count} records from {len(args.dump)} dump file(s) into '{output}'")
+
+
+def cmd_coordinate(args, config):
+    from distributed import TaskQueue, seed, wait_until_finished, write_outputs
+
+    profiles = _profiles(args, config)
+    many = len(profiles) > 1
+    list_urls = {profile_url: replace(config, profile_url=profile_url).list_url for profile_url in profiles}
+    with TaskQueue(config.task_queue) as queue:
+        if not args.resume:
+            queue.clear()
+        added = seed(queue, list_urls.values(), rate=config.rate)
+        print(f"[Coordinator] Queued {added} profiles in '{config.task_queue}'; start `lubimy worker` on each host.")
+        wait_until_finished(queue)
+        for key, error in queue.failures():
+            print(f"[Coordinator] failed: {key}: {error}")
+        for profile_url, list_url in list_urls.items():
+            enriched_csv = _profile_path(config.enriched_csv, profile_url, many)
+            count = write_outputs(queue, list_url, _profile_path(config.books_csv, profile_url, many), enriched_csv)
+            if count is None:
+                print(f"[Coordinator] {profile_url} was not scraped")
+            else:
+                print(f"[Coordinator] Saved {count} enriched books to '{enriched_csv}'")
+
+
+def cmd_worker(args, config):
+    from distributed import Worker
+
+    Worker(config.task_queue, config).run()
+
+
+COMMANDS = {
+    "scrape": (cmd_scrape, "phase 1: scrape profile library lists"),
+    "enrich": (cmd_enrich, "phase 2: add ISBN and original titles"),
+    "export": (cmd_export, "phase 3: write the Goodreads import CSV"),
+    "sync": (cmd_sync, "run the phases listed in `steps`"),
+    "index": (cmd_index, "build the offline metadata index from bibliographic dumps"),
+    "coordinate": (cmd_coordinate, "distributed crawl: queue profiles for workers and collect the results"),
+    "worker": (cmd_worker, "distributed crawl: run queued scrape and book page tasks"),
+}
+
+
+PROFILE_OUTPUT = "dane/profile.collapsed"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="lubimy", description="Lubimyczytac.pl to Goodreads pipeline.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (handler, help_text) in COMMANDS.items():
+        sub = subparsers.add_parser(name, help=help_text)
+        add_config_arguments(sub)
+        sub.add_argument("--profiles", help="file with one profile URL per line (scrape, sync)")
+        sub.add_argument("--input", help="input CSV (defaults to the phase's configured path)")
+        sub.add_argument("--output", help="output CSV (defaults to the phase's configured path)")
+        sub.add_argument("--resume", action="store_true", help="keep finished work: enriched books in the output, or the task queue (coordinate)")
+        sub.add_argument(
+            "--profile",
+            nargs="?",
+            const=PROFILE_OUTPUT,
+            help=f"time scraper hot paths; write a collapsed-stack file (default: {PROFILE_OUTPUT}) and a summary",
+        )
+        if name == "index":
+            sub.add_argument("--dump", action="append", help="Open Library or JSON Lines dump (.gz ok); repeatable")
+        sub.set_defaults(handler=handler)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        config = load_config(args.config, overrides=vars(args))
+    except ValueError as exc:
+        raise SystemExit(f"Configuration error: {exc}")
+    if not args.profile:
+        args.handler(args, config)
+        return 0
+
+    from scraper.profiling import Profiler
+
+    profiler = Profiler()
+    try:
+        with profiler, profiler.section(f"lubimy {args.command}"):
+            args.handler(args, config)
+    finally:
+        if os.path.dirname(args.profile):
+            os.makedirs(os.path.dirname(args.profile), exist_ok=True)
+        profiler.write_collapsed(args.profile)
+        print(profiler.report())
+        print(f"Collapsed stacks written to '{args.profile}' (flamegraph.pl, speedscope, inferno)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
-from data_io.csv_utils import convert_books_to_goodreads, load_books_from_csv, save_books_to_csv
+from data_io.book_queue import BookQueue
+from data_io.csv_utils import convert_books_to_goodreads, iter_books_from_csv, load_books_from_csv, save_books_to_csv
 
-__all__ = ["save_books_to_csv", "load_books_from_csv", "convert_books_to_goodreads"]
+__all__ = ["save_books_to_csv", "load_books_from_csv", "iter_books_from_csv", "convert_books_to_goodreads", "BookQueue"]
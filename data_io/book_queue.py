@@ -0,0 +1,109 @@
+"""
+Module with a file-backed queue of books waiting for enrichment.
+
+`BookQueue` keeps pending Book rows in a SQLite file instead of memory. Rows are
+read back lazily in insertion order and deleted once acknowledged, so a run
+that stops midway resumes with exactly the books that were not written yet.
+The queue also counts the books it has seen done, so a caller that wrote some
+books without acknowledging them can tell how many to drop from its head.
+"""
+
+import itertools
+import json
+import os
+import sqlite3
+from collections import deque
+
+from models import Book
+
+
+class BookQueue:
+    """
+    Pending books stored in SQLite.
+
+    Args:
+        path (str): Queue file; created when missing
+        batch_size (int): Rows read or inserted per SQLite statement
+    """
+
+    def __init__(self, path, batch_size=1000):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS pending (seq INTEGER PRIMARY KEY, row TEXT NOT NULL)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS progress (done INTEGER NOT NULL)")
+        with self._conn:
+            if self._conn.execute("SELECT COUNT(*) FROM progress").fetchone()[0] == 0:
+                self._conn.execute("INSERT INTO progress (done) VALUES (0)")
+        self._issued = deque()
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM pending").fetchone()[0]
+
+    @property
+    def done(self):
+        """Books acknowledged or dropped since `clear`, plus the `done` given to it."""
+        return self._conn.execute("SELECT done FROM progress").fetchone()[0]
+
+    def clear(self, done=0):
+        """Empty the queue; `done` counts books handled before the first one pushed next."""
+        with self._conn:
+            self._conn.execute("DELETE FROM pending")
+            self._conn.execute("UPDATE progress SET done = ?", (done,))
+        self._issued.clear()
+
+    def push(self, books):
+        """Append books (an iterable, consumed in batches); returns how many were added."""
+        added = 0
+        books = iter(books)
+        while True:
+            batch = list(itertools.islice(books, self.batch_size))
+            if not batch:
+                return added
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO pending (row) VALUES (?)", ((json.dumps(book.to_row()),) for book in batch)
+                )
+            added += len(batch)
+
+    def __iter__(self):
+        """Yield pending books in order, reading `batch_size` rows at a time."""
+        last = 0
+        while True:
+            rows = self._conn.execute(
+                "SELECT seq, row FROM pending WHERE seq > ? ORDER BY seq LIMIT ?", (last, self.batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            for seq, row in rows:
+                last = seq
+                self._issued.append(seq)
+                yield Book.from_row(json.loads(row))
+
+    def drop(self, count):
+        """Delete the `count` oldest queued books without handing them out; returns how many were deleted."""
+        with self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM pending WHERE seq IN (SELECT seq FROM pending ORDER BY seq LIMIT ?)", (max(count, 0),)
+            )
+            self._conn.execute("UPDATE progress SET done = done + ?", (cursor.rowcount,))
+        return cursor.rowcount
+
+    def ack(self, count):
+        """Remove the `count` oldest books handed out by iteration, e.g. once they are written."""
+        seqs = [(self._issued.popleft(),) for _ in range(min(count, len(self._issued)))]
+        with self._conn:
+            self._conn.executemany("DELETE FROM pending WHERE seq = ?", seqs)
+            self._conn.execute("UPDATE progress SET done = done + ?", (len(seqs),))
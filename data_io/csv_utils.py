@@ -8,12 +8,21 @@ import os
 from models import Book, CSV_HEADERS
 
 
-def save_books_to_csv(books, filename):
-    """Save book data to a CSV file."""
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
-    with open(filename, mode="w", newline="", encoding="utf-8") as file:
+def save_books_to_csv(books, filename, append=False):
+    """
+    Save book data to a CSV file.
+
+    `books` may be any iterable and is written as it is consumed. With
+    `append=True` rows are added to an existing file (the header is written
+    only when the file is new or empty).
+    """
+    if os.path.dirname(filename):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+    write_header = not append or not os.path.exists(filename) or os.path.getsize(filename) == 0
+    with open(filename, mode="a" if append else "w", newline="", encoding="utf-8") as file:
         writer = csv.writer(file)
-        writer.writerow(CSV_HEADERS)
+        if write_header:
+            writer.writerow(CSV_HEADERS)
         for book in books:
             if isinstance(book, Book):
                 writer.writerow(book.to_row())
@@ -21,60 +30,67 @@ def save_books_to_csv(books, filename):
                 writer.writerow(Book.from_row(book).to_row())
 
 
-def load_books_from_csv(filename):
-    """Load book data from CSV into Book objects."""
-    books = []
+def iter_books_from_csv(filename):
+    """Yield Book objects from a CSV file one row at a time."""
     with open(filename, mode="r", encoding="utf-8") as file:
         reader = csv.reader(file)
         next(reader, None)
         for row in reader:
-            books.append(Book.from_row(row))
-    return books
+            yield Book.from_row(row)
+
+
+def load_books_from_csv(filename):
+    """Load book data from CSV into Book objects."""
+    return list(iter_books_from_csv(filename))
+
+
+GOODREADS_FIELDNAMES = [
+    "Title",
+    "Polish Title",
+    "Author",
+    "ISBN",
+    "My Rating",
+    "Average Rating",
+    "Publisher",
+    "Binding",
+    "Year Published",
+    "Original Publication Year",
+    "Date Read",
+    "Date Added",
+    "Shelves",
+    "Bookshelves",
+    "My Review",
+]
+
+
+def goodreads_row(book):
+    """Map a Book to a Goodreads import row."""
+    return {
+        "Title": book.title,
+        "Polish Title": book.polish_title,
+        "Author": book.author,
+        "ISBN": book.isbn,
+        "My Rating": book.user_rating,
+        "Average Rating": book.avg_rating,
+        "Publisher": book.publisher,
+        "Binding": "",
+        "Year Published": book.year,
+        "Original Publication Year": "",
+        "Date Read": book.read_date,
+        "Date Added": "",
+        "Shelves": book.main_shelves,
+        "Bookshelves": book.other_shelves,
+        "My Review": "",
+    }
 
 
 def convert_books_to_goodreads(input_file, output_file):
     """Convert book data to Goodreads CSV format."""
     books = load_books_from_csv(input_file)
 
-    fieldnames = [
-        "Title",
-        "Polish Title",
-        "Author",
-        "ISBN",
-        "My Rating",
-        "Average Rating",
-        "Publisher",
-        "Binding",
-        "Year Published",
-        "Original Publication Year",
-        "Date Read",
-        "Date Added",
-        "Shelves",
-        "Bookshelves",
-        "My Review",
-    ]
-
     with open(output_file, mode="w", encoding="utf-8", newline="") as outfile:
-        writer = csv.DictWriter(outfile, fieldnames=fieldnames)
+        writer = csv.DictWriter(outfile, fieldnames=GOODREADS_FIELDNAMES)
         writer.writeheader()
 
         for book in books:
-            writer.writerow(
-                {
-                    "Title": book.title,
-                    "Polish Title": book.polish_title,
-                    "Author": book.author,
-                    "ISBN": book.isbn,
-                    "My Rating": book.user_rating,
-                    "Average Rating": book.avg_rating,
-                    "Publisher": "",
-                    "Binding": "",
-                    "Year Published": "",
-                    "Original Publication Year": "",
-                    "Date Read": book.read_date,
-                    "Date Added": "",
-                    "Shelves": book.main_shelves,
-                    "Bookshelves": book.other_shelves,
-                    "My Review": "",
-                }
-            )
+            writer.writerow(goodreads_row(book))
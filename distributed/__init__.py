@@ -0,0 +1,18 @@
+"""
+Distributed crawl: a coordinator and stateless workers sharing a SQLite task queue.
+"""
+
+from distributed.coordinator import collect, seed, wait_until_finished, write_outputs
+from distributed.task_queue import SharedRateLimiter, Task, TaskQueue
+from distributed.worker import Worker
+
+__all__ = [
+    "TaskQueue",
+    "Task",
+    "SharedRateLimiter",
+    "Worker",
+    "seed",
+    "wait_until_finished",
+    "collect",
+    "write_outputs",
+]
@@ -0,0 +1,82 @@
+"""
+Module with the coordinator side of the distributed crawl.
+
+The coordinator seeds one `scrape` task per profile and sets the global
+request rate in the queue. It then waits while workers scrape the lists and
+fetch the book pages they queue. At the end it assembles each profile's books
+and their details into the usual phase 1 and phase 2 CSV files.
+"""
+
+import time
+
+from data_io.csv_utils import save_books_to_csv
+from distributed.task_queue import DONE, FAILED, LEASED, PENDING
+from distributed.worker import SCRAPE, details_key
+from models import Book
+from scraper.dedup import MISSING_DETAILS
+from scraper.parsing import apply_details
+
+
+def scrape_key(list_url):
+    return f"{SCRAPE}:{list_url}"
+
+
+def seed(queue, list_urls, rate=0.0):
+    """
+    Queue a scrape task per profile list URL and store the global request rate.
+
+    Returns:
+        int: Tasks added (list URLs already queued are kept as they are)
+    """
+    queue.set_setting("rate", rate)
+    added = queue.add((scrape_key(url), SCRAPE, {"list_url": url}) for url in list_urls)
+    # Workers started before this point wait for it instead of finding an empty queue finished.
+    queue.set_setting("seeded", True)
+    return added
+
+
+def wait_until_finished(queue, poll=5.0, log=print):
+    """Block until no task is pending or leased, logging progress whenever it changes."""
+    last = None
+    while True:
+        counts = queue.counts()
+        progress = (counts[PENDING], counts[LEASED], counts[DONE], counts[FAILED])
+        if progress != last:
+            log(
+                f"[Coordinator] pending: {counts[PENDING]} | leased: {counts[LEASED]} | "
+                f"done: {counts[DONE]} | failed: {counts[FAILED]}"
+            )
+            last = progress
+        if not counts[PENDING] and not counts[LEASED]:
+            return counts
+        time.sleep(poll)
+
+
+def collect(queue, list_url):
+    """
+    Return the books scraped from `list_url` with the details found by workers applied.
+
+    Returns:
+        tuple[list, list] | None: (scraped books, enriched books), or None when the
+        list was not scraped
+    """
+    rows = queue.result(scrape_key(list_url))
+    if rows is None:
+        return None
+    scraped = [Book.from_row(row) for row in rows]
+    enriched = [Book.from_row(row) for row in rows]
+    for book in enriched:
+        details = queue.result(details_key(book.link)) if book.link else None
+        apply_details(book, *(details or MISSING_DETAILS))
+    return scraped, enriched
+
+
+def write_outputs(queue, list_url, books_csv, enriched_csv):
+    """Write the phase 1 and phase 2 CSV files of one profile; returns the number of books or None."""
+    collected = collect(queue, list_url)
+    if collected is None:
+        return None
+    scraped, enriched = collected
+    save_books_to_csv(scraped, books_csv)
+    save_books_to_csv(enriched, enriched_csv)
+    return len(enriched)
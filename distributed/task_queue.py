@@ -0,0 +1,281 @@
+"""
+Module with the shared task queue behind `lubimy coordinate` and `lubimy worker`.
+
+`TaskQueue` is a SQLite file that every host opens, e.g. on a shared volume.
+Tasks are claimed with a time-limited lease, so the task of a worker that dies
+is handed to another worker once the lease runs out. A task and its result
+are keyed by what they fetch, e.g. `details:ksiazka:123`. Writes are
+idempotent: when two workers end up finishing the same task, the first result
+is kept, and follow-up tasks are only added once.
+
+`SharedRateLimiter` keeps its next free request slot in the same file, so the
+request rate set by the coordinator holds across all workers and hosts.
+
+The file uses SQLite's rollback journal rather than WAL, because WAL needs
+shared memory that network filesystems do not provide.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import NamedTuple
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+class Task(NamedTuple):
+    key: str
+    kind: str
+    payload: dict
+    attempts: int
+    owner: str = ""
+
+
+class TaskQueue:
+    """
+    Tasks, leases and results shared by a coordinator and its workers.
+
+    Args:
+        path (str): SQLite file; created when missing
+        max_attempts (int): Claims per task before it is marked failed
+        timeout (float): Seconds to wait for another host's write lock
+        clock (callable): Wall-clock time; leases must compare across hosts
+    """
+
+    def __init__(self, path, max_attempts=3, timeout=30.0, clock=time.time):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_attempts = max_attempts
+        self._clock = clock
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = DELETE")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                seq INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                owner TEXT,
+                lease_until REAL,
+                error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, seq);
+            CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+            """
+        )
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self):
+        """Transaction that takes the write lock up front, so read-then-update steps are atomic across hosts."""
+        return _Immediate(self._conn)
+
+    def clear(self):
+        with self._write():
+            self._conn.execute("DELETE FROM tasks")
+            self._conn.execute("DELETE FROM results")
+            self._conn.execute("DELETE FROM settings")
+
+    def add(self, tasks):
+        """
+        Queue `(key, kind, payload)` tasks; keys already queued are left as they are.
+
+        Returns:
+            int: Tasks added
+        """
+        with self._write():
+            return self._add(tasks)
+
+    def _add(self, tasks):
+        added = 0
+        for key, kind, payload in tasks:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO tasks (key, kind, payload, state) VALUES (?, ?, ?, ?)",
+                (key, kind, json.dumps(payload, ensure_ascii=False), PENDING),
+            )
+            added += cursor.rowcount
+        return added
+
+    def claim(self, owner, lease=300.0, limit=1, kind=None):
+        """
+        Lease up to `limit` pending tasks, or tasks whose lease ran out, to `owner`.
+
+        Returns:
+            list[Task]: Claimed tasks, oldest first
+        """
+        now = self._clock()
+        query = (
+            "SELECT key, kind, payload, attempts FROM tasks "
+            "WHERE (state = ? OR (state = ? AND lease_until < ?))"
+        )
+        params = [PENDING, LEASED, now]
+        if kind is not None:
+            query += " AND kind = ?"
+            params.append(kind)
+        query += " ORDER BY seq LIMIT ?"
+        params.append(limit)
+
+        claimed = []
+        with self._write():
+            for key, task_kind, payload, attempts in self._conn.execute(query, params).fetchall():
+                if attempts >= self.max_attempts:
+                    self._conn.execute(
+                        "UPDATE tasks SET state = ?, owner = NULL, error = COALESCE(error, 'lease expired') "
+                        "WHERE key = ?",
+                        (FAILED, key),
+                    )
+                    continue
+                self._conn.execute(
+                    "UPDATE tasks SET state = ?, owner = ?, lease_until = ?, attempts = attempts + 1 WHERE key = ?",
+                    (LEASED, owner, now + lease, key),
+                )
+                claimed.append(Task(key, task_kind, json.loads(payload), attempts + 1, owner))
+        return claimed
+
+    def renew(self, task, lease=300.0):
+        """Extend the lease on `task` while `task.owner` still holds it; returns whether it did."""
+        with self._write():
+            cursor = self._conn.execute(
+                "UPDATE tasks SET lease_until = ? WHERE key = ? AND state = ? AND owner = ?",
+                (self._clock() + lease, task.key, LEASED, task.owner),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, task, result, follow_up=()):
+        """
+        Store the result of `task`, mark it done and queue `follow_up` tasks, in one transaction.
+
+        Safe to repeat: a result already stored for the key is kept. A worker whose
+        lease ran out may still complete the task, since its result is as good as
+        the one the new owner would store.
+        """
+        with self._write():
+            self._conn.execute(
+                "INSERT OR IGNORE INTO results (key, value) VALUES (?, ?)",
+                (task.key, json.dumps(result, ensure_ascii=False)),
+            )
+            self._conn.execute(
+                "UPDATE tasks SET state = ?, owner = NULL, lease_until = NULL, error = NULL WHERE key = ?",
+                (DONE, task.key),
+            )
+            self._add(follow_up)
+
+    def fail(self, task, error):
+        """
+        Give `task` back for another attempt, or mark it failed after `max_attempts` claims.
+
+        Only while `task.owner` still holds the lease: once it ran out and another
+        worker claimed the task, a late failure leaves that worker's lease alone.
+        """
+        state = FAILED if task.attempts >= self.max_attempts else PENDING
+        with self._write():
+            self._conn.execute(
+                "UPDATE tasks SET state = ?, owner = NULL, lease_until = NULL, error = ? "
+                "WHERE key = ? AND state = ? AND owner = ?",
+                (state, str(error), task.key, LEASED, task.owner),
+            )
+
+    def result(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row is not None else default
+
+    def counts(self):
+        """Tasks per state, e.g. Counter({'done': 120, 'pending': 30})."""
+        return Counter(dict(self._conn.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall()))
+
+    def failures(self):
+        return self._conn.execute("SELECT key, error FROM tasks WHERE state = ? ORDER BY seq", (FAILED,)).fetchall()
+
+    def finished(self):
+        """True when no task is pending or leased."""
+        counts = self.counts()
+        return not counts[PENDING] and not counts[LEASED]
+
+    def set_setting(self, name, value):
+        with self._write():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO settings (name, value) VALUES (?, ?)", (name, json.dumps(value))
+            )
+
+    def setting(self, name, default=None):
+        row = self._conn.execute("SELECT value FROM settings WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row is not None else default
+
+
+class _Immediate:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type is not None else "COMMIT")
+        return False
+
+
+class SharedRateLimiter:
+    """
+    `RateLimiter` whose next free slot lives in the task queue file.
+
+    Every worker on every host that opens the same file draws its request slots
+    from one schedule, so together they start at most `rate` requests per
+    second. When not given, the rate is the queue's `rate` setting, read again
+    on every request, so workers started before the coordinator seeds the queue
+    (or changes the rate) follow it. Slots are wall-clock times, so hosts need
+    synchronized clocks (NTP).
+    """
+
+    def __init__(self, path, rate=None, clock=time.time, sleep=time.sleep):
+        self.path = path
+        self._rate = rate
+        self._clock = clock
+        self._sleep = sleep
+        self._local = threading.local()
+
+    @property
+    def rate(self):
+        return self._queue().setting("rate", 0.0) if self._rate is None else self._rate
+
+    def _queue(self):
+        # SQLite connections stay in the thread that opened them; fetch threads get their own.
+        queue = getattr(self._local, "queue", None)
+        if queue is None:
+            queue = self._local.queue = TaskQueue(self.path, clock=self._clock)
+        return queue
+
+    def wait(self):
+        """Block until the caller may send its next request."""
+        rate = self.rate
+        if not rate or rate <= 0:
+            return
+        queue = self._queue()
+        with queue._write() as conn:
+            row = conn.execute("SELECT value FROM settings WHERE name = 'next_slot'").fetchone()
+            now = self._clock()
+            slot = max(now, json.loads(row[0]) if row is not None else 0.0)
+            conn.execute(
+                "INSERT OR REPLACE INTO settings (name, value) VALUES ('next_slot', ?)",
+                (json.dumps(slot + 1.0 / rate),),
+            )
+        if slot > now:
+            self._sleep(slot - now)
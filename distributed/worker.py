@@ -0,0 +1,186 @@
+"""
+Module with the stateless worker loop of the distributed crawl.
+
+A worker claims tasks from the shared `TaskQueue`, runs them with the regular
+scraper code and writes the results back:
+
+- `scrape` tasks run `scrape_books` on one profile list and queue a `details`
+  task for every book page they find (once per book id, across all profiles),
+- `details` tasks read the ISBN and original title of one book page.
+
+Everything a worker needs is in the queue and the RunConfig, so any number of
+them can run on any host that sees the queue file; one that dies only delays
+its tasks until their lease runs out. A page that cannot be loaded fails its
+task instead of storing an empty or truncated result, so the task is retried
+and, after its last attempt, reported by the coordinator.
+"""
+
+import os
+import socket
+import threading
+import time
+
+from distributed.task_queue import SharedRateLimiter, TaskQueue
+from scraper.dedup import normalize_book_url
+
+SCRAPE = "scrape"
+DETAILS = "details"
+
+
+def details_key(link):
+    return f"{DETAILS}:{normalize_book_url(link)}"
+
+
+class _Heartbeat(threading.Thread):
+    """Renew the lease on the task that is running, so a long task keeps it."""
+
+    def __init__(self, path, lease):
+        super().__init__(name="lease-heartbeat", daemon=True)
+        self.path = path
+        self.lease = lease
+        self.task = None
+        self.stopped = threading.Event()
+
+    def run(self):
+        with TaskQueue(self.path) as queue:
+            while not self.stopped.wait(self.lease / 3):
+                task = self.task
+                if task is not None:
+                    queue.renew(task, self.lease)
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class Worker:
+    """
+    Claims and runs tasks until the coordinator has seeded the queue and no work is left.
+
+    Args:
+        queue_path (str): Shared TaskQueue file
+        config (RunConfig): Backend, timeouts and delays for scraping
+        owner (str): Lease owner name; host name and process id by default
+        lease (float): Seconds a claimed task stays reserved without renewal
+        batch (int): `details` tasks claimed at a time; `scrape` tasks are always
+            claimed one at a time, since one can run for many minutes
+        poll (float): Seconds to wait when other workers still hold all remaining tasks
+    """
+
+    def __init__(self, queue_path, config, owner=None, lease=300.0, batch=10, poll=2.0):
+        self.queue_path = queue_path
+        self.config = config
+        self.owner = owner or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease = lease
+        self.batch = batch
+        self.poll = poll
+        self.rate_limiter = SharedRateLimiter(queue_path)
+        self._driver = None
+        self._fetcher = None
+
+    def run(self, max_tasks=None):
+        """
+        Work until the queue is seeded and no task is pending or leased, or `max_tasks` tasks are done.
+
+        Returns:
+            dict: Tasks done per kind
+        """
+        done = {SCRAPE: 0, DETAILS: 0}
+        heartbeat = _Heartbeat(self.queue_path, self.lease)
+        heartbeat.start()
+        try:
+            with TaskQueue(self.queue_path) as queue:
+                while max_tasks is None or sum(done.values()) < max_tasks:
+                    # Profiles first, so their books reach the queue early; only the short
+                    # `details` tasks are claimed in batches.
+                    tasks = queue.claim(self.owner, self.lease, limit=1, kind=SCRAPE) or queue.claim(
+                        self.owner, self.lease, limit=self.batch, kind=DETAILS
+                    )
+                    if not tasks:
+                        if queue.setting("seeded", False) and queue.finished():
+                            break
+                        time.sleep(self.poll)
+                        continue
+                    for task in tasks:
+                        heartbeat.task = task
+                        self._run_task(queue, task)
+                        heartbeat.task = None
+                        done[task.kind] = done.get(task.kind, 0) + 1
+        finally:
+            heartbeat.stop()
+            if self._driver is not None:
+                self._driver.quit()
+        print(f"[Worker {self.owner}] done: {done}")
+        return done
+
+    def _run_task(self, queue, task):
+        try:
+            if task.kind == SCRAPE:
+                books = self._scrape(task.payload["list_url"])
+                if not books and not self._list_page_loads(task.payload["list_url"]):
+                    raise RuntimeError("first list page could not be loaded")
+                follow_up = [
+                    (details_key(book.link), DETAILS, {"url": book.link}) for book in books if book.link
+                ]
+                queue.complete(task, [book.to_row() for book in books], follow_up)
+            elif task.kind == DETAILS:
+                queue.complete(task, list(self._details(task.payload["url"])))
+            else:
+                raise ValueError(f"Unknown task kind '{task.kind}'")
+        except Exception as exc:
+            print(f"[Worker {self.owner}] {task.key} failed (attempt {task.attempts}): {exc}")
+            queue.fail(task, exc)
+
+    def _scrape(self, list_url):
+        from scraper.profile_scraper import scrape_books
+
+        config = self.config
+        return scrape_books(
+            list_url,
+            log_every=config.scrape_log_every,
+            parse_workers=config.parse_workers,
+            backend=config.backend,
+            consent_timeout=config.consent_timeout,
+            page_timeout=config.page_timeout,
+            http_timeout=config.http_timeout,
+            http_retries=config.http_retries,
+            workers=config.workers,
+            adaptive=config.adaptive,
+            min_workers=config.min_workers,
+            rate_limiter=self.rate_limiter,
+            strict=True,
+        )
+
+    def _http(self):
+        from scraper.http_backend import HttpFetcher
+
+        if self._fetcher is None:
+            config = self.config
+            self._fetcher = HttpFetcher(
+                timeout=config.http_timeout, rate_limiter=self.rate_limiter, retries=config.http_retries
+            )
+        return self._fetcher
+
+    def _list_page_loads(self, list_url):
+        """Whether the first list page loads, telling an empty library from a failed scrape."""
+        from scraper.http_backend import page_url
+
+        return bool(self._http().fetch(page_url(list_url, 1)))
+
+    def _details(self, url):
+        from scraper.parsing import parse_book_details
+
+        config = self.config
+        if config.backend == "http":
+            html = self._http().fetch(url)
+        else:
+            from scraper.book_details import load_book_page
+            from scraper.enrichment import _build_driver
+
+            if self._driver is None:
+                self._driver = _build_driver()
+            self.rate_limiter.wait()
+            html = load_book_page(self._driver, url, timeout=config.detail_timeout)
+        if not html:
+            raise RuntimeError(f"book page {url} could not be loaded")
+        return parse_book_details(html)
@@ -0,0 +1,16 @@
+"""
+Offline book metadata: normalization helpers, a local bibliographic dump index and
+Goodreads library reconciliation.
+"""
+
+from metadata.dump_index import BibRecord, DumpIndex, build_index
+from metadata.goodreads_match import GoodreadsMatcher, load_goodreads_library, reconcile_goodreads
+
+__all__ = [
+    "BibRecord",
+    "DumpIndex",
+    "build_index",
+    "GoodreadsMatcher",
+    "load_goodreads_library",
+    "reconcile_goodreads",
+]
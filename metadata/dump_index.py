@@ -0,0 +1,313 @@
+"""
+Module for resolving book metadata offline from a bulk bibliographic dump.
+
+`build_index` imports a dump once into an on-disk SQLite index with ISBN-13
+keys and a trigram index over normalized titles. `DumpIndex` then answers
+ISBN and author+title lookups locally, without visiting Lubimyczytac.pl.
+Title lookups only read the postings of a title's rarest trigrams (the index
+stores how many records contain each trigram), so common trigrams such as
+" w " or "ie " that appear in a large share of the dump are never scanned.
+
+Supported dump lines (plain or .gz, formats may be mixed):
+- Open Library dumps: `type<TAB>key<TAB>revision<TAB>last_modified<TAB>JSON`,
+  using /type/edition, /type/work (original title) and /type/author records
+- JSON Lines: {"isbn": [...], "title": ..., "original_title": ...,
+  "authors": ..., "year": ..., "publisher": ...}, e.g. converted National
+  Library records
+"""
+
+import gzip
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import NamedTuple
+
+from metadata.normalize import author_surname, normalize_isbn, normalize_title, similarity, trigrams
+
+
+class BibRecord(NamedTuple):
+    isbn: str
+    title: str
+    original_title: str
+    authors: str
+    year: str
+    publisher: str
+
+
+_SCHEMA = """
+CREATE TABLE records (
+    id INTEGER PRIMARY KEY,
+    isbn TEXT, title TEXT, original_title TEXT, authors TEXT, year TEXT, publisher TEXT,
+    norm_title TEXT, surname TEXT, work_key TEXT, author_keys TEXT, isbns TEXT
+);
+CREATE TABLE isbns (isbn TEXT PRIMARY KEY, record_id INTEGER) WITHOUT ROWID;
+CREATE TABLE trigrams (trigram TEXT, record_id INTEGER, PRIMARY KEY (trigram, record_id)) WITHOUT ROWID;
+CREATE TABLE trigram_counts (trigram TEXT PRIMARY KEY, records INTEGER) WITHOUT ROWID;
+CREATE TABLE ol_works (key TEXT PRIMARY KEY, title TEXT) WITHOUT ROWID;
+CREATE TABLE ol_authors (key TEXT PRIMARY KEY, name TEXT) WITHOUT ROWID;
+"""
+
+_RECORD_COLUMNS = "isbn, title, original_title, authors, year, publisher"
+
+
+def _open_text(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode="rt", encoding="utf-8")
+    return open(path, mode="r", encoding="utf-8")
+
+
+def _year(value):
+    match = re.search(r"\b(1[5-9]\d\d|20\d\d)\b", str(value or ""))
+    return match.group(1) if match else ""
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value if item]
+    return [str(value)]
+
+
+def _edition_row(data):
+    isbns = _as_list(data.get("isbn_13")) + _as_list(data.get("isbn_10"))
+    works = data.get("works") or [{}]
+    author_keys = [author.get("key", "") for author in data.get("authors") or [] if isinstance(author, dict)]
+    return (
+        data.get("title", ""),
+        "",
+        data.get("by_statement", ""),
+        _year(data.get("publish_date")),
+        (_as_list(data.get("publishers")) or [""])[0],
+        works[0].get("key", "") if isinstance(works[0], dict) else "",
+        " ".join(key for key in author_keys if key),
+        " ".join(isbns),
+    )
+
+
+def _generic_row(data):
+    return (
+        data.get("title", ""),
+        data.get("original_title", ""),
+        "; ".join(_as_list(data.get("authors") or data.get("author"))),
+        _year(data.get("year")),
+        (_as_list(data.get("publisher")) or [""])[0],
+        "",
+        "",
+        " ".join(_as_list(data.get("isbn"))),
+    )
+
+
+def _iter_dump(path):
+    """Yield ("record", row), ("work", (key, title)) or ("author", (key, name)) per usable line."""
+    with _open_text(path) as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                if line.startswith("{"):
+                    yield "record", _generic_row(json.loads(line))
+                    continue
+                columns = line.split("\t")
+                kind, data = columns[0], json.loads(columns[-1])
+            except (ValueError, IndexError):
+                continue
+            if kind == "/type/edition":
+                yield "record", _edition_row(data)
+            elif kind == "/type/work":
+                yield "work", (data.get("key", columns[1]), data.get("title", ""))
+            elif kind == "/type/author":
+                yield "author", (data.get("key", columns[1]), data.get("name", ""))
+
+
+def build_index(dump_paths, index_path, batch_size=20000):
+    """
+    Build (or rebuild) the SQLite index at `index_path` from one or more dumps.
+
+    Returns:
+        int: Number of indexed records.
+    """
+    if isinstance(dump_paths, str):
+        dump_paths = [dump_paths]
+    if os.path.dirname(index_path):
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    if os.path.exists(index_path):
+        os.remove(index_path)
+
+    conn = sqlite3.connect(index_path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.executescript(_SCHEMA)
+
+    inserts = {
+        "record": "INSERT INTO records (title, original_title, authors, year, publisher, work_key, author_keys, isbns) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        "work": "INSERT OR REPLACE INTO ol_works VALUES (?, ?)",
+        "author": "INSERT OR REPLACE INTO ol_authors VALUES (?, ?)",
+    }
+    pending = {kind: [] for kind in inserts}
+    for path in dump_paths:
+        for kind, row in _iter_dump(path):
+            pending[kind].append(row)
+            if len(pending[kind]) >= batch_size:
+                conn.executemany(inserts[kind], pending[kind])
+                pending[kind].clear()
+    for kind, rows in pending.items():
+        conn.executemany(inserts[kind], rows)
+
+    # Open Library editions reference works (original title) and authors by key.
+    conn.execute(
+        "UPDATE records SET original_title = "
+        "(SELECT title FROM ol_works WHERE ol_works.key = records.work_key) "
+        "WHERE original_title = '' AND work_key != ''"
+    )
+
+    # Derive lookup columns in id-ordered batches (never update rows under an open cursor).
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            "SELECT id, title, original_title, authors, author_keys, isbns FROM records "
+            "WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, batch_size),
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        authors = _author_names(conn, {key for row in rows if row[4] for key in row[4].split()})
+        updates, isbn_rows, gram_rows = [], [], []
+        for record_id, title, original_title, names, author_keys, isbn_values in rows:
+            if author_keys:
+                names = "; ".join(authors[key] for key in author_keys.split() if authors.get(key)) or names
+            isbns = [isbn for isbn in dict.fromkeys(normalize_isbn(value) for value in isbn_values.split()) if isbn]
+            norm_title = normalize_title(title)
+            updates.append(
+                (isbns[0] if isbns else "", original_title or "", names or "", norm_title, author_surname(names), record_id)
+            )
+            isbn_rows.extend((isbn, record_id) for isbn in isbns)
+            grams = trigrams(norm_title)
+            if original_title and normalize_title(original_title) != norm_title:
+                grams |= trigrams(normalize_title(original_title))
+            gram_rows.extend((gram, record_id) for gram in grams)
+
+        conn.executemany(
+            "UPDATE records SET isbn = ?, original_title = ?, authors = ?, norm_title = ?, surname = ? WHERE id = ?",
+            updates,
+        )
+        conn.executemany("INSERT OR IGNORE INTO isbns VALUES (?, ?)", isbn_rows)
+        conn.executemany("INSERT OR IGNORE INTO trigrams VALUES (?, ?)", gram_rows)
+
+    count = conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+    conn.executescript(
+        "INSERT INTO trigram_counts SELECT trigram, COUNT(*) FROM trigrams GROUP BY trigram; "
+        "DROP TABLE ol_works; DROP TABLE ol_authors; "
+        "UPDATE records SET work_key = NULL, author_keys = NULL, isbns = NULL; "
+        "ANALYZE;"
+    )
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    return count
+
+
+def _author_names(conn, keys, chunk=900):
+    names = {}
+    keys = list(keys)
+    for start in range(0, len(keys), chunk):
+        part = keys[start: start + chunk]
+        placeholders = ",".join("?" * len(part))
+        names.update(conn.execute(f"SELECT key, name FROM ol_authors WHERE key IN ({placeholders})", part))
+    return names
+
+
+class DumpIndex:
+    """
+    Read-only lookups against an index built by `build_index`.
+
+    Args:
+        index_path (str): SQLite index file
+        min_score (float): Minimum title similarity for an author+title match
+        probe (int): Rarest title trigrams whose records become candidates
+        candidates (int): Records sharing the most probed trigrams that get scored
+    """
+
+    def __init__(self, index_path, min_score=0.75, probe=6, candidates=25):
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(f"Metadata index not found: {index_path}")
+        self.index_path = index_path
+        self.min_score = min_score
+        self.probe = probe
+        self.candidates = candidates
+        self._conn = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._has_counts = bool(
+            self._conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'trigram_counts'").fetchone()
+        )
+
+    def close(self):
+        self._conn.close()
+
+    def _record(self, record_id):
+        row = self._conn.execute(f"SELECT {_RECORD_COLUMNS} FROM records WHERE id = ?", (record_id,)).fetchone()
+        return BibRecord(*row) if row else None
+
+    def lookup_isbn(self, isbn):
+        """Return the record for an ISBN-10/13 (any punctuation), or None."""
+        isbn = normalize_isbn(isbn)
+        if not isbn:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT record_id FROM isbns WHERE isbn = ?", (isbn,)).fetchone()
+            return self._record(row[0]) if row else None
+
+    def match(self, title, author=""):
+        """Return the best author+title match scoring at least `min_score`, or None."""
+        norm_title = normalize_title(title)
+        grams = trigrams(norm_title)
+        if not norm_title:
+            return None
+        surname = author_surname(author)
+        with self._lock:
+            probed = self._rarest(grams)
+            if not probed:
+                return None
+            placeholders = ",".join("?" * len(probed))
+            rows = self._conn.execute(
+                f"SELECT record_id FROM trigrams WHERE trigram IN ({placeholders}) "
+                f"GROUP BY record_id ORDER BY COUNT(*) DESC LIMIT ?",
+                (*probed, self.candidates),
+            ).fetchall()
+            best, best_score = None, self.min_score
+            for (record_id,) in rows:
+                record_title, record_original, record_surname = self._conn.execute(
+                    "SELECT norm_title, original_title, surname FROM records WHERE id = ?", (record_id,)
+                ).fetchone()
+                if surname and record_surname and surname != record_surname:
+                    continue
+                score = max(
+                    similarity(grams, trigrams(record_title)),
+                    similarity(grams, trigrams(normalize_title(record_original))),
+                )
+                if score >= best_score:
+                    best, best_score = record_id, score
+            return self._record(best) if best is not None else None
+
+    def _rarest(self, grams):
+        """The `probe` query trigrams found in the fewest records; trigrams no record has are dropped."""
+        if not self._has_counts:
+            # Index built before trigram counts were stored: probe every trigram.
+            return list(grams)
+        placeholders = ",".join("?" * len(grams))
+        rows = self._conn.execute(
+            f"SELECT trigram FROM trigram_counts WHERE trigram IN ({placeholders}) ORDER BY records, trigram LIMIT ?",
+            (*grams, self.probe),
+        ).fetchall()
+        return [gram for (gram,) in rows]
+
+    def resolve(self, book):
+        """Find the record for a Book by ISBN first, then by Polish title and author."""
+        record = self.lookup_isbn(book.isbn) if book.isbn else None
+        return record or self.match(book.polish_title, book.author)
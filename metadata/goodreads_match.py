@@ -0,0 +1,212 @@
+"""
+Module for reconciling exported books with a Goodreads library export.
+
+Goodreads matches imported rows by ISBN or by its own title and author, so rows
+with no ISBN and a Polish title are often not recognized. `GoodreadsMatcher`
+scores each Book against the user's Goodreads export (My Books -> Export
+Library). It uses diacritic-folded title and author keys and blocks candidates
+by ISBN, author surname and rare title trigrams, so every book is compared with
+a handful of entries instead of the whole library.
+"""
+
+import csv
+from collections import Counter, defaultdict
+from typing import NamedTuple
+
+from data_io.csv_utils import GOODREADS_FIELDNAMES, goodreads_row, load_books_from_csv
+from metadata.normalize import author_surname, normalize_isbn, normalize_title, similarity, trigrams
+
+REPORT_HEADERS = [
+    "ID",
+    "Polski Tytuł",
+    "Tytuł",
+    "Autor",
+    "Status",
+    "Match",
+    "Score",
+    "Goodreads Book Id",
+    "Goodreads Title",
+    "Goodreads Author",
+]
+
+
+class GoodreadsEntry(NamedTuple):
+    book_id: str
+    title: str
+    author: str
+    isbn: str
+    year: str
+    publisher: str
+
+
+class Match(NamedTuple):
+    entry: GoodreadsEntry
+    score: float
+    method: str
+
+
+NO_MATCH = Match(None, 0.0, "")
+
+
+def load_goodreads_library(path):
+    """Read a Goodreads library export CSV into GoodreadsEntry records."""
+    entries = []
+    with open(path, mode="r", encoding="utf-8-sig", newline="") as file:
+        for row in csv.DictReader(file):
+            entries.append(
+                GoodreadsEntry(
+                    book_id=(row.get("Book Id") or "").strip(),
+                    title=(row.get("Title") or "").strip(),
+                    author=(row.get("Author") or "").strip(),
+                    isbn=normalize_isbn(row.get("ISBN13") or "") or normalize_isbn(row.get("ISBN") or ""),
+                    year=(row.get("Year Published") or row.get("Original Publication Year") or "").strip(),
+                    publisher=(row.get("Publisher") or "").strip(),
+                )
+            )
+    return entries
+
+
+def _title_keys(title):
+    """Trigram sets for the full normalized title and, if present, the part before a subtitle."""
+    keys = [trigrams(normalize_title(title))]
+    head = (title or "").split(":", 1)[0]
+    if head != title and normalize_title(head):
+        keys.append(trigrams(normalize_title(head)))
+    return [key for key in keys if key]
+
+
+class GoodreadsMatcher:
+    """
+    Blocking index over a Goodreads library export.
+
+    Args:
+        entries (list[GoodreadsEntry]): Goodreads library rows
+        probe (int): Rarest title trigrams used to find candidates when the
+            author surname gives no match
+        candidates (int): Entries sharing the most probed trigrams that get scored
+    """
+
+    def __init__(self, entries, probe=6, candidates=20):
+        self.entries = list(entries)
+        self.probe = probe
+        self.candidates = candidates
+        self._by_isbn = {}
+        self._by_surname = defaultdict(list)
+        self._by_gram = defaultdict(list)
+        self._titles = []
+        self._authors = []
+        for idx, entry in enumerate(self.entries):
+            if entry.isbn:
+                self._by_isbn.setdefault(entry.isbn, idx)
+            self._by_surname[author_surname(entry.author)].append(idx)
+            keys = _title_keys(entry.title)
+            self._titles.append(keys)
+            self._authors.append(trigrams(entry.author))
+            for gram in set().union(*keys):
+                self._by_gram[gram].append(idx)
+
+    def _title_score(self, queries, idx):
+        return max((similarity(query, key) for query in queries for key in self._titles[idx]), default=0.0)
+
+    def _best(self, candidates, queries):
+        best, best_score = None, 0.0
+        for idx in candidates:
+            score = self._title_score(queries, idx)
+            if score > best_score:
+                best, best_score = idx, score
+        return best, best_score
+
+    def match(self, book):
+        """Return the best Match for a Book, or NO_MATCH."""
+        isbn = normalize_isbn(book.isbn)
+        if isbn and isbn in self._by_isbn:
+            return Match(self.entries[self._by_isbn[isbn]], 1.0, "isbn")
+
+        titles = dict.fromkeys(title for title in (book.title, book.polish_title) if title)
+        queries = [key for title in titles for key in _title_keys(title)]
+        if not queries:
+            return NO_MATCH
+
+        surname = author_surname(book.author)
+        if surname and surname in self._by_surname:
+            idx, score = self._best(self._by_surname[surname], queries)
+            if idx is not None and score >= 0.5:
+                return Match(self.entries[idx], score, "author+title")
+
+        # Surname spelled differently (transliteration, pen name): block on the
+        # rarest title trigrams and let author similarity weigh the score.
+        grams = sorted(set().union(*queries), key=lambda gram: len(self._by_gram.get(gram, ())))
+        overlap = Counter()
+        for gram in grams[: self.probe]:
+            overlap.update(self._by_gram.get(gram, ()))
+        idx, score = self._best((idx for idx, _ in overlap.most_common(self.candidates)), queries)
+        if idx is None:
+            return NO_MATCH
+        author_grams = trigrams(book.author)
+        if author_grams and self._authors[idx]:
+            score *= 0.5 + 0.5 * similarity(author_grams, self._authors[idx])
+        else:
+            score *= 0.9
+        return Match(self.entries[idx], score, "title")
+
+
+def reconcile_goodreads(input_file, library_file, output_file, report_file, min_score=0.8, review_score=0.6):
+    """
+    Write a Goodreads import CSV whose rows carry Goodreads' own title, author and ISBN where matched.
+
+    Matches scoring at least `min_score` are applied; those between `review_score`
+    and `min_score` are reported as "review" but left unchanged. Every book gets a
+    line in `report_file` with its status, match method and score.
+
+    Returns:
+        Counter: Books per status ("matched", "review", "unmatched").
+    """
+    books = load_books_from_csv(input_file)
+    matcher = GoodreadsMatcher(load_goodreads_library(library_file))
+    statuses = Counter()
+
+    with (
+        open(output_file, mode="w", encoding="utf-8", newline="") as outfile,
+        open(report_file, mode="w", encoding="utf-8", newline="") as reportfile,
+    ):
+        writer = csv.DictWriter(outfile, fieldnames=["Book Id", *GOODREADS_FIELDNAMES])
+        writer.writeheader()
+        report = csv.writer(reportfile)
+        report.writerow(REPORT_HEADERS)
+
+        for book in books:
+            entry, score, method = matcher.match(book)
+            row = {"Book Id": "", **goodreads_row(book)}
+            if entry is not None and score >= min_score:
+                status = "matched"
+                row.update(
+                    {
+                        "Book Id": entry.book_id,
+                        "Title": entry.title,
+                        "Author": entry.author,
+                        "ISBN": book.isbn or entry.isbn,
+                        "Publisher": book.publisher or entry.publisher,
+                        "Year Published": book.year or entry.year,
+                    }
+                )
+            elif entry is not None and score >= review_score:
+                status = "review"
+            else:
+                status = "unmatched"
+            statuses[status] += 1
+            writer.writerow(row)
+            report.writerow(
+                [
+                    book.book_id,
+                    book.polish_title,
+                    book.title,
+                    book.author,
+                    status,
+                    method,
+                    f"{score:.3f}",
+                    entry.book_id if entry else "",
+                    entry.title if entry else "",
+                    entry.author if entry else "",
+                ]
+            )
+    return statuses
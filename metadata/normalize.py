@@ -0,0 +1,71 @@
+"""
+Module with normalization helpers for matching books across sources.
+"""
+
+import re
+import unicodedata
+
+# Letters that NFKD does not decompose into a base letter plus a combining mark.
+_FOLD = str.maketrans({"ł": "l", "Ł": "L", "ø": "o", "Ø": "O", "đ": "d", "Đ": "D", "ß": "ss", "æ": "ae", "œ": "oe"})
+
+
+def fold_diacritics(text):
+    """Strip accents and Polish diacritics: 'Wiedźmin. Ostatnie życzenie' -> 'Wiedzmin. Ostatnie zyczenie'."""
+    decomposed = unicodedata.normalize("NFKD", (text or "").translate(_FOLD))
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def normalize_text(text):
+    """Lowercase, diacritic-folded text with punctuation collapsed to single spaces."""
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", fold_diacritics(text).lower()).split())
+
+
+def normalize_title(title):
+    """Normalized title without series markers such as '(tom 1)', '(Book 2)' or Goodreads' '(The Witcher, #1)'."""
+    return normalize_text(
+        re.sub(r"\((?:tom|t\.|vol\.?|book|#)[^)]*\)|\([^)]*#\s*\d[^)]*\)", " ", title or "", flags=re.IGNORECASE)
+    )
+
+
+def author_surname(author):
+    """Normalized surname of the first author ('Sapkowski, Andrzej' and 'Andrzej Sapkowski' both give 'sapkowski')."""
+    first = re.split(r";|&|\s+(?:i|and)\s+", author or "", maxsplit=1)[0]
+    head = first.split(",", 1)[0]
+    words = normalize_text(head).split()
+    if not words:
+        return ""
+    # "Surname, Given" keeps the surname first; "Given Surname" keeps it last.
+    return words[0] if "," in first and len(words) == 1 else words[-1]
+
+
+def trigrams(text):
+    """Character trigrams of normalized text, padded so short words still produce some."""
+    text = f"  {normalize_text(text)} "
+    return {text[idx: idx + 3] for idx in range(len(text) - 2)}
+
+
+def similarity(left, right):
+    """Dice coefficient of two trigram sets (0.0 - 1.0)."""
+    if not left or not right:
+        return 0.0
+    return 2.0 * len(left & right) / (len(left) + len(right))
+
+
+def isbn10_to_13(isbn10):
+    core = "978" + isbn10[:9]
+    total = sum(int(digit) * (1 if idx % 2 == 0 else 3) for idx, digit in enumerate(core))
+    return core + str((10 - total % 10) % 10)
+
+
+def normalize_isbn(value):
+    """
+    Return the ISBN-13 form of an ISBN-10 or ISBN-13, or "" if it is not one.
+
+    Hyphens, spaces and Goodreads-style `="..."` wrappers are ignored.
+    """
+    cleaned = re.sub(r"[^0-9Xx]", "", value or "").upper()
+    if len(cleaned) == 13 and cleaned.isdigit():
+        return cleaned
+    if len(cleaned) == 10 and cleaned[:9].isdigit():
+        return isbn10_to_13(cleaned)
+    return ""
@@ -18,6 +18,8 @@ CSV_HEADERS = [
     "Na półkach Główne",
     "Na półkach Pozostałe",
     "Tytuł",
+    "Wydawnictwo",
+    "Rok wydania",
 ]
 
 
@@ -38,6 +40,8 @@ class Book:
     main_shelves: str = ""
     other_shelves: str = ""
     title: str = ""
+    publisher: str = ""
+    year: str = ""
 
     def to_row(self) -> List[str]:
         return [
@@ -56,6 +60,8 @@ class Book:
             self.main_shelves,
             self.other_shelves,
             self.title,
+            self.publisher,
+            self.year,
         ]
 
     @classmethod
@@ -77,4 +83,6 @@ class Book:
             main_shelves=padded[12],
             other_shelves=padded[13],
             title=padded[14],
+            publisher=padded[15],
+            year=padded[16],
         )
@@ -0,0 +1,8 @@
+"""
+Local stand-in for Lubimyczytac.pl used by integration tests and load runs.
+"""
+
+from replay.server import ReplayServer
+from replay.site import ReplaySite, record_site
+
+__all__ = ["ReplayServer", "ReplaySite", "record_site"]
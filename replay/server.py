@@ -0,0 +1,213 @@
+"""
+Module with a local HTTP server that stands in for Lubimyczytac.pl.
+
+`ReplayServer` serves a `ReplaySite` on 127.0.0.1 with the same URL shapes as
+the live site: `/profil/<id>/<name>/biblioteczka/lista?page=N&...` for list
+pages and `/ksiazka/<id>/<slug>` for book pages. Latency, random server errors
+and 429 throttling are configurable, so both scraper backends can be run end to
+end and measured without network access.
+
+Usage:
+    python -m replay.server --books 600 --latency 0.05 --error-rate 0.02 --rate-limit 20
+"""
+
+import argparse
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from replay.site import SITE_ORIGIN, ReplaySite
+
+PROFILE_PATH = "/profil/1/replay"
+
+_LIST_PATH = re.compile(r"^/profil/[^/]+(?:/[^/]+)?/biblioteczka/lista/?$")
+_BOOK_PATH = re.compile(r"^/ksiazka/(\d+)")
+
+
+class ReplayServer:
+    """
+    Threaded replay server; use as a context manager or call `start` / `stop`.
+
+    Args:
+        site (ReplaySite): Pages to serve; a small synthetic site by default
+        latency (float): Seconds added to every response
+        jitter (float): Extra random latency, uniform in [0, jitter]
+        error_rate (float): Share of requests answered with HTTP 500
+        rate_limit (float): Requests per second served before answering 429;
+            0 disables throttling
+        retry_after (float): `Retry-After` seconds sent with 429 responses
+        port (int): Port on 127.0.0.1; 0 picks a free one, stored here once started
+        seed (int): Seed for the error and jitter draws
+    """
+
+    def __init__(
+        self,
+        site=None,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        rate_limit=0.0,
+        retry_after=1.0,
+        port=0,
+        seed=None,
+    ):
+        self.site = site or ReplaySite.synthetic()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.port = port
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def profile_url(self):
+        """Profile URL to use as `RunConfig.profile_url`."""
+        return self.url + PROFILE_PATH
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", self.port), _handler_for(self))
+        self.port = self._httpd.server_address[1]
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _throttled(self):
+        if not self.rate_limit:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start, self._window_count = now, 0
+            self._window_count += 1
+            return self._window_count > self.rate_limit
+
+    def _count(self, outcome):
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def _draw(self):
+        with self._lock:
+            return self._random.random(), self._random.random()
+
+    def respond(self, path, query):
+        """
+        Decide the response for one request.
+
+        Returns:
+            tuple[int, dict, str]: (status, headers, body)
+        """
+        error_draw, jitter_draw = self._draw()
+        time.sleep(self.latency + self.jitter * jitter_draw)
+
+        if self._throttled():
+            self._count("throttled")
+            return 429, {"Retry-After": f"{self.retry_after:g}"}, "Too Many Requests"
+        if error_draw < self.error_rate:
+            self._count("errors")
+            return 500, {}, "Internal Server Error"
+
+        if _LIST_PATH.match(path):
+            page = int((query.get("page") or ["1"])[0] or 1)
+            self._count("list")
+            return 200, {}, self._localize(self.site.list_page(page))
+        match = _BOOK_PATH.match(path)
+        if match:
+            body = self.site.book_page(match.group(1))
+            if body is not None:
+                self._count("book")
+                return 200, {}, self._localize(body)
+        self._count("not_found")
+        return 404, {}, "Not Found"
+
+    def _localize(self, body):
+        # Recorded pages link to the live site; keep navigation on the replay server.
+        return body.replace(SITE_ORIGIN, self.url)
+
+
+def _handler_for(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            status, headers, body = server.respond(parts.path, parse_qs(parts.query))
+            payload = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Lubimyczytac.pl pages locally for tests and load runs.")
+    parser.add_argument("--pages", help="directory with recorded pages (list/page-N.html, books/<id>.html)")
+    parser.add_argument("--books", type=int, default=90, help="synthetic library size when --pages is not given")
+    parser.add_argument("--per-page", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    site = ReplaySite.from_directory(args.pages) if args.pages else ReplaySite.synthetic(args.books, args.per_page)
+    server = ReplayServer(
+        site,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        port=args.port,
+    ).start()
+    print(f"Replaying {len(site.list_pages)} list pages and {len(site.book_pages)} book pages")
+    print(f"Profile URL: {server.profile_url}")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"Served: {dict(server.stats)}")
+
+
+if __name__ == "__main__":
+    main()
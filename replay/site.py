@@ -0,0 +1,227 @@
+"""
+Module with the pages served by the replay server.
+
+A `ReplaySite` holds profile-list pages and book pages. It can be loaded from
+pages recorded off Lubimyczytac.pl (`record_site`) or generated with
+`ReplaySite.synthetic`, which renders cards in the same DOM shape the scrapers
+read (`authorAllBooks__single` cards, a `next-page` paginator and
+`#book-details` book pages).
+"""
+
+import html
+import os
+import random
+import re
+
+SITE_ORIGIN = "https://lubimyczytac.pl"
+
+_SHELVES = ["Przeczytane", "Teraz czytam", "Chcę przeczytać"]
+_OWN_SHELVES = ["Fantasy", "Kryminał", "Reportaż", "Ulubione", "2023"]
+_NAMES = ["Andrzej", "Olga", "Stanisław", "Wisława", "Jacek", "Magdalena", "Frank", "Ursula"]
+_SURNAMES = ["Sapkowski", "Tokarczuk", "Lem", "Szymborska", "Dukaj", "Kozak", "Herbert", "Le Guin"]
+_WORDS = ["Ostatnie", "życzenie", "miecz", "przeznaczenia", "księgi", "jakubowe", "czarne", "oceany", "lód", "zamek"]
+
+
+def render_card(book):
+    """Render one library card the way profile list pages do."""
+    shelves = "".join(f'<a href="#">{html.escape(name)}</a>' for name in book["shelves"])
+    cycle = (
+        f'<span class="listLibrary__info--cycles">Cykl: {html.escape(book["cycle"])}</span>' if book["cycle"] else ""
+    )
+    read = (
+        f'<div class="authorAllBooks__read-dates">Przeczytał: {book["read_date"]}</div>' if book["read_date"] else ""
+    )
+    user_rating = (
+        f'<div class="listLibrary__rating"><span class="listLibrary__ratingStarsNumber">{book["user_rating"]}</span></div>'
+        if book["user_rating"]
+        else ""
+    )
+    return (
+        f'<div class="authorAllBooks__single" id="listBookElement{book["id"]}">\n'
+        f'  <a class="authorAllBooks__singleTextTitle" href="/ksiazka/{book["id"]}/{book["slug"]}">'
+        f'{html.escape(book["title"])}</a>\n'
+        f'  <div class="authorAllBooks__singleTextAuthor"><a href="/autor/{book["author_id"]}">'
+        f'{html.escape(book["author"])}</a></div>\n'
+        f"  {cycle}\n"
+        f'  <div class="listLibrary__rating"><span class="listLibrary__ratingStarsNumber">{book["avg_rating"]}</span></div>\n'
+        f"  {user_rating}\n"
+        f'  <span class="listLibrary__ratingAll">{book["rating_count"]} ocen</span>\n'
+        f'  <span class="small grey">Czytelnicy: {book["readers"]}</span>\n'
+        f'  <span class="small grey">Opinie: {book["opinions"]}</span>\n'
+        f"  {read}\n"
+        f'  <div class="authorAllBooks__singleTextShelfRight">{shelves}<a href="#">Dodaj na półkę</a></div>\n'
+        f"</div>"
+    )
+
+
+def render_list_page(cards, page, has_next):
+    """Render a profile list page whose paginator links to `?page=<page + 1>`."""
+    state = "next-page" if has_next else "next-page disabled"
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Biblioteczka</title></head><body>\n"
+        '<button id="onetrust-accept-btn-handler" onclick="this.remove()">Akceptuję</button>\n'
+        + "\n".join(cards)
+        + f'\n<ul class="pagination"><li class="{state}"><a href="?page={page + 1}">Dalej</a></li></ul>\n'
+        "</body></html>"
+    )
+
+
+def render_book_page(book):
+    """Render a book page with the ISBN meta tag and the details section."""
+    original = (
+        f"<dt>Tytuł oryginału:</dt>\n<dd>{html.escape(book['original_title'])}</dd>" if book["original_title"] else ""
+    )
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f'<meta property="books:isbn" content="{book["isbn"]}"><title>{html.escape(book["title"])}</title></head>'
+        f'<body><h1>{html.escape(book["title"])}</h1><div id="book-details"><dl>\n{original}\n'
+        f"<dt>Liczba stron:</dt>\n<dd>{book['pages']}</dd>\n</dl></div></body></html>"
+    )
+
+
+def _isbn13(rng):
+    core = "978" + "".join(str(rng.randrange(10)) for _ in range(9))
+    total = sum(int(digit) * (1 if idx % 2 == 0 else 3) for idx, digit in enumerate(core))
+    return core + str((10 - total % 10) % 10)
+
+
+class ReplaySite:
+    """
+    Pages served by `ReplayServer`.
+
+    Args:
+        list_pages (list[str]): Profile list pages; page N is `list_pages[N - 1]`
+        book_pages (dict): Book id (str) -> book page HTML
+    """
+
+    def __init__(self, list_pages, book_pages):
+        self.list_pages = list(list_pages)
+        self.book_pages = dict(book_pages)
+
+    @classmethod
+    def synthetic(cls, books=90, per_page=30, seed=0):
+        """Generate a library of `books` books, `per_page` cards per list page."""
+        rng = random.Random(seed)
+        records = []
+        for idx in range(books):
+            book_id = str(100000 + idx)
+            author_idx = rng.randrange(len(_SURNAMES))
+            title = " ".join(rng.sample(_WORDS, 2)).capitalize() + f" {idx}"
+            shelf = rng.choice(_SHELVES)
+            records.append(
+                {
+                    "id": book_id,
+                    "slug": re.sub(r"\W+", "-", title.lower()).strip("-"),
+                    "title": title,
+                    "author_id": author_idx,
+                    "author": f"{_NAMES[author_idx]} {_SURNAMES[author_idx]}",
+                    "cycle": f"Cykl {idx % 7} (tom {idx % 5 + 1})" if idx % 3 == 0 else "",
+                    "avg_rating": f"{rng.randint(40, 95) / 10}".replace(".", ","),
+                    "user_rating": str(rng.randint(1, 10)) if shelf == "Przeczytane" else "",
+                    "rating_count": rng.randrange(5, 5000),
+                    "readers": rng.randrange(10, 20000),
+                    "opinions": rng.randrange(0, 900),
+                    "read_date": f"{rng.randint(2010, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+                    if shelf == "Przeczytane"
+                    else "",
+                    "shelves": [shelf, *rng.sample(_OWN_SHELVES, rng.randint(0, 2))],
+                    "isbn": _isbn13(rng),
+                    "original_title": f"Original {title}" if idx % 2 == 0 else "",
+                    "pages": rng.randint(90, 900),
+                }
+            )
+
+        pages = [records[start: start + per_page] for start in range(0, len(records), per_page)] or [[]]
+        list_pages = [
+            render_list_page([render_card(book) for book in page], number, number < len(pages))
+            for number, page in enumerate(pages, start=1)
+        ]
+        return cls(list_pages, {book["id"]: render_book_page(book) for book in records})
+
+    @classmethod
+    def from_directory(cls, directory):
+        """
+        Load recorded pages: `list/page-<N>.html` and `books/<id>.html`.
+
+        Absolute links to the live site are rewritten to the replay server when served.
+        """
+        list_dir = os.path.join(directory, "list")
+        numbered = sorted(
+            (int(match.group(1)), name)
+            for name in os.listdir(list_dir)
+            if (match := re.fullmatch(r"page-(\d+)\.html", name))
+        )
+        list_pages = []
+        for _, name in numbered:
+            with open(os.path.join(list_dir, name), mode="r", encoding="utf-8") as file:
+                list_pages.append(file.read())
+
+        book_pages = {}
+        book_dir = os.path.join(directory, "books")
+        if os.path.isdir(book_dir):
+            for name in os.listdir(book_dir):
+                if name.endswith(".html"):
+                    with open(os.path.join(book_dir, name), mode="r", encoding="utf-8") as file:
+                        book_pages[name[: -len(".html")]] = file.read()
+        return cls(list_pages, book_pages)
+
+    def save(self, directory):
+        """Write the site in the layout read by `from_directory`."""
+        os.makedirs(os.path.join(directory, "list"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "books"), exist_ok=True)
+        for number, page in enumerate(self.list_pages, start=1):
+            with open(os.path.join(directory, "list", f"page-{number}.html"), mode="w", encoding="utf-8") as file:
+                file.write(page)
+        for book_id, page in self.book_pages.items():
+            with open(os.path.join(directory, "books", f"{book_id}.html"), mode="w", encoding="utf-8") as file:
+                file.write(page)
+
+    def list_page(self, page):
+        if 1 <= page <= len(self.list_pages):
+            return self.list_pages[page - 1]
+        # Past the last page the live site renders an empty list.
+        return render_list_page([], page, False)
+
+    def book_page(self, book_id):
+        return self.book_pages.get(str(book_id))
+
+
+def record_site(list_url, directory, fetcher=None, books=True):
+    """
+    Record a live profile library into `directory` for later replay.
+
+    Args:
+        list_url (str): Profile library list URL (e.g. `RunConfig.list_url`)
+        directory (str): Output directory
+        fetcher (HttpFetcher): Page loader; a default `HttpFetcher` when omitted
+        books (bool): Also record every linked book page
+
+    Returns:
+        ReplaySite
+    """
+    from scraper.http_backend import HttpFetcher, page_url
+    from scraper.parsing import has_next_page
+
+    fetcher = fetcher or HttpFetcher()
+    list_pages = []
+    page = 1
+    while True:
+        source = fetcher.fetch(page_url(list_url, page))
+        if "authorAllBooks__single" not in source:
+            break
+        list_pages.append(source)
+        if not has_next_page(source):
+            break
+        page += 1
+
+    book_pages = {}
+    if books:
+        for source in list_pages:
+            for book_id in dict.fromkeys(re.findall(r'href="[^"]*/ksiazka/(\d+)[^"]*"', source)):
+                page_source = fetcher.fetch(f"{SITE_ORIGIN}/ksiazka/{book_id}")
+                if page_source:
+                    book_pages[book_id] = page_source
+
+    site = ReplaySite(list_pages, book_pages)
+    site.save(directory)
+    return site
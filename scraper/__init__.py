@@ -4,10 +4,32 @@ Scraper package for extracting book data from Lubimyczytac.pl.
 This package contains modules for scraping book information from a user's profile
 on Lubimyczytac.pl. It uses Selenium WebDriver to automate browser interactions
 and extract data such as book titles, authors, ratings, and other metadata.
+
+The public functions are loaded on first attribute access (PEP 562), so importing
+the package, or a browser-free module such as `scraper.parsing`, does not pull in
+Selenium. Parser worker processes and CSV-only commands rely on this.
 """
 
-from scraper.book_details import get_isbn_from_book_page
-from scraper.profile_scraper import scrape_books
-from scraper.enrichment import fill_isbn_and_original_titles
+import importlib
+
+_EXPORTS = {
+    'get_isbn_from_book_page': 'scraper.book_details',
+    'scrape_books': 'scraper.profile_scraper',
+    'fill_isbn_and_original_titles': 'scraper.enrichment',
+    'iter_enriched_books': 'scraper.enrichment',
+}
+
+__all__ = ['get_isbn_from_book_page', 'scrape_books', 'fill_isbn_and_original_titles', 'iter_enriched_books']
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['get_isbn_from_book_page', 'scrape_books', 'fill_isbn_and_original_titles']
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
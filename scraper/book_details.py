@@ -2,31 +2,37 @@
 Module for extracting detailed book information from Lubimyczytac.pl.
 """
 
-import re
-
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
+from scraper.parsing import _extract_original_title
+from scraper.profiling import count, profiled
 
 
-def _extract_original_title(section_html):
-    if not section_html:
-        return "BRAK"
+@profiled()
+def load_book_page(driver, url, timeout=5):
+    """
+    Load a book page and return its raw source for out-of-process parsing.
 
-    patterns = [
-        r"Tytuł oryginału:\s*</dt>\s*<dd>(.*?)</dd>",
-        r"TytuĹ‚ oryginaĹ‚u:\s*</dt>\s*<dd>(.*?)</dd>",
-    ]
+    Returns:
+        str: Page source, or an empty string when the page could not be loaded.
+    """
+    if not url or not url.startswith("http"):
+        print(f"Invalid URL: {url}")
+        return ""
 
-    for pattern in patterns:
-        match = re.search(pattern, section_html, flags=re.IGNORECASE | re.DOTALL)
-        if match:
-            return match.group(1).strip()
-    return "BRAK"
+    try:
+        driver.get(url)
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.TAG_NAME, "head")))
+        return driver.page_source or ""
+    except Exception as exc:
+        print(f"Error while loading {url}: {exc}")
+        return ""
 
 
-def get_isbn_from_book_page(driver, url):
+@profiled()
+def get_isbn_from_book_page(driver, url, timeout=5):
     """
     Extract ISBN and original title from a book page.
 
@@ -42,21 +48,24 @@ def get_isbn_from_book_page(driver, url):
 
     try:
         driver.get(url)
-        WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.TAG_NAME, "head")))
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.TAG_NAME, "head")))
 
         try:
             isbn_meta = driver.find_element(By.XPATH, '//meta[@property="books:isbn"]')
             isbn = (isbn_meta.get_attribute("content") or "").strip()
+            count("isbn meta", "hit")
         except Exception:
+            count("isbn meta", "exception")
             isbn = ""
 
         try:
-            details_section = WebDriverWait(driver, 5).until(
+            details_section = WebDriverWait(driver, timeout).until(
                 EC.presence_of_element_located((By.ID, "book-details"))
             )
             section_content = details_section.get_attribute("innerHTML") or ""
             original_title = _extract_original_title(section_content)
         except TimeoutException:
+            count("#book-details", "timeout")
             print(f"Book details section not found: {url}")
             original_title = "BRAK"
 
@@ -0,0 +1,131 @@
+"""
+Module for adapting the number of in-flight page requests to the server.
+
+`AIMDController` grows the limit by about one slot per round trip while
+latency stays near the best seen so far, and halves it when requests fail
+(including throttling responses) or latency degrades. The fetch threads of a
+`ParsePipeline` take a slot before every request.
+"""
+
+import threading
+import time
+
+
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease limit on concurrent requests.
+
+    Args:
+        min_limit (int): Lowest allowed concurrency
+        max_limit (int): Highest allowed concurrency
+        initial (int): Starting concurrency, `min_limit` by default
+        target_latency (float): Acceptable latency in seconds; learned from the
+            fastest smoothed latency when not given
+        tolerance (float): Latency may grow to `tolerance` times the target
+            before the limit is cut
+        backoff (float): Factor applied to the limit on overload
+        smoothing (float): EWMA weight of the newest latency sample
+    """
+
+    def __init__(
+        self,
+        min_limit=1,
+        max_limit=16,
+        initial=None,
+        target_latency=None,
+        tolerance=1.5,
+        backoff=0.5,
+        smoothing=0.3,
+    ):
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.target_latency = target_latency
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.smoothing = smoothing
+
+        self._limit = float(min(max(initial or self.min_limit, self.min_limit), self.max_limit))
+        self._smoothed = None
+        self._baseline = None
+        self._cooldown = 0
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self.completed = 0
+        self.errors = 0
+        self.low = self.high = int(self._limit)
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def acquire(self):
+        """Block until fewer than `limit` requests are in flight, then take a slot."""
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def record(self, latency, ok=True):
+        """Feed back one finished request and adjust the limit."""
+        with self._condition:
+            self.completed += 1
+            if not ok:
+                self.errors += 1
+                self._decrease()
+            else:
+                if self._smoothed is None:
+                    self._smoothed = latency
+                else:
+                    self._smoothed += self.smoothing * (latency - self._smoothed)
+                if self._baseline is None or self._smoothed < self._baseline:
+                    self._baseline = self._smoothed
+
+                target = self.target_latency or self._baseline
+                if self._smoothed > target * self.tolerance:
+                    self._decrease()
+                else:
+                    if self._cooldown > 0:
+                        self._cooldown -= 1
+                    self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+            self.low = min(self.low, self.limit)
+            self.high = max(self.high, self.limit)
+            self._condition.notify_all()
+
+    def _decrease(self):
+        # Requests already in flight when the limit dropped report the same
+        # overload; cut at most once per round trip.
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return
+        self._cooldown = max(self.limit, self._in_flight)
+        self._limit = max(self.min_limit, self._limit * self.backoff)
+        # Forget the overloaded latency so recovery is judged afresh.
+        self._smoothed = None
+
+    def track(self, fetch):
+        """Wrap `fetch(item)` so each call holds a slot and reports its outcome (falsy result = error)."""
+
+        def tracked(item):
+            self.acquire()
+            started = time.monotonic()
+            result = None
+            try:
+                result = fetch(item)
+                return result
+            finally:
+                self.release()
+                self.record(time.monotonic() - started, ok=bool(result))
+
+        return tracked
+
+    def summary(self):
+        return f"concurrency {self.limit} (range {self.low}-{self.high}, errors {self.errors}/{self.completed})"
@@ -0,0 +1,177 @@
+"""
+Module for fetching each book page at most once.
+
+Book pages are keyed by the book id in their URL. `BookDetailsCache` keeps
+recent `(isbn, original_title)` results in an LRU in front of an optional
+persistent mapping, and coalesces concurrent requests for the same key into a
+single in-flight fetch whose result every caller shares.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+
+from scraper.parsing import parse_book_details
+
+MISSING_DETAILS = ("", "BRAK")
+
+
+def normalize_book_url(url):
+    """
+    Return a stable cache key for a book URL.
+
+    Lubimyczytac book URLs look like /ksiazka/<id>/<slug>; the id alone identifies
+    the book, so slug changes, query strings and host spelling do not matter.
+    """
+    url = (url or "").strip()
+    match = re.search(r"/ksiazka/(\d+)", url)
+    if match:
+        return f"ksiazka:{match.group(1)}"
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), "", ""))
+
+
+class LRUCache:
+    """Thread-safe mapping that keeps the `maxsize` most recently used entries."""
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SingleFlight:
+    """Let one caller per key do the work while concurrent callers wait for its result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def begin(self, key):
+        """
+        Claim `key` or wait for the caller that already holds it.
+
+        Returns:
+            tuple[bool, object]: (True, None) when the caller must do the work and
+            then call `finish`; (False, result) when another caller finished it.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                self._calls[key] = {"done": threading.Event(), "result": None}
+                return True, None
+        call["done"].wait()
+        return False, call["result"]
+
+    def finish(self, key, result):
+        with self._lock:
+            call = self._calls.pop(key, None)
+        if call is not None:
+            call["result"] = result
+            call["done"].set()
+
+
+class BookDetailsCache:
+    """
+    Shared `(isbn, original_title)` results for book pages.
+
+    Args:
+        maxsize (int): Entries kept in the in-memory LRU
+        store (MutableMapping): Optional persistent mapping (e.g. a `shelve`)
+            consulted on LRU misses
+
+    Pages that yielded no details (`MISSING_DETAILS`, usually a failed fetch)
+    are not cached, so the next caller fetches them again.
+    """
+
+    def __init__(self, maxsize=4096, store=None):
+        self.memory = LRUCache(maxsize)
+        self.store = store
+        self._store_lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is None and self.store is not None:
+            with self._store_lock:
+                value = self.store.get(key)
+            if value is not None:
+                value = tuple(value)
+                self.memory.put(key, value)
+        return value
+
+    def put(self, key, value):
+        if tuple(value) == MISSING_DETAILS:
+            return
+        self.memory.put(key, value)
+        if self.store is not None:
+            with self._store_lock:
+                self.store[key] = tuple(value)
+
+    def begin(self, key):
+        """Return (True, None) if the caller must fetch `key`, else (False, details)."""
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return False, value
+        owner, value = self._flight.begin(key)
+        if owner:
+            # Another caller may have finished between the lookup and the claim.
+            value = self.memory.get(key)
+            if value is not None:
+                self._flight.finish(key, value)
+                self.hits += 1
+                return False, value
+        if owner or value is None:
+            self.misses += 1
+            return True, None
+        self.hits += 1
+        return False, value
+
+    def finish(self, key, value):
+        self.put(key, value)
+        self._flight.finish(key, value)
+
+    def release(self, key):
+        """Give up a key claimed with `begin` without a result; waiting callers then fetch it themselves."""
+        self._flight.finish(key, None)
+
+    def load(self, key, loader):
+        """Return cached details for `key`, calling `loader()` once if nobody has them yet."""
+        owner, value = self.begin(key)
+        if not owner:
+            return value
+        try:
+            value = loader()
+        finally:
+            if value is None:
+                self._flight.finish(key, None)
+        self.finish(key, value)
+        return value
+
+
+def parse_unless_cached(raw):
+    """Parse a fetched book page, passing through details that came from the cache."""
+    if isinstance(raw, tuple):
+        return raw
+    return parse_book_details(raw)
@@ -4,6 +4,7 @@ Module for enriching book data with additional information.
 This module contains functions for adding ISBN and original title information
 to book data that has been scraped from Lubimyczytac.pl.
 """
+import itertools
 import time
 import random
 import os
@@ -11,8 +12,16 @@ import subprocess
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from scraper.book_details import get_isbn_from_book_page
+from scraper.concurrency import AIMDController
+from scraper.book_details import get_isbn_from_book_page, load_book_page
+from scraper.dedup import BookDetailsCache, normalize_book_url, parse_unless_cached
+from scraper.http_backend import HttpFetcher
+from scraper.parsing import apply_details
+from scraper.pipeline import ParsePipeline
+from scraper.profiling import profiled, section
+from scraper.throttle import RateLimiter
 
+@profiled()
 def _build_driver():
     """Create a Chrome driver with reduced background/browser logging noise."""
     chrome_options = Options()
@@ -29,63 +38,227 @@ def _build_driver():
     return webdriver.Chrome(options=chrome_options, service=service)
 
 
-def fill_isbn_and_original_titles(books, min_delay=1.2, max_delay=2.8, log_every=5):
+def _apply_record(book, record):
+    """Copy metadata resolved offline (a metadata.BibRecord) onto a book without overwriting known values."""
+    book.isbn = book.isbn or record.isbn
+    book.publisher = book.publisher or record.publisher
+    book.year = book.year or record.year
+    if record.original_title:
+        book.title = record.original_title
+
+
+def _windows(books, size):
+    """Split an iterable of books into lists of at most `size` books (all of them when size is falsy)."""
+    if not size:
+        chunk = list(books)
+        if chunk:
+            yield chunk
+        return
+    iterator = iter(books)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+@profiled()
+def fill_isbn_and_original_titles(books, min_delay=1.2, max_delay=2.8, log_every=5, **options):
     """
     Enrich book data with ISBN and original titles.
 
     This function visits each book's page to extract additional information
-    that is not available on the user's profile page.
+    that is not available on the user's profile page. Further keyword
+    options (backend, workers, cache, resolver, ...) are those of
+    `iter_enriched_books`.
 
     Args:
         books (list): A list of Book objects as returned by scrape_books()
+        min_delay (float): Minimum pause after each book page (seconds)
+        max_delay (float): Maximum pause after each book page (seconds)
+        log_every (int): Print progress every N enriched books; 0 prints only
+            the first and the last
 
     Returns:
         list: The same list of books, but with ISBN and original title fields populated
     """
-    total = len(books)
-    if total == 0:
+    if not books:
         print("[Phase 2] No books to enrich.")
         return books
+    enriched = iter_enriched_books(
+        books, min_delay=min_delay, max_delay=max_delay, log_every=log_every, total=len(books), **options
+    )
+    for _ in enriched:
+        pass
+    return books
+
 
+def iter_enriched_books(
+    books,
+    min_delay=1.2,
+    max_delay=2.8,
+    log_every=5,
+    parse_workers=0,
+    backend="selenium",
+    workers=1,
+    rate=0.0,
+    timeout=5,
+    retries=2,
+    adaptive=False,
+    min_workers=1,
+    cache=None,
+    resolver=None,
+    window=0,
+    total=None,
+):
+    """
+    Enrich books from any iterable and yield each one, in input order, once it is done.
+
+    Books are consumed `window` at a time: each window is resolved, fetched and
+    yielded before the next one is read, so with a generator or a `BookQueue`
+    as input and a streaming writer as consumer only one window of books is in
+    memory however large the library is.
+
+    Args:
+        books (iterable): Book objects, e.g. a list, a CSV reader or a BookQueue
+        parse_workers (int): When > 0, parse fetched pages in that many processes
+            so the browser is never idle while a page is being parsed
+        backend (str): "selenium" drives Chrome, "http" downloads pages directly
+        workers (int): Parallel page fetches (http backend only)
+        rate (float): Max page requests per second, 0 for no limit
+        timeout (float): Page load timeout in seconds
+        retries (int): Extra attempts after a 429 or 5xx response (http backend only)
+        adaptive (bool): Let an AIMDController pick the number of parallel
+            fetches between `min_workers` and `workers` (http backend only)
+        cache (BookDetailsCache): Details shared between calls, e.g. when several
+            libraries are enriched in one process; each book page (keyed by its
+            book id) is fetched once per cache even if listed many times
+        resolver (metadata.DumpIndex): Local bibliographic index; books it can
+            resolve (ISBN or author+title match with an original title) are
+            filled offline, including publisher and year, and not visited
+        window (int): Books read and enriched at a time; 0 reads everything first
+        total (int): Number of books, when known, for progress and ETA lines
+
+    Yields:
+        Book: Each input book with ISBN and original title fields populated
+    """
     if min_delay < 0:
         min_delay = 0
     if max_delay < min_delay:
         max_delay = min_delay
 
-    # Reduce non-actionable browser logs in terminal.
-    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
-    driver = _build_driver()
-    started_at = time.time()
-    print(f"[Phase 2] Starting enrichment for {total} books...")
-
-    for idx, book in enumerate(books, start=1):
-        item_started = time.time()
-        link = book.link
-        isbn, original_title = get_isbn_from_book_page(driver, link)
-        book.isbn = isbn
-        used_fallback_title = False
-        if original_title != 'BRAK':
-            book.title = original_title
-        else:
-            book.title = book.polish_title
-            used_fallback_title = True
-
-        item_elapsed = time.time() - item_started
-        if idx == 1 or idx % log_every == 0 or idx == total:
-            elapsed = time.time() - started_at
-            avg_per_item = elapsed / idx
-            eta = avg_per_item * (total - idx)
-            isbn_status = "yes" if isbn else "no"
-            fallback_status = "yes" if used_fallback_title else "no"
-            print(
-                f"[Phase 2] {idx}/{total} | "
-                f"ISBN: {isbn_status} | Fallback title: {fallback_status} | "
-                f"last: {item_elapsed:.1f}s | ETA: {eta:.0f}s"
-            )
+    rate_limiter = RateLimiter(rate)
+    driver = None
+    controller = None
+    if backend == "http":
+        fetcher = HttpFetcher(timeout=timeout, rate_limiter=rate_limiter, retries=retries)
+        load_page = fetcher.fetch
+        if adaptive:
+            controller = AIMDController(min_limit=min_workers, max_limit=workers)
+            load_page = controller.track(load_page)
+    else:
+        workers = 1
 
+        def load_page(url):
+            rate_limiter.wait()
+            return load_book_page(driver, url, timeout=timeout)
+
+    if cache is None:
+        cache = BookDetailsCache()
+
+    def fetch_details(book):
+        rate_limiter.wait()
+        isbn, original_title = get_isbn_from_book_page(driver, book.link, timeout=timeout)
         # delay between page loads (phase 2)
-        time.sleep(random.uniform(min_delay, max_delay))
+        with section("delay"):
+            time.sleep(random.uniform(min_delay, max_delay))
+        return isbn, original_title
+
+    started_at = time.time()
+    item_started = time.time()
+    done = 0
+    resolved = 0
+    try:
+        for chunk in _windows(books, window):
+            pending = chunk
+            if resolver is not None:
+                pending = []
+                for book in chunk:
+                    record = resolver.resolve(book)
+                    if record is not None:
+                        _apply_record(book, record)
+                    if record is None or not record.original_title:
+                        pending.append(book)
+                resolved += len(chunk) - len(pending)
+                if not window:
+                    print(f"[Phase 2] Resolved {resolved} of {len(chunk)} books from the local metadata index.")
+                    total = len(pending)
+
+            groups = {}
+            for book in pending:
+                groups.setdefault(normalize_book_url(book.link), []).append(book)
+            if groups and driver is None and backend != "http":
+                # Reduce non-actionable browser logs in terminal.
+                os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+                driver = _build_driver()
+            if done == 0 and groups:
+                scope = f"{total} books ({len(groups)} unique pages)" if not window else f"books in windows of {window}"
+                print(f"[Phase 2] Starting enrichment for {scope}...")
+
+            # Keys this window must finish or release, so no other caller waits on them forever.
+            claimed = set()
 
-    driver.quit()
+            def fetch_page(key):
+                owner, details = cache.begin(key)
+                if not owner:
+                    return details
+                claimed.add(key)
+                html = load_page(groups[key][0].link)
+                with section("delay"):
+                    time.sleep(random.uniform(min_delay, max_delay))
+                return html
+
+            if parse_workers or backend == "http":
+                pipeline = ParsePipeline(parse_unless_cached, workers=parse_workers, fetch_workers=workers)
+                results = pipeline.run(groups, fetch=fetch_page)
+            else:
+                results = ((key, cache.load(key, lambda key=key: fetch_details(groups[key][0]))) for key in groups)
+
+            try:
+                for key, (isbn, original_title) in results:
+                    if key in claimed:
+                        claimed.discard(key)
+                        cache.finish(key, (isbn, original_title))
+                    for book in groups[key]:
+                        used_fallback_title = apply_details(book, isbn, original_title)
+                        done += 1
+
+                        item_elapsed = time.time() - item_started
+                        item_started = time.time()
+                        if done == 1 or (log_every and done % log_every == 0) or done == total:
+                            elapsed = time.time() - started_at
+                            progress = f"{done}/{total}" if total else f"{done}"
+                            eta = f" | ETA: {elapsed / done * (total - done):.0f}s" if total else ""
+                            isbn_status = "yes" if isbn else "no"
+                            fallback_status = "yes" if used_fallback_title else "no"
+                            concurrency = f" | concurrency: {controller.limit}" if controller else ""
+                            print(
+                                f"[Phase 2] {progress} | "
+                                f"ISBN: {isbn_status} | Fallback title: {fallback_status} | "
+                                f"last: {item_elapsed:.1f}s{eta}{concurrency}"
+                            )
+            finally:
+                for key in list(claimed):
+                    cache.release(key)
+
+            yield from chunk
+    finally:
+        if driver is not None:
+            driver.quit()
+
+    if resolver is not None and window:
+        print(f"[Phase 2] Resolved {resolved} books from the local metadata index.")
+    if controller is not None:
+        print(f"[Phase 2] Adaptive {controller.summary()}")
+    print(f"[Phase 2] Page cache: {cache.hits} hits, {cache.misses} fetched.")
     print(f"[Phase 2] Enrichment completed in {time.time() - started_at:.1f}s.")
-    return books
@@ -0,0 +1,100 @@
+"""
+Module for loading Lubimyczytac.pl pages over plain HTTP.
+
+This backend skips the browser entirely: pages are downloaded with `requests`
+and parsed by `scraper.parsing`, so several fetches can run in parallel.
+"""
+
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+from scraper.profiling import profiled, section
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept-Language": "pl-PL,pl;q=0.9,en;q=0.8",
+}
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HttpFetcher:
+    """
+    Fetch raw page sources, one `requests.Session` per thread.
+
+    Args:
+        timeout (float): Per-request timeout in seconds
+        rate_limiter (RateLimiter): Optional limiter shared by all fetches
+        headers (dict): Extra request headers
+        retries (int): Extra attempts after a throttling (429) or server error
+            response; the wait honours `Retry-After`, capped at `max_backoff`
+        backoff (float): Wait before the first retry when no `Retry-After` is
+            sent; doubles on every further retry
+    """
+
+    def __init__(self, timeout=15.0, rate_limiter=None, headers=None, retries=2, backoff=1.0, max_backoff=30.0):
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
+
+    @profiled("HttpFetcher.fetch")
+    def fetch(self, url):
+        """
+        Download one page.
+
+        Returns:
+            str: Page source, or an empty string when the request failed.
+        """
+        if not url or not url.startswith("http"):
+            print(f"Invalid URL: {url}")
+            return ""
+
+        for attempt in range(self.retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.wait()
+            try:
+                response = self._session().get(url, timeout=self.timeout)
+                if response.status_code in RETRY_STATUSES and attempt < self.retries:
+                    with section("retry backoff"):
+                        time.sleep(self._retry_delay(response, attempt))
+                    continue
+                response.raise_for_status()
+                return response.text
+            except requests.RequestException as exc:
+                print(f"Error while loading {url}: {exc}")
+                return ""
+        return ""
+
+    def _retry_delay(self, response, attempt):
+        try:
+            delay = float(response.headers.get("Retry-After", ""))
+        except ValueError:
+            delay = self.backoff * 2**attempt
+        return min(max(delay, 0.0), self.max_backoff)
+
+
+def page_url(list_url, page):
+    """Return the library list URL pointing at the given page number."""
+    parts = urlsplit(list_url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != "page"]
+    query.insert(0, ("page", str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
@@ -0,0 +1,94 @@
+"""
+Module for learning which card locators work on the current site markup.
+
+`_first_text` tries a field's locators in order, and every miss is a failed
+chromedriver round-trip. `LocatorStats` keeps a recency-weighted hit rate per
+field and locator, puts the locators most likely to hit first, and skips those
+that keep missing. The rates are saved as JSON in the cache directory, so after
+the site markup changes, only the first cards that see the change pay for the
+misses, and later runs start with the learned order.
+"""
+
+import json
+import os
+import threading
+
+
+def _key(locator):
+    by, value = locator
+    return f"{by}|{value}"
+
+
+class LocatorStats:
+    """
+    Per-field locator hit rates.
+
+    Each locator keeps decayed `[hits, attempts]` counts: on every attempt both
+    are multiplied by `memory` before adding the outcome, so roughly the last
+    `1 / (1 - memory)` attempts decide the order.
+
+    Args:
+        counts (dict): field -> {"by|value": [hits, attempts]}, as saved by `save`
+        memory (float): Weight kept by older attempts, between 0 and 1
+        skip_below (float): Smoothed hit rate below which a locator is skipped
+        probe_every (int): Every N-th lookup of a field still tries its skipped
+            locators (last), so one that starts matching again is noticed
+    """
+
+    def __init__(self, counts=None, memory=0.9, skip_below=0.1, probe_every=50):
+        self.counts = {
+            field: {key: list(pair) for key, pair in locators.items()} for field, locators in (counts or {}).items()
+        }
+        self.memory = memory
+        self.skip_below = skip_below
+        self.probe_every = probe_every
+        self._lookups = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path, **options):
+        """Read counts saved by `save`; a missing or unreadable file starts empty."""
+        try:
+            with open(path, mode="r", encoding="utf-8") as file:
+                counts = json.load(file).get("fields", {})
+        except (OSError, ValueError):
+            counts = {}
+        return cls(counts, **options)
+
+    def save(self, path):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            fields = {
+                field: {key: [round(hits, 4), round(attempts, 4)] for key, (hits, attempts) in locators.items()}
+                for field, locators in self.counts.items()
+            }
+        with open(path, mode="w", encoding="utf-8") as file:
+            json.dump({"fields": fields}, file, ensure_ascii=False, indent=2, sort_keys=True)
+
+    def _score(self, field, locator):
+        hits, attempts = self.counts.get(field, {}).get(_key(locator), (0, 0))
+        return (hits + 1) / (attempts + 2)
+
+    def _skipped(self, field, locator):
+        return self._score(field, locator) < self.skip_below
+
+    def order(self, field, locators):
+        """
+        Return the locators to try for `field`, most likely to hit first.
+
+        Ties keep the given order, so with no history the declared order is used.
+        """
+        with self._lock:
+            lookup = self._lookups[field] = self._lookups.get(field, 0) + 1
+            ranked = sorted(locators, key=lambda locator: -self._score(field, locator))
+            live = [locator for locator in ranked if not self._skipped(field, locator)]
+            if lookup % self.probe_every == 0:
+                live += [locator for locator in ranked if locator not in live]
+            return live
+
+    def record(self, field, locator, hit):
+        with self._lock:
+            pair = self.counts.setdefault(field, {}).setdefault(_key(locator), [0.0, 0.0])
+            pair[0] = pair[0] * self.memory + bool(hit)
+            pair[1] = pair[1] * self.memory + 1
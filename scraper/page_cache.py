@@ -0,0 +1,119 @@
+"""
+Module for reusing list pages that did not change since the last scrape.
+
+`PageCache` keeps, per list URL and book id, the `card_fingerprints` value of
+the book's card and the Book parsed from it in a SQLite file. When every card
+of a page a re-scrape loads is stored with the same fingerprint, the stored
+Books are used as they are and the page is not parsed again. Cards are matched
+by book id, not by position, so a book added at the top of the list, which
+moves every other card down, only makes the pages holding changed cards
+(here the first one) get re-extracted.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import NamedTuple
+
+from models import Book
+from scraper.parsing import card_fingerprints, has_next_page, parse_profile_page
+from scraper.profiling import profiled
+
+
+class KnownPage(NamedTuple):
+    """A list page answered from the cache, passed through the parse pipeline as is."""
+
+    books: list
+    has_next: bool
+
+
+def parse_known_page(raw, base_url="https://lubimyczytac.pl"):
+    """`parse_profile_page` that passes KnownPage results through unchanged."""
+    if isinstance(raw, KnownPage):
+        return raw.books, raw.has_next
+    return parse_profile_page(raw, base_url)
+
+
+class PageCache:
+    """
+    Card fingerprints and Books of the list pages seen in earlier runs.
+
+    Args:
+        path (str): SQLite file; created when missing
+        list_url (str): Profile list URL the page numbers belong to
+    """
+
+    def __init__(self, path, list_url):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.list_url = list_url
+        self.hits = 0
+        self.misses = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        # Parallel list fetches look pages up from their own threads.
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cards ("
+            "list_url TEXT NOT NULL, book_id TEXT NOT NULL, fingerprint TEXT NOT NULL, book TEXT NOT NULL, "
+            "PRIMARY KEY (list_url, book_id))"
+        )
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @profiled("PageCache.lookup")
+    def lookup(self, page, html):
+        """
+        Return a KnownPage when every card of `html` matches the fingerprint stored for its book.
+
+        On a miss the card fingerprints are remembered, and `store` saves them
+        with the Books parsed from this page.
+        """
+        fingerprints = card_fingerprints(html)
+        with self._lock:
+            known = {}
+            if fingerprints:
+                ids = [book_id for book_id, _ in fingerprints]
+                known = {
+                    (book_id, fingerprint): book
+                    for book_id, fingerprint, book in self._conn.execute(
+                        f"SELECT book_id, fingerprint, book FROM cards WHERE list_url = ? "
+                        f"AND book_id IN ({', '.join('?' * len(ids))})",
+                        [self.list_url, *ids],
+                    )
+                }
+            if fingerprints and all(card in known for card in fingerprints):
+                self.hits += 1
+                books = [Book.from_row(json.loads(known[card])) for card in fingerprints]
+                return KnownPage(books, has_next_page(html))
+            self.misses += 1
+            self._pending[page] = dict(fingerprints)
+            return None
+
+    def store(self, page, books):
+        """Save the Books parsed from `page` after a `lookup` miss; no-op for pages served from the cache."""
+        with self._lock:
+            fingerprints = self._pending.pop(page, None)
+            if not fingerprints:
+                return
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO cards (list_url, book_id, fingerprint, book) VALUES (?, ?, ?, ?)",
+                    (
+                        (self.list_url, book.book_id, fingerprints[book.book_id], json.dumps(book.to_row()))
+                        for book in books
+                        if book.book_id in fingerprints
+                    ),
+                )
+
+    def summary(self):
+        return f"pages reused: {self.hits} | pages parsed: {self.misses}"
@@ -0,0 +1,358 @@
+"""
+Module for parsing raw Lubimyczytac.pl HTML into book data.
+
+The functions here work on page source strings only and never touch a browser,
+so they can run in worker processes while the fetch loop keeps loading pages.
+The card rules mirror the WebDriver extraction in `profile_scraper`.
+"""
+
+import hashlib
+import html as html_lib
+import re
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from models import Book
+from scraper import profiling
+
+
+STANDARD_SHELVES = {
+    "Przeczytane",
+    "Teraz czytam",
+    "Chce przeczytac",
+    "Chcę przeczytać",
+}
+
+_NEXT_PAGE_CLASS = re.compile(r"""class=["']([^"']*\bnext-page\b[^"']*)["']""")
+_CARD_START = re.compile(r"""id=["']listBookElement(\d+)["']""")
+_CARD_RATING = re.compile(r"""\blistLibrary__ratingStarsNumber\b[^>]*>([^<]*)<""")
+_CARD_RATING_COUNT = re.compile(r"""\blistLibrary__ratingAll\b[^>]*>([^<]*)<""")
+_CARD_SMALL_GREY = re.compile(r"""class=["'][^"']*\bsmall grey\b[^"']*["'][^>]*>([^<]*)<""")
+_CARD_READ_DATES = re.compile(r"""\bauthorAllBooks__read-dates\b[^>]*>([^<]*)<""")
+_CARD_SHELVES = re.compile(r"""\bauthorAllBooks__singleTextShelfRight\b""")
+_ANCHOR_TEXT = re.compile(r"""<a\b[^>]*>([^<]*)</a>""")
+
+TITLE_SELECTORS = [
+    ".authorAllBooks__singleTextTitle",
+    '[class*="singleTextTitle"]',
+    '[class*="listLibrary__title"]',
+]
+
+AUTHOR_SELECTORS = [
+    ".authorAllBooks__singleTextAuthor",
+    '[class*="singleTextAuthor"]',
+    '[class*="listLibrary__author"]',
+]
+
+
+def _clean_text(value):
+    if isinstance(value, str):
+        return value.strip()
+    return ""
+
+
+def _split_lines(raw):
+    return [line.strip() for line in _clean_text(raw).splitlines() if line.strip()]
+
+
+def _is_metadata_line(line):
+    lower = line.lower()
+    if lower.startswith("cykl:"):
+        return True
+    if "ocen" in lower:
+        return True
+    if lower.startswith("czytelnicy:") or lower.startswith("opinie:"):
+        return True
+    if lower.startswith("przeczyta"):
+        return True
+    if line in STANDARD_SHELVES:
+        return True
+    if re.match(r"^\d+[,.]\d$", line):
+        return True
+    return False
+
+
+def _is_ui_noise_line(line):
+    lower = line.lower()
+    noise_markers = [
+        "na półkach",
+        "na p\u00f3\u0142kach",
+        "dodaj na p\u00f3\u0142k",
+        "dodaj na półk",
+        "kup ksi\u0105\u017ck",
+        "kup książk",
+        "/ 10",
+    ]
+    return any(marker in lower for marker in noise_markers)
+
+
+def _extract_original_title(section_html):
+    if not section_html:
+        return "BRAK"
+
+    patterns = [
+        r"Tytuł oryginału:\s*</dt>\s*<dd>(.*?)</dd>",
+        r"TytuĹ‚ oryginaĹ‚u:\s*</dt>\s*<dd>(.*?)</dd>",
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, section_html, flags=re.IGNORECASE | re.DOTALL)
+        if match:
+            return match.group(1).strip()
+    return "BRAK"
+
+
+_FALLBACK_FIELDS = (
+    "polish_title",
+    "author",
+    "cycle",
+    "avg_rating",
+    "user_rating",
+    "rating_count",
+    "readers",
+    "opinions",
+    "read_date",
+    "main_shelves",
+)
+
+
+def build_book(fields, card_lines):
+    """
+    Build a Book from directly extracted card fields.
+
+    Fields that could not be read from dedicated elements are recovered from the
+    card's text lines, the same way for every backend.
+
+    Args:
+        fields (dict): Book attribute values read from the card elements
+        card_lines (list): Non-empty text lines of the card
+
+    Returns:
+        Book: The completed book record (ISBN and original title are left empty).
+    """
+    fields = dict(fields)
+    from_elements = {name for name, value in fields.items() if value} if profiling.active() else None
+    if card_lines:
+        if not fields.get("cycle"):
+            for line in card_lines:
+                if line.lower().startswith("cykl:"):
+                    fields["cycle"] = line.split(":", 1)[1].strip()
+                    break
+
+        if not fields.get("rating_count"):
+            for line in card_lines:
+                if "ocen" in line.lower():
+                    fields["rating_count"] = line.lower().replace("ocen", "").strip()
+                    break
+
+        if not fields.get("readers"):
+            for line in card_lines:
+                if line.startswith("Czytelnicy:"):
+                    fields["readers"] = line.replace("Czytelnicy:", "").strip()
+                    break
+
+        if not fields.get("opinions"):
+            for line in card_lines:
+                if line.startswith("Opinie:"):
+                    fields["opinions"] = line.replace("Opinie:", "").strip()
+                    break
+
+        if not fields.get("read_date"):
+            for line in card_lines:
+                if line.lower().startswith("przeczyta"):
+                    fields["read_date"] = line.split(":", 1)[1].strip() if ":" in line else ""
+                    break
+
+        rating_candidates = [line for line in card_lines if re.match(r"^\d+[,.]\d$", line)]
+        if not fields.get("avg_rating") and rating_candidates:
+            fields["avg_rating"] = rating_candidates[0]
+        if not fields.get("user_rating") and len(rating_candidates) > 1:
+            fields["user_rating"] = rating_candidates[1]
+
+        if not fields.get("main_shelves"):
+            found_standard = [line for line in card_lines if line in STANDARD_SHELVES]
+            if found_standard:
+                fields["main_shelves"] = ", ".join(dict.fromkeys(found_standard))
+        # Do not infer other_shelves from raw card lines.
+        # It produces UI noise like "Na półkach", "KUP KSIĄŻKĘ", ratings etc.
+
+        content_lines = [line for line in card_lines if not _is_metadata_line(line)]
+        if not fields.get("polish_title") and content_lines:
+            fields["polish_title"] = content_lines[0]
+        if not fields.get("author") and len(content_lines) > 1:
+            fields["author"] = content_lines[1]
+
+    if fields.get("other_shelves"):
+        cleaned = []
+        for part in [p.strip() for p in fields.get("other_shelves").split(",") if p.strip()]:
+            if not _is_ui_noise_line(part):
+                cleaned.append(part)
+        fields["other_shelves"] = ", ".join(dict.fromkeys(cleaned))
+
+    # Last fallback for title from URL slug.
+    if not fields.get("polish_title") and fields.get("link"):
+        slug = fields.get("link").rstrip("/").rsplit("/", 1)[-1]
+        fields["polish_title"] = slug.replace("-", " ")
+
+    if from_elements is not None:
+        for name in _FALLBACK_FIELDS:
+            outcome = "element" if name in from_elements else "fallback" if fields.get(name) else "missing"
+            profiling.count("build_book %s", outcome, name)
+
+    # Filled in phase 2.
+    fields["isbn"] = ""
+    fields["title"] = ""
+    return Book(**fields)
+
+
+def _node_text(node):
+    if node is None:
+        return ""
+    return _clean_text(node.get_text(" ", strip=True))
+
+
+def _first_node_text(card, selectors):
+    for selector in selectors:
+        for node in card.select(selector):
+            text = _node_text(node)
+            if text:
+                return text
+    return ""
+
+
+def _parse_card(card, base_url):
+    card_lines = _split_lines(card.get_text("\n"))
+    fields = {"book_id": _clean_text(card.get("id", "")).replace("listBookElement", "")}
+
+    anchor = card.select_one('a[href*="/ksiazka/"]') or card.find("a", href=True)
+    href = _clean_text(anchor.get("href", "")) if anchor is not None else ""
+    fields["link"] = urljoin(base_url, href) if href else ""
+
+    fields["polish_title"] = _first_node_text(card, TITLE_SELECTORS)
+    fields["author"] = _first_node_text(card, AUTHOR_SELECTORS)
+
+    cycle = _node_text(card.select_one(".listLibrary__info--cycles"))
+    if cycle.lower().startswith("cykl:"):
+        cycle = cycle.split(":", 1)[1].strip()
+    fields["cycle"] = cycle
+
+    ratings = card.select(".listLibrary__rating")
+    if ratings:
+        fields["avg_rating"] = _node_text(ratings[0].select_one(".listLibrary__ratingStarsNumber"))
+    if len(ratings) > 1:
+        fields["user_rating"] = _node_text(ratings[1].select_one(".listLibrary__ratingStarsNumber"))
+
+    fields["rating_count"] = _node_text(card.select_one(".listLibrary__ratingAll")).replace("ocen", "").strip()
+
+    for node in card.select(".small.grey"):
+        text = _node_text(node)
+        if "Czytelnicy:" in text:
+            fields["readers"] = text.replace("Czytelnicy:", "").strip()
+        elif "Opinie:" in text:
+            fields["opinions"] = text.replace("Opinie:", "").strip()
+
+    read_date = _node_text(card.select_one(".authorAllBooks__read-dates"))
+    fields["read_date"] = read_date.replace("Przeczytał:", "").replace("Przeczytal:", "").strip()
+
+    shelf_elem = card.select_one(".authorAllBooks__singleTextShelfRight")
+    if shelf_elem is not None:
+        names = [_node_text(a) for a in shelf_elem.find_all("a") if _node_text(a)]
+        fields["main_shelves"] = ", ".join([s for s in names if s in STANDARD_SHELVES])
+        fields["other_shelves"] = ", ".join([s for s in names if s not in STANDARD_SHELVES])
+
+    return build_book(fields, card_lines)
+
+
+@profiling.profiled()
+def parse_profile_page(html, base_url="https://lubimyczytac.pl"):
+    """
+    Parse one page of a profile library list.
+
+    Args:
+        html (str | bytes): Raw page source
+        base_url (str): URL used to resolve relative book links
+
+    Returns:
+        tuple[list, bool]: (books on the page, whether a next page exists)
+    """
+    if not html:
+        return [], False
+
+    soup = BeautifulSoup(html, "html.parser")
+    books = [_parse_card(card, base_url) for card in soup.select(".authorAllBooks__single")]
+
+    next_button = soup.select_one(".next-page")
+    has_next = next_button is not None and "disabled" not in " ".join(next_button.get("class", []))
+    return books, has_next
+
+
+def has_next_page(html):
+    """Cheaply check a raw list page for an enabled `next-page` paginator button."""
+    for match in _NEXT_PAGE_CLASS.finditer(html or ""):
+        if "disabled" not in match.group(1):
+            return True
+    return False
+
+
+def card_fingerprints(html):
+    """
+    Hash what a re-scrape cares about on each card of a raw list page without parsing it.
+
+    Covers the card's star ratings (average and the user's), rating, reader
+    and opinion counts, read date and shelf names, so any value the scraper
+    extracts from a card changes its fingerprint. A card keeps its fingerprint
+    when it moves to another position or page.
+
+    Returns:
+        list[tuple[str, str]]: (book id, hex digest) per card, in page order
+    """
+    html = html or ""
+    starts = list(_CARD_START.finditer(html))
+    fingerprints = []
+    for idx, start in enumerate(starts):
+        end = starts[idx + 1].start() if idx + 1 < len(starts) else len(html)
+        card = html[start.start(): end]
+        parts = _CARD_RATING.findall(card)
+        parts += _CARD_RATING_COUNT.findall(card)
+        parts += _CARD_SMALL_GREY.findall(card)
+        parts += _CARD_READ_DATES.findall(card)
+        shelves = _CARD_SHELVES.search(card)
+        if shelves is not None:
+            # Stop at the shelf box, so the paginator after a page's last card is not counted.
+            shelves_end = card.find("</div>", shelves.end())
+            parts += _ANCHOR_TEXT.findall(card, shelves.end(), shelves_end if shelves_end != -1 else len(card))
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update("\x1f".join(_clean_text(html_lib.unescape(part)) for part in parts).encode("utf-8"))
+        fingerprints.append((start.group(1), digest.hexdigest()))
+    return fingerprints
+
+
+@profiling.profiled()
+def parse_book_details(html):
+    """
+    Parse ISBN and original title from a book page.
+
+    Returns:
+        tuple[str, str]: (isbn, original_title)
+    """
+    if not html:
+        return "", "BRAK"
+
+    soup = BeautifulSoup(html, "html.parser")
+    isbn_meta = soup.find("meta", attrs={"property": "books:isbn"})
+    isbn = _clean_text(isbn_meta.get("content", "")) if isbn_meta is not None else ""
+
+    details_section = soup.find(id="book-details")
+    section_content = details_section.decode_contents() if details_section is not None else ""
+    return isbn, _extract_original_title(section_content)
+
+
+def apply_details(book, isbn, original_title):
+    """Store enrichment results on a book; return True when the title fallback was used."""
+    book.isbn = isbn or book.isbn
+    if original_title != "BRAK":
+        book.title = original_title
+        return False
+    book.title = book.polish_title
+    return True
@@ -0,0 +1,117 @@
+"""
+Module for decoupling page fetching from page parsing.
+
+I/O workers fetch raw pages and hand them to a process pool for parsing.
+Parsed results come back through a bounded queue, so fetching pauses when
+parsing (or the consumer) falls behind instead of buffering every page.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from scraper.profiling import continue_stack, thread_root
+
+_DONE = object()
+
+
+def _identity(item):
+    return item
+
+
+class ParsePipeline:
+    """
+    Fetch items with I/O threads and parse the raw pages in worker processes.
+
+    Args:
+        parse (callable): Picklable function turning one raw page into a result
+        workers (int): Parser processes; 0 parses inline in the fetch thread
+        max_pending (int): Fetched pages allowed to wait for the consumer
+        fetch_workers (int): Parallel fetch threads (keep 1 for a WebDriver)
+    """
+
+    def __init__(self, parse, workers=None, max_pending=8, fetch_workers=1):
+        self.parse = parse
+        self.workers = workers
+        self.max_pending = max(1, max_pending)
+        self.fetch_workers = max(1, fetch_workers)
+
+    def run(self, items, fetch=None, stop=None):
+        """
+        Yield `(item, parsed)` pairs for every item.
+
+        `fetch(item)` is called on an I/O thread and must return the raw page.
+        Without `fetch`, each item is already a raw page and the iterable itself
+        may do the loading (e.g. a generator driving a browser).
+        With a single fetch worker results keep the input order.
+
+        `stop` (a threading.Event, created when not given) is set as soon as the
+        run ends, also on an error or when the consumer stops early, before the
+        fetch threads are joined. An `items` iterable that can block must return
+        once it is set, or the join waits for it forever.
+        """
+        fetch = fetch or _identity
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers != 0 else None
+        results = queue.Queue(maxsize=self.max_pending)
+        stop = stop or threading.Event()
+        source = iter(items)
+        source_lock = threading.Lock()
+        root = thread_root()
+
+        def put(entry):
+            # Blocks while the queue is full; that is the backpressure on fetching.
+            while not stop.is_set():
+                try:
+                    results.put(entry, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            continue_stack(root)
+            try:
+                while not stop.is_set():
+                    with source_lock:
+                        item = next(source, _DONE)
+                    if item is _DONE:
+                        break
+                    raw = fetch(item)
+                    if pool is not None:
+                        parsed = pool.submit(self.parse, raw)
+                    else:
+                        parsed = Future()
+                        try:
+                            parsed.set_result(self.parse(raw))
+                        except Exception as exc:
+                            parsed.set_exception(exc)
+                    if not put((item, parsed)):
+                        break
+            except Exception as exc:
+                put((_DONE, exc))
+            finally:
+                put((_DONE, None))
+
+        threads = [
+            threading.Thread(target=produce, name=f"fetch-{idx}", daemon=True)
+            for idx in range(self.fetch_workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        finished = 0
+        try:
+            while finished < len(threads):
+                item, parsed = results.get()
+                if item is _DONE:
+                    if parsed is not None:
+                        raise parsed
+                    finished += 1
+                    continue
+                yield item, parsed.result()
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
@@ -5,8 +5,10 @@ This module contains functions for navigating through a user's book list
 and extracting detailed information about each book.
 """
 
-import re
+import itertools
+import threading
 import time
+from functools import partial
 
 from selenium import webdriver
 from selenium.common.exceptions import TimeoutException
@@ -14,21 +16,13 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from models import Book
-
-
-STANDARD_SHELVES = {
-    "Przeczytane",
-    "Teraz czytam",
-    "Chce przeczytac",
-    "Chcę przeczytać",
-}
-
-
-def _clean_text(value):
-    if isinstance(value, str):
-        return value.strip()
-    return ""
+from scraper.concurrency import AIMDController
+from scraper.http_backend import HttpFetcher, page_url
+from scraper.page_cache import parse_known_page
+from scraper.parsing import STANDARD_SHELVES, _clean_text, build_book, has_next_page
+from scraper.pipeline import ParsePipeline
+from scraper.profiling import count, profiled, section
+from scraper.throttle import RateLimiter
 
 
 def _safe_element_text(element):
@@ -41,22 +35,54 @@ def _safe_element_text(element):
         return ""
 
 
-def _first_text(book, locators):
+TITLE_LOCATORS = [
+    (By.CLASS_NAME, "authorAllBooks__singleTextTitle"),
+    (By.CSS_SELECTOR, '[class*="singleTextTitle"]'),
+    (By.CSS_SELECTOR, '[class*="listLibrary__title"]'),
+]
+
+AUTHOR_LOCATORS = [
+    (By.CLASS_NAME, "authorAllBooks__singleTextAuthor"),
+    (By.CSS_SELECTOR, '[class*="singleTextAuthor"]'),
+    (By.CSS_SELECTOR, '[class*="listLibrary__author"]'),
+]
+
+
+@profiled()
+def _first_text(book, locators, field=None, locator_stats=None):
+    """
+    Return the text of the first locator that finds a non-empty element.
+
+    With `locator_stats`, locators are tried in the order learned for `field`
+    and every attempt is recorded.
+    """
+    if locator_stats is not None:
+        locators = locator_stats.order(field, locators)
     for by, value in locators:
         try:
             element = book.find_element(by, value)
         except Exception:
+            count("locator %s", "exception", value)
+            if locator_stats is not None:
+                locator_stats.record(field, (by, value), False)
             continue
 
         text = _safe_element_text(element)
+        if locator_stats is not None:
+            locator_stats.record(field, (by, value), bool(text))
         if text:
+            count("locator %s", "hit", value)
             return text
+        count("locator %s", "empty", value)
+    count("_first_text", "all missed")
     return ""
 
 
+@profiled()
 def _get_card_lines(driver, book):
     raw = _clean_text(book.text)
     if raw:
+        count("_get_card_lines", "element text")
         return [line.strip() for line in raw.splitlines() if line.strip()]
 
     # Some cards return empty .text even when content exists in the DOM.
@@ -70,314 +96,431 @@ def _get_card_lines(driver, book):
     except Exception:
         raw = ""
 
+    count("_get_card_lines", "execute_script" if raw else "empty")
     return [line.strip() for line in raw.splitlines() if line.strip()]
 
 
-def _is_metadata_line(line):
-    lower = line.lower()
-    if lower.startswith("cykl:"):
-        return True
-    if "ocen" in lower:
-        return True
-    if lower.startswith("czytelnicy:") or lower.startswith("opinie:"):
-        return True
-    if lower.startswith("przeczyta"):
-        return True
-    if line in STANDARD_SHELVES:
-        return True
-    if re.match(r"^\d+[,.]\d$", line):
-        return True
-    return False
-
-
-def _is_ui_noise_line(line):
-    lower = line.lower()
-    noise_markers = [
-        "na półkach",
-        "na p\u00f3\u0142kach",
-        "dodaj na p\u00f3\u0142k",
-        "dodaj na półk",
-        "kup ksi\u0105\u017ck",
-        "kup książk",
-        "/ 10",
-    ]
-    return any(marker in lower for marker in noise_markers)
-
-
-def scrape_books(profile_url, log_every=20):
-    """
-    Scrape book data from a user's profile on Lubimyczytac.pl.
+@profiled()
+def _extract_card(driver, book, locator_stats=None):
+    """Read one book card through WebDriver calls and return (Book, card_lines)."""
+    card_lines = _get_card_lines(driver, book)
 
-    This function navigates through all pages of a user's book list,
-    extracting detailed information about each book.
+    # ID
+    try:
+        book_id = _clean_text(book.get_attribute("id")).replace("listBookElement", "")
+    except Exception:
+        book_id = ""
 
-    Args:
-        profile_url (str): URL of the user's profile page
-        log_every (int): Print progress every N scraped books
+    # Link
+    book_link = ""
+    try:
+        anchors = book.find_elements(By.XPATH, './/a[contains(@href, "/ksiazka/")]')
+        if anchors:
+            book_link = _clean_text(anchors[0].get_attribute("href"))
+    except Exception:
+        book_link = ""
 
-    Returns:
-        list: A list of Book objects.
-    """
-    chrome_options = Options()
-    driver = webdriver.Chrome(options=chrome_options)
-    driver.get(profile_url)
+    if not book_link:
+        try:
+            book_link = _clean_text(book.find_element(By.TAG_NAME, "a").get_attribute("href"))
+        except Exception:
+            book_link = ""
 
-    started_at = time.time()
-    page_no = 0
-    total_books = 0
-    debug_dumped = False
-    print("[Phase 1] Starting profile scraping...")
+    # Title and author
+    title = _first_text(book, TITLE_LOCATORS, "polish_title", locator_stats)
+    author = _first_text(book, AUTHOR_LOCATORS, "author", locator_stats)
+
+    # Ratings and cycle
+    cycle = ""
+    avg_rating = ""
+    user_rating = ""
+    rating_count = ""
+    try:
+        cycle_elem = book.find_elements(By.CLASS_NAME, "listLibrary__info--cycles")
+        cycle = _safe_element_text(cycle_elem[0]) if cycle_elem else ""
+        if cycle.lower().startswith("cykl:"):
+            cycle = cycle.split(":", 1)[1].strip()
+    except Exception:
+        cycle = ""
 
-    # Cookie consent if available.
     try:
-        accept_btn = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, '//button[contains(text(), "Akcept")]'))
+        rating_elements = book.find_elements(By.CLASS_NAME, "listLibrary__rating")
+        if rating_elements:
+            avg_rating = _safe_element_text(
+                rating_elements[0].find_element(By.CLASS_NAME, "listLibrary__ratingStarsNumber")
+            )
+        if len(rating_elements) > 1:
+            user_rating = _safe_element_text(
+                rating_elements[1].find_element(By.CLASS_NAME, "listLibrary__ratingStarsNumber")
+            )
+    except Exception:
+        pass
+
+    try:
+        rating_count = _safe_element_text(book.find_element(By.CLASS_NAME, "listLibrary__ratingAll"))
+        rating_count = rating_count.replace("ocen", "").strip()
+    except Exception:
+        rating_count = ""
+
+    # Readers and opinions
+    readers = ""
+    opinions = ""
+    try:
+        for ro in book.find_elements(By.CLASS_NAME, "small.grey"):
+            text = _safe_element_text(ro)
+            if "Czytelnicy:" in text:
+                readers = text.replace("Czytelnicy:", "").strip()
+            elif "Opinie:" in text:
+                opinions = text.replace("Opinie:", "").strip()
+    except Exception:
+        pass
+
+    # Read date
+    try:
+        read_date_elem = book.find_element(By.CLASS_NAME, "authorAllBooks__read-dates")
+        read_date = _safe_element_text(read_date_elem)
+        read_date = read_date.replace("Przeczytał:", "").replace("Przeczytal:", "").strip()
+    except Exception:
+        read_date = ""
+
+    # Shelves
+    shelves = ""
+    self_shelves = ""
+    try:
+        shelf_elem = book.find_element(By.CLASS_NAME, "authorAllBooks__singleTextShelfRight")
+        all_shelf_names = [
+            _clean_text(a.text)
+            for a in shelf_elem.find_elements(By.TAG_NAME, "a")
+            if _clean_text(a.text)
+        ]
+        shelves = ", ".join([s for s in all_shelf_names if s in STANDARD_SHELVES])
+        self_shelves = ", ".join([s for s in all_shelf_names if s not in STANDARD_SHELVES])
+    except Exception:
+        pass
+
+    book_record = build_book(
+        {
+            "book_id": book_id,
+            "polish_title": title,
+            "author": author,
+            "cycle": cycle,
+            "avg_rating": avg_rating,
+            "rating_count": rating_count,
+            "readers": readers,
+            "opinions": opinions,
+            "user_rating": user_rating,
+            "link": book_link,
+            "read_date": read_date,
+            "main_shelves": shelves,
+            "other_shelves": self_shelves,
+        },
+        card_lines,
+    )
+    return book_record, card_lines
+
+
+@profiled()
+def _wait_for_cards(driver, timeout=6):
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.CLASS_NAME, "authorAllBooks__single"))
         )
+    except TimeoutException:
+        print("[Phase 1] No books found on page, stopping.")
+        return False
+    return True
+
+
+@profiled()
+def _go_to_next_page(driver, rate_limiter=None):
+    try:
+        next_button = driver.find_element(By.CLASS_NAME, "next-page")
+        if "disabled" in _clean_text(next_button.get_attribute("class")):
+            return False
+        if rate_limiter is not None:
+            rate_limiter.wait()
+        next_button.click()
         time.sleep(1)
-        accept_btn.click()
     except Exception:
-        print("[Phase 1] Cookie consent button not found.")
+        return False
+    return True
 
-    all_books = []
 
+def _iter_page_sources(driver, timeout=6, rate_limiter=None):
+    """Yield the raw source of every list page, following the paginator."""
+    while _wait_for_cards(driver, timeout):
+        yield driver.page_source
+        if not _go_to_next_page(driver, rate_limiter):
+            break
+
+
+def _iter_http_page_sources(fetcher, profile_url):
+    """Yield the raw source of every list page, requesting page=1, 2, ... directly."""
+    page = 1
     while True:
-        page_no += 1
-        try:
-            WebDriverWait(driver, 6).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "authorAllBooks__single"))
-            )
-        except TimeoutException:
+        html = fetcher.fetch(page_url(profile_url, page))
+        if "authorAllBooks__single" not in html:
             print("[Phase 1] No books found on page, stopping.")
             break
+        yield html
+        if not has_next_page(html):
+            break
+        page += 1
 
-        books = driver.find_elements(By.CLASS_NAME, "authorAllBooks__single")
-        page_books = 0
 
-        for book in books:
-            card_lines = _get_card_lines(driver, book)
+def _check_known_pages(page_sources, page_cache):
+    """Replace page sources whose cards all match their stored fingerprints with the cached KnownPage."""
+    for page, html in enumerate(page_sources, start=1):
+        yield page_cache.lookup(page, html) or html
 
-            # ID
-            try:
-                book_id = _clean_text(book.get_attribute("id")).replace("listBookElement", "")
-            except Exception:
-                book_id = ""
 
-            # Link
-            book_link = ""
-            try:
-                anchors = book.find_elements(By.XPATH, './/a[contains(@href, "/ksiazka/")]')
-                if anchors:
-                    book_link = _clean_text(anchors[0].get_attribute("href"))
-            except Exception:
-                book_link = ""
+def _iter_http_pages_parallel(fetch_page, parse, parse_workers, fetch_workers, controller=None):
+    """
+    Fetch list pages speculatively in parallel and yield (books, has_next) for each page in page order.
 
-            if not book_link:
-                try:
-                    book_link = _clean_text(book.find_element(By.TAG_NAME, "a").get_attribute("href"))
-                except Exception:
-                    book_link = ""
+    Page numbers are handed out at most two pages per fetcher ahead of the next
+    page to yield, and never past a page known to be the last one, so a slow or
+    retried page does not let the other fetchers run far beyond the end of the
+    list. With an AIMDController the window follows its current limit, so
+    speculation shrinks when the controller backs off.
+    """
 
-            # Title and author
-            title = _first_text(
-                book,
-                [
-                    (By.CLASS_NAME, "authorAllBooks__singleTextTitle"),
-                    (By.CSS_SELECTOR, '[class*="singleTextTitle"]'),
-                    (By.CSS_SELECTOR, '[class*="listLibrary__title"]'),
-                ],
-            )
-            author = _first_text(
-                book,
-                [
-                    (By.CLASS_NAME, "authorAllBooks__singleTextAuthor"),
-                    (By.CSS_SELECTOR, '[class*="singleTextAuthor"]'),
-                    (By.CSS_SELECTOR, '[class*="listLibrary__author"]'),
-                ],
-            )
+    def window():
+        return 2 * (controller.limit if controller is not None else fetch_workers)
+
+    state = {"next": 1, "last": None, "done": False}
+    progress = threading.Condition()
+    # Set by the pipeline when it shuts down (also on errors), before it joins the fetchers.
+    stopped = threading.Event()
+
+    def pages():
+        for page in itertools.count(1):
+            with progress:
+                while (
+                    not state["done"]
+                    and not stopped.is_set()
+                    and state["last"] is None
+                    and page >= state["next"] + window()
+                ):
+                    progress.wait(0.1)
+                if state["done"] or stopped.is_set() or (state["last"] is not None and page > state["last"]):
+                    return
+            yield page
+
+    def advance(**changes):
+        with progress:
+            if "last" in changes and state["last"] is not None:
+                changes["last"] = min(changes["last"], state["last"])
+            state.update(changes)
+            progress.notify_all()
+
+    pipeline = ParsePipeline(parse, workers=parse_workers, fetch_workers=fetch_workers)
+    results = pipeline.run(pages(), fetch=fetch_page, stop=stopped)
+    parsed = {}
+    next_page = 1
+    try:
+        for page, result in results:
+            books, has_next = result
+            if not books:
+                advance(last=page - 1)
+            elif not has_next:
+                advance(last=page)
+            parsed[page] = result
+            while next_page in parsed:
+                books, has_next = parsed.pop(next_page)
+                if not books:
+                    print("[Phase 1] No books found on page, stopping.")
+                    return
+                yield books, has_next
+                if not has_next:
+                    return
+                next_page += 1
+                advance(next=next_page)
+    finally:
+        # Release fetchers waiting for the window before the pipeline joins them.
+        advance(done=True)
+        results.close()
+
+
+@profiled()
+def scrape_books(
+    profile_url,
+    log_every=20,
+    parse_workers=0,
+    backend="selenium",
+    consent_timeout=10,
+    page_timeout=6,
+    http_timeout=15,
+    http_retries=2,
+    rate=0.0,
+    workers=1,
+    adaptive=False,
+    min_workers=1,
+    page_cache=None,
+    locator_stats=None,
+    rate_limiter=None,
+    strict=False,
+):
+    """
+    Scrape book data from a user's profile on Lubimyczytac.pl.
 
-            # Ratings and cycle
-            cycle = ""
-            avg_rating = ""
-            user_rating = ""
-            rating_count = ""
-            try:
-                cycle_elem = book.find_elements(By.CLASS_NAME, "listLibrary__info--cycles")
-                cycle = _safe_element_text(cycle_elem[0]) if cycle_elem else ""
-                if cycle.lower().startswith("cykl:"):
-                    cycle = cycle.split(":", 1)[1].strip()
-            except Exception:
-                cycle = ""
+    This function navigates through all pages of a user's book list,
+    extracting detailed information about each book.
 
-            try:
-                rating_elements = book.find_elements(By.CLASS_NAME, "listLibrary__rating")
-                if rating_elements:
-                    avg_rating = _safe_element_text(
-                        rating_elements[0].find_element(By.CLASS_NAME, "listLibrary__ratingStarsNumber")
-                    )
-                if len(rating_elements) > 1:
-                    user_rating = _safe_element_text(
-                        rating_elements[1].find_element(By.CLASS_NAME, "listLibrary__ratingStarsNumber")
-                    )
-            except Exception:
-                pass
+    Args:
+        profile_url (str): URL of the user's profile page
+        log_every (int): Print progress every N scraped books
+        parse_workers (int): When > 0, parse raw page sources in that many
+            processes while the browser moves on to the next page
+        backend (str): "selenium" drives Chrome, "http" downloads pages directly
+        consent_timeout (float): Wait for the cookie consent button (seconds)
+        page_timeout (float): Wait for book cards on each page (seconds)
+        http_timeout (float): Request timeout for the http backend (seconds)
+        http_retries (int): Extra attempts after a 429 or 5xx response (http backend)
+        rate (float): Max page requests per second, 0 for no limit
+        workers (int): Parallel list page fetches (http backend only)
+        adaptive (bool): Let an AIMDController pick the number of parallel
+            fetches between `min_workers` and `workers` from observed latency
+        page_cache (PageCache): Reuse the Books of pages whose cards all match
+            earlier runs instead of extracting their cards again
+        locator_stats (LocatorStats): Learn and apply the title and author locator
+            order that works on the current markup (selenium backend)
+        rate_limiter (RateLimiter): Limiter shared with other scrapers, used
+            instead of one built from `rate`
+        strict (bool): Raise RuntimeError when the list stops before its last
+            page, because a page failed to load, instead of returning the books
+            scraped so far
 
+    Returns:
+        list: A list of Book objects.
+    """
+    started_at = time.time()
+    page_no = 0
+    total_books = 0
+    debug_dumped = False
+    rate_limiter = rate_limiter or RateLimiter(rate)
+    all_books = []
+    # Whether the last page scraped links to a next one; still True at the end means the
+    # scrape stopped on a page that did not load rather than on the last page of the list.
+    has_next = False
+    driver = None
+    controller = None
+    parse = partial(parse_known_page, base_url=profile_url)
+
+    if backend == "http":
+        print("[Phase 1] Starting profile scraping...")
+        fetcher = HttpFetcher(timeout=http_timeout, rate_limiter=rate_limiter, retries=http_retries)
+        if workers > 1 or adaptive:
+            def fetch_page(page):
+                html = fetcher.fetch(page_url(profile_url, page))
+                if page_cache is not None and "authorAllBooks__single" in html:
+                    return page_cache.lookup(page, html) or html
+                return html
+
+            if adaptive:
+                controller = AIMDController(min_limit=min_workers, max_limit=workers)
+                fetch_page = controller.track(fetch_page)
+            parsed_pages = _iter_http_pages_parallel(
+                fetch_page, parse, parse_workers, controller.max_limit if controller else workers, controller
+            )
+        else:
+            page_sources = _iter_http_page_sources(fetcher, profile_url)
+            if page_cache is not None:
+                page_sources = _check_known_pages(page_sources, page_cache)
+            parsed_pages = (result for _, result in ParsePipeline(parse, workers=parse_workers).run(page_sources))
+    else:
+        chrome_options = Options()
+        with section("start browser"):
+            driver = webdriver.Chrome(options=chrome_options)
+            driver.get(profile_url)
+        print("[Phase 1] Starting profile scraping...")
+
+        # Cookie consent if available.
+        with section("cookie consent"):
             try:
-                rating_count = _safe_element_text(book.find_element(By.CLASS_NAME, "listLibrary__ratingAll"))
-                rating_count = rating_count.replace("ocen", "").strip()
+                accept_btn = WebDriverWait(driver, consent_timeout).until(
+                    EC.element_to_be_clickable((By.XPATH, '//button[contains(text(), "Akcept")]'))
+                )
+                time.sleep(1)
+                accept_btn.click()
             except Exception:
-                rating_count = ""
+                print("[Phase 1] Cookie consent button not found.")
+
+        page_sources = _iter_page_sources(driver, page_timeout, rate_limiter)
+        if page_cache is not None:
+            page_sources = _check_known_pages(page_sources, page_cache)
+        if parse_workers:
+            parsed_pages = (result for _, result in ParsePipeline(parse, workers=parse_workers).run(page_sources))
+
+    def log_progress():
+        if log_every and (total_books == 1 or total_books % log_every == 0):
+            elapsed = time.time() - started_at
+            books_per_s = total_books / elapsed if elapsed > 0 else 0
+            concurrency = f" | concurrency: {controller.limit}" if controller else ""
+            print(
+                f"[Phase 1] page {page_no} | scraped total: {total_books} | "
+                f"rate: {books_per_s:.2f} books/s{concurrency}"
+            )
 
-            # Readers and opinions
-            readers = ""
-            opinions = ""
-            try:
-                for ro in book.find_elements(By.CLASS_NAME, "small.grey"):
-                    text = _safe_element_text(ro)
-                    if "Czytelnicy:" in text:
-                        readers = text.replace("Czytelnicy:", "").strip()
-                    elif "Opinie:" in text:
-                        opinions = text.replace("Opinie:", "").strip()
-            except Exception:
-                pass
+    if parse_workers or driver is None:
+        for page_books, has_next in parsed_pages:
+            page_no += 1
+            for book_record in page_books:
+                all_books.append(book_record)
+                total_books += 1
+                log_progress()
+            if page_cache is not None:
+                page_cache.store(page_no, page_books)
+            print(f"[Phase 1] page {page_no} done | page books: {len(page_books)} | total: {total_books}")
+    else:
+        while True:
+            page_no += 1
+            if not _wait_for_cards(driver, page_timeout):
+                # The paginator moved on from the previous page, so this one was expected to have cards.
+                has_next = page_no > 1
+                page_no -= 1
+                break
 
-            # Read date
-            try:
-                read_date_elem = book.find_element(By.CLASS_NAME, "authorAllBooks__read-dates")
-                read_date = _safe_element_text(read_date_elem)
-                read_date = read_date.replace("Przeczytał:", "").replace("Przeczytal:", "").strip()
-            except Exception:
-                read_date = ""
+            known = page_cache.lookup(page_no, driver.page_source) if page_cache is not None else None
+            if known is not None:
+                all_books.extend(known.books)
+                total_books += len(known.books)
+                print(f"[Phase 1] page {page_no} unchanged | page books: {len(known.books)} | total: {total_books}")
+                if not _go_to_next_page(driver, rate_limiter):
+                    break
+                continue
 
-            # Shelves
-            shelves = ""
-            self_shelves = ""
-            try:
-                shelf_elem = book.find_element(By.CLASS_NAME, "authorAllBooks__singleTextShelfRight")
-                all_shelf_names = [
-                    _clean_text(a.text)
-                    for a in shelf_elem.find_elements(By.TAG_NAME, "a")
-                    if _clean_text(a.text)
-                ]
-                shelves = ", ".join([s for s in all_shelf_names if s in STANDARD_SHELVES])
-                self_shelves = ", ".join([s for s in all_shelf_names if s not in STANDARD_SHELVES])
-            except Exception:
-                pass
-
-            # Fallback parse from card lines.
-            if card_lines:
-                if not cycle:
-                    for line in card_lines:
-                        if line.lower().startswith("cykl:"):
-                            cycle = line.split(":", 1)[1].strip()
-                            break
-
-                if not rating_count:
-                    for line in card_lines:
-                        if "ocen" in line.lower():
-                            rating_count = line.lower().replace("ocen", "").strip()
-                            break
-
-                if not readers:
-                    for line in card_lines:
-                        if line.startswith("Czytelnicy:"):
-                            readers = line.replace("Czytelnicy:", "").strip()
-                            break
-
-                if not opinions:
-                    for line in card_lines:
-                        if line.startswith("Opinie:"):
-                            opinions = line.replace("Opinie:", "").strip()
-                            break
-
-                if not read_date:
-                    for line in card_lines:
-                        if line.lower().startswith("przeczyta"):
-                            read_date = line.split(":", 1)[1].strip() if ":" in line else ""
-                            break
-
-                rating_candidates = [line for line in card_lines if re.match(r"^\d+[,.]\d$", line)]
-                if not avg_rating and rating_candidates:
-                    avg_rating = rating_candidates[0]
-                if not user_rating and len(rating_candidates) > 1:
-                    user_rating = rating_candidates[1]
-
-                if not shelves:
-                    found_standard = [line for line in card_lines if line in STANDARD_SHELVES]
-                    if found_standard:
-                        shelves = ", ".join(dict.fromkeys(found_standard))
-                # Do not infer self_shelves from raw card lines.
-                # It produces UI noise like "Na półkach", "KUP KSIĄŻKĘ", ratings etc.
-
-                content_lines = [line for line in card_lines if not _is_metadata_line(line)]
-                if not title and content_lines:
-                    title = content_lines[0]
-                if not author and len(content_lines) > 1:
-                    author = content_lines[1]
-
-            if self_shelves:
-                cleaned = []
-                for part in [p.strip() for p in self_shelves.split(",") if p.strip()]:
-                    if not _is_ui_noise_line(part):
-                        cleaned.append(part)
-                self_shelves = ", ".join(dict.fromkeys(cleaned))
-
-            # Last fallback for title from URL slug.
-            if not title and book_link:
-                try:
-                    slug = book_link.rstrip("/").rsplit("/", 1)[-1]
-                    title = slug.replace("-", " ")
-                except Exception:
-                    pass
-
-            if (not title and not author) and (not debug_dumped):
-                print(f"[Phase 1][debug] Empty title/author for first card. Lines: {card_lines[:10]}")
-                debug_dumped = True
-
-            # Filled in phase 2.
-            isbn = ""
-            original_title = ""
-
-            all_books.append(
-                Book(
-                    book_id=book_id,
-                    polish_title=title,
-                    author=author,
-                    isbn=isbn,
-                    cycle=cycle,
-                    avg_rating=avg_rating,
-                    rating_count=rating_count,
-                    readers=readers,
-                    opinions=opinions,
-                    user_rating=user_rating,
-                    link=book_link,
-                    read_date=read_date,
-                    main_shelves=shelves,
-                    other_shelves=self_shelves,
-                    title=original_title,
-                )
-            )
+            books = driver.find_elements(By.CLASS_NAME, "authorAllBooks__single")
+            page_records = []
 
-            page_books += 1
-            total_books += 1
-            if log_every and (total_books == 1 or total_books % log_every == 0):
-                elapsed = time.time() - started_at
-                rate = total_books / elapsed if elapsed > 0 else 0
-                print(
-                    f"[Phase 1] page {page_no} | scraped total: {total_books} | "
-                    f"rate: {rate:.2f} books/s"
-                )
+            for book in books:
+                book_record, card_lines = _extract_card(driver, book, locator_stats)
 
-        print(f"[Phase 1] page {page_no} done | page books: {page_books} | total: {total_books}")
+                if (not book_record.polish_title and not book_record.author) and (not debug_dumped):
+                    print(f"[Phase 1][debug] Empty title/author for first card. Lines: {card_lines[:10]}")
+                    debug_dumped = True
 
-        try:
-            next_button = driver.find_element(By.CLASS_NAME, "next-page")
-            if "disabled" in _clean_text(next_button.get_attribute("class")):
+                all_books.append(book_record)
+                page_records.append(book_record)
+                total_books += 1
+                log_progress()
+
+            if page_cache is not None:
+                page_cache.store(page_no, page_records)
+            print(f"[Phase 1] page {page_no} done | page books: {len(page_records)} | total: {total_books}")
+
+            if not _go_to_next_page(driver, rate_limiter):
                 break
-            next_button.click()
-            time.sleep(1)
-        except Exception:
-            break
 
-    driver.quit()
+    if driver is not None:
+        driver.quit()
+    if controller is not None:
+        print(f"[Phase 1] Adaptive {controller.summary()}")
+    if page_cache is not None:
+        print(f"[Phase 1] {page_cache.summary()}")
+    if has_next:
+        print(f"[Phase 1] List page {page_no + 1} could not be loaded; the list is incomplete.")
+        if strict:
+            raise RuntimeError(f"list page {page_no + 1} could not be loaded")
     print(f"[Phase 1] Scraping completed in {time.time() - started_at:.1f}s.")
     return all_books
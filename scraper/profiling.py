@@ -0,0 +1,186 @@
+"""
+Module with the opt-in profiler behind `lubimy <command> --profile`.
+
+Scraper helpers are wrapped with `profiled` and mark their fallback branches
+with `count`. While no `Profiler` is active both are a single global lookup,
+so the hooks stay in place in normal runs. An active profiler records, per
+thread, a stack of timed sections and keeps:
+
+- calls, total and self time and raised exceptions per function,
+- outcome counts per branch site, e.g. which locator of `_first_text` hit or
+  threw and how often a card needed the `execute_script` text fallback,
+- self time per call stack, written as a collapsed-stack file
+  (`frame;frame;frame microseconds` lines) for flamegraph.pl, speedscope or
+  inferno.
+
+Only the main process is measured; parser worker processes are not.
+"""
+
+import functools
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+
+_active = None
+_NO_SECTION = nullcontext()
+
+
+def profiled(name=None):
+    """Decorator timing every call of a function under `name` (the function's name by default)."""
+
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.section(label):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def section(name):
+    """Time a block under `name` when a profiler is active; a shared no-op context otherwise."""
+    profiler = _active
+    if profiler is None:
+        return _NO_SECTION
+    return profiler.section(name)
+
+
+def count(site, outcome, *args):
+    """
+    Record that branch site `site` took `outcome` when a profiler is active.
+
+    With `args`, `site` is a %-format string filled in only while a profiler
+    records, so hot paths pass e.g. `count("locator %s", "hit", value)`.
+    """
+    profiler = _active
+    if profiler is not None:
+        profiler.count(site % args if args else site, outcome)
+
+
+def active():
+    """Whether a profiler is recording, for hooks that need extra work to report."""
+    return _active is not None
+
+
+def thread_root():
+    """Call stack of the calling thread, for threads it starts to continue with `continue_stack`."""
+    profiler = _active
+    if profiler is None:
+        return ""
+    return profiler._path()
+
+
+def continue_stack(root):
+    """Record the calling thread's sections below `root`, e.g. a pool thread below its parent."""
+    profiler = _active
+    if profiler is not None and root:
+        profiler._local.root = root + ";"
+
+
+class _Section:
+    __slots__ = ("profiler", "name", "started", "children")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.children = 0.0
+        self.profiler._stack().append(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.started
+        path = self.profiler._path()
+        stack = self.profiler._stack()
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        self.profiler._record(self.name, path, elapsed, elapsed - self.children, exc_type is not None)
+        return False
+
+
+class Profiler:
+    """
+    Collects timings and branch counts while active; use as a context manager.
+
+    Only one profiler is active at a time. Sections entered from any thread are
+    recorded, each thread keeping its own call stack; threads that called
+    `continue_stack` report theirs below the stack of the thread that started them.
+    """
+
+    def __init__(self):
+        self.functions = defaultdict(lambda: [0, 0.0, 0.0, 0])  # calls, total, self, errors
+        self.stacks = Counter()
+        self.branches = Counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        global _active
+        _active = self
+        return self
+
+    def __exit__(self, *exc_info):
+        global _active
+        _active = None
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _path(self):
+        return getattr(self._local, "root", "") + ";".join(frame.name for frame in self._stack())
+
+    def section(self, name):
+        return _Section(self, name)
+
+    def _record(self, name, path, elapsed, own, failed):
+        with self._lock:
+            stats = self.functions[name]
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] += own
+            stats[3] += failed
+            self.stacks[path] += own
+
+    def count(self, site, outcome):
+        with self._lock:
+            self.branches[(site, outcome)] += 1
+
+    def write_collapsed(self, path):
+        """Write self time per call stack in collapsed-stack format (microseconds)."""
+        with open(path, mode="w", encoding="utf-8") as file:
+            for stack, seconds in sorted(self.stacks.items()):
+                micros = round(seconds * 1_000_000)
+                if micros:
+                    file.write(f"{stack} {micros}\n")
+
+    def report(self):
+        """Return the function timing table and the branch outcome table as text."""
+        lines = [f"{'function':<40} {'calls':>9} {'total s':>10} {'self s':>10} {'ms/call':>9} {'errors':>7}"]
+        for name, (calls, total, own, errors) in sorted(self.functions.items(), key=lambda item: -item[1][1]):
+            lines.append(
+                f"{name:<40} {calls:>9} {total:>10.3f} {own:>10.3f} {total / calls * 1000:>9.2f} {errors:>7}"
+            )
+
+        site_totals = Counter()
+        for (site, _), hits in self.branches.items():
+            site_totals[site] += hits
+        if self.branches:
+            lines.append("")
+            lines.append(f"{'branch':<56} {'outcome':<16} {'count':>9} {'share':>7}")
+            for (site, outcome), hits in sorted(self.branches.items(), key=lambda item: (item[0][0], -item[1])):
+                lines.append(f"{site:<56} {outcome:<16} {hits:>9} {hits / site_totals[site]:>7.1%}")
+        return "\n".join(lines)
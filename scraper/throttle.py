@@ -0,0 +1,35 @@
+"""
+Module for limiting how often pages are requested from Lubimyczytac.pl.
+"""
+
+import threading
+import time
+
+from scraper.profiling import profiled
+
+
+class RateLimiter:
+    """
+    Spread requests evenly so that at most `rate` start per second.
+
+    The limiter is shared by every fetch thread of a run; a rate of 0 disables it.
+    """
+
+    def __init__(self, rate=0.0, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    @profiled("RateLimiter.wait")
+    def wait(self):
+        """Block until the caller may send its next request."""
+        if not self.rate or self.rate <= 0:
+            return
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate
+        if slot > now:
+            self._sleep(slot - now)
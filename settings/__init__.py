@@ -0,0 +1,3 @@
+from settings.run_config import PRESETS, RunConfig, add_config_arguments, load_config
+
+__all__ = ["RunConfig", "PRESETS", "load_config", "add_config_arguments"]
@@ -0,0 +1,229 @@
+"""
+Module with the typed run configuration shared by every pipeline phase.
+
+Values are layered, later sources winning: dataclass defaults, the selected
+preset, the [settings] section of config.ini, LUBIMY_* environment variables
+and finally command-line flags.
+"""
+
+import configparser
+import os
+import re
+from dataclasses import MISSING, dataclass, field, fields
+
+
+ENV_PREFIX = "LUBIMY_"
+BACKENDS = ("selenium", "http")
+STEPS = ("scrape", "enrich", "export")
+OUTPUT_FORMATS = ("goodreads",)
+
+LIST_QUERY = (
+    "/biblioteczka/lista?page=1&listId=booksFilteredList&findString=&kolejnosc=data-dodania"
+    "&listType=list&objectId={profile_id}&own=0&paginatorType=Standard"
+)
+
+PRESETS = {
+    "polite": {
+        "backend": "selenium",
+        "workers": 1,
+        "parse_workers": 0,
+        "rate": 0.5,
+        "min_delay": 1.2,
+        "max_delay": 2.8,
+    },
+    "fast-local": {
+        "backend": "http",
+        "workers": 8,
+        "adaptive": True,
+        "parse_workers": 4,
+        "rate": 0.0,
+        "min_delay": 0.0,
+        "max_delay": 0.0,
+        "page_timeout": 3.0,
+        "detail_timeout": 3.0,
+        "http_timeout": 5.0,
+    },
+    "bulk-nightly": {
+        "backend": "http",
+        "workers": 4,
+        "adaptive": True,
+        "parse_workers": 2,
+        "rate": 2.0,
+        "min_delay": 0.1,
+        "max_delay": 0.5,
+        "scrape_log_every": 500,
+        "enrich_log_every": 200,
+    },
+}
+
+
+def _option(default, help_text):
+    if isinstance(default, tuple):
+        return field(default_factory=lambda: default, metadata={"help": help_text})
+    return field(default=default, metadata={"help": help_text})
+
+
+@dataclass
+class RunConfig:
+    profile_url: str = _option("", "Lubimyczytac profile URL")
+    preset: str = _option("", f"named preset ({', '.join(PRESETS)})")
+    steps: tuple = _option(STEPS, "comma-separated phases to run")
+    backend: str = _option("selenium", "page loader: selenium or http")
+    workers: int = _option(1, "parallel page fetches (http backend); upper bound when adaptive")
+    min_workers: int = _option(1, "lower bound for adaptive concurrency")
+    adaptive: bool = _option(False, "tune parallel fetches from observed latency and errors")
+    parse_workers: int = _option(0, "parser processes; 0 parses inline")
+    rate: float = _option(0.0, "max page requests per second; 0 disables the limit")
+    min_delay: float = _option(1.2, "minimum pause after each book page (seconds)")
+    max_delay: float = _option(2.8, "maximum pause after each book page (seconds)")
+    scrape_log_every: int = _option(20, "phase 1 progress line every N books")
+    enrich_log_every: int = _option(5, "phase 2 progress line every N books")
+    enrich_window: int = _option(0, "stream phase 2 through a disk queue, N books in memory at a time; 0 loads all")
+    consent_timeout: float = _option(10.0, "wait for the cookie consent button (seconds)")
+    page_timeout: float = _option(6.0, "wait for book cards on a list page (seconds)")
+    detail_timeout: float = _option(5.0, "wait for a book page to load (seconds)")
+    http_timeout: float = _option(15.0, "HTTP request timeout (seconds)")
+    http_retries: int = _option(2, "extra attempts after an HTTP 429 or 5xx response")
+    list_query: str = _option(LIST_QUERY, "library list path appended to profile_url")
+    cache_dir: str = _option("dane/cache", "directory for caches and run state")
+    task_queue: str = _option("dane/tasks.sqlite", "shared task queue of `lubimy coordinate` and `lubimy worker`")
+    reuse_pages: bool = _option(True, "reuse books from list pages unchanged since the last scrape")
+    metadata_index: str = _option("", "offline metadata index built by `lubimy index`; used by enrich when present")
+    books_csv: str = _option("dane/books.csv", "phase 1 output")
+    enriched_csv: str = _option("dane/books_enriched.csv", "phase 2 output")
+    goodreads_csv: str = _option("dane/goodreads.csv", "phase 3 output")
+    output_formats: tuple = _option(OUTPUT_FORMATS, "comma-separated formats written by the export step")
+    goodreads_library: str = _option("", "your Goodreads library export; export reconciles titles against it when set")
+    match_report_csv: str = _option("dane/goodreads_matches.csv", "per-book Goodreads match confidence report")
+    min_match_score: float = _option(0.8, "lowest match score applied during Goodreads reconciliation")
+
+    @property
+    def list_url(self):
+        """Profile library list URL with the configured query appended."""
+        match = re.search(r"/profil/(\d+)", self.profile_url)
+        profile_id = match.group(1) if match else ""
+        return self.profile_url.rstrip("/") + self.list_query.format(profile_id=profile_id)
+
+    def validate(self):
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{self.backend}', expected one of {BACKENDS}")
+        unknown = [step for step in self.steps if step not in STEPS]
+        if unknown:
+            raise ValueError(f"Unknown steps {unknown}, expected any of {STEPS}")
+        unknown = [fmt for fmt in self.output_formats if fmt not in OUTPUT_FORMATS]
+        if unknown:
+            raise ValueError(f"Unknown output formats {unknown}, expected any of {OUTPUT_FORMATS}")
+        if self.workers < 1 or self.min_workers < 1:
+            raise ValueError("workers and min_workers must be at least 1")
+        if self.min_workers > self.workers:
+            raise ValueError("min_workers must not exceed workers")
+        limits = (self.parse_workers, self.rate, self.min_delay, self.max_delay, self.enrich_window, self.http_retries)
+        if min(limits) < 0:
+            raise ValueError("parse_workers, rate, delays, enrich_window and http_retries must not be negative")
+        if not 0 <= self.min_match_score <= 1:
+            raise ValueError("min_match_score must be between 0 and 1")
+        return self
+
+
+def _coerce(option, value):
+    if option.type is tuple:
+        if isinstance(value, (list, tuple)):
+            return tuple(value)
+        return tuple(part.strip() for part in str(value).split(",") if part.strip())
+    if option.type is bool:
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in ("1", "true", "yes", "on"):
+            return True
+        if text in ("0", "false", "no", "off", ""):
+            return False
+        raise ValueError(f"not a boolean: {value!r}")
+    if option.type is int:
+        return int(value)
+    if option.type is float:
+        return float(value)
+    return str(value).strip()
+
+
+def _read_ini(path):
+    parser = configparser.ConfigParser()
+    parser.read(path, encoding="utf-8")
+    settings = dict(parser["settings"]) if parser.has_section("settings") else {}
+    presets = {
+        section.split(":", 1)[1].strip(): dict(parser[section])
+        for section in parser.sections()
+        if section.startswith("preset:")
+    }
+    return settings, presets
+
+
+def load_config(path="config.ini", preset=None, env=None, overrides=None):
+    """
+    Build a RunConfig from defaults, a preset, config.ini, environment and overrides.
+
+    Args:
+        path (str): INI file; a missing file is treated as empty
+        preset (str): Preset name; beats any preset named in env or config.ini
+        env (dict): Environment mapping, os.environ by default
+        overrides (dict): Highest-priority values, e.g. parsed CLI flags;
+            None values and unknown keys are ignored
+
+    Returns:
+        RunConfig: The validated configuration.
+
+    Raises:
+        ValueError: On an unknown preset or an invalid value.
+    """
+    env = os.environ if env is None else env
+    options = {option.name: option for option in fields(RunConfig)}
+
+    ini_values, ini_presets = _read_ini(path)
+    env_values = {
+        name: env[ENV_PREFIX + name.upper()]
+        for name in options
+        if ENV_PREFIX + name.upper() in env
+    }
+    cli_values = {
+        name: value
+        for name, value in (overrides or {}).items()
+        if name in options and value is not None
+    }
+
+    preset_name = preset or cli_values.get("preset") or env_values.get("preset") or ini_values.get("preset") or ""
+    preset_name = preset_name.strip()
+    if preset_name and preset_name not in PRESETS and preset_name not in ini_presets:
+        raise ValueError(f"Unknown preset '{preset_name}', expected one of {sorted({*PRESETS, *ini_presets})}")
+    preset_values = {**PRESETS.get(preset_name, {}), **ini_presets.get(preset_name, {})}
+
+    merged = {}
+    for layer in (preset_values, ini_values, env_values, cli_values):
+        for name, value in layer.items():
+            if name not in options:
+                raise ValueError(f"Unknown setting '{name}'")
+            merged[name] = value
+    merged["preset"] = preset_name
+
+    values = {}
+    for name, value in merged.items():
+        try:
+            values[name] = _coerce(options[name], value)
+        except ValueError:
+            raise ValueError(f"Invalid value for '{name}': {value!r}") from None
+    return RunConfig(**values).validate()
+
+
+def add_config_arguments(parser):
+    """Add --config plus one --option-name flag per RunConfig field to an argparse parser."""
+    parser.add_argument("--config", default="config.ini", help="INI file with a [settings] section")
+    for option in fields(RunConfig):
+        default = option.default if option.default is not MISSING else option.default_factory()
+        if isinstance(default, tuple):
+            default = ",".join(default)
+        parser.add_argument(
+            "--" + option.name.replace("_", "-"),
+            dest=option.name,
+            default=None,
+            help=f"{option.metadata['help']} (default: {default!r})",
+        )
+    return parser
@@ -0,0 +1,7 @@
+"""
+Columnar statistics over exported Lubimyczytac.pl libraries.
+"""
+
+from stats.library import Library, load_library
+
+__all__ = ["Library", "load_library"]
@@ -0,0 +1,359 @@
+"""
+Module for columnar analytics over exported libraries.
+
+`load_library` reads one or many books CSV exports into typed `array` columns,
+parsing numbers ("4,5", "1 234") and read dates ("Przeczytał: 2023-01-01")
+once. Text columns are dictionary-encoded, so group-bys run over small integer
+codes. Parsing CSV is slow for large libraries (about 14 s for 1M rows, most
+of it in the `csv` module and per-value Python calls), so save a loaded
+library once with `Library.save`: the columnar form reloads 1M rows in about
+0.1 s. The reports themselves are plain Python loops over the arrays and take
+around 0.1-0.2 s each per million rows.
+"""
+
+import csv
+import json
+import os
+import re
+from array import array
+from collections import Counter, defaultdict
+from itertools import compress, repeat
+from operator import itemgetter, sub
+
+NAN = float("nan")
+
+TEXT_COLUMNS = ("profile", "author", "title", "cycle", "main_shelf")
+NUMERIC_COLUMNS = {
+    "avg_rating": "d",
+    "user_rating": "d",
+    "rating_count": "q",
+    "readers": "q",
+    "opinions": "q",
+    "read_year": "h",
+    "read_ordinal": "l",
+    "cycle_volume": "h",
+}
+
+_DATE_ISO = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_DATE_PL = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{4})")
+_CYCLE = re.compile(r"^(.*?)\s*\((?:tom|t\.)\s*(\d+)", re.IGNORECASE)
+
+
+def parse_float(value):
+    """'4,5' -> 4.5; empty or malformed -> NaN."""
+    try:
+        return float(value.replace(",", ".").strip()) if value else NAN
+    except ValueError:
+        return NAN
+
+
+def parse_int(value):
+    """'1 234' -> 1234; empty or malformed -> 0."""
+    digits = re.sub(r"\D", "", value or "")
+    return int(digits) if digits else 0
+
+
+def parse_read_date(value):
+    """Return (year, proleptic ordinal) for '2023-01-01' or '01.01.2023' text; (0, 0) if none."""
+    from datetime import date
+
+    match = _DATE_ISO.search(value or "")
+    if match:
+        year, month, day = (int(part) for part in match.groups())
+    else:
+        match = _DATE_PL.search(value or "")
+        if not match:
+            return 0, 0
+        day, month, year = (int(part) for part in match.groups())
+    try:
+        return year, date(year, month, day).toordinal()
+    except ValueError:
+        return year, 0
+
+
+def parse_cycle(value):
+    """'Saga o wiedźminie (tom 1)' -> ('Saga o wiedźminie', 1); no volume -> (name, 0)."""
+    value = (value or "").strip()
+    match = _CYCLE.match(value)
+    if match:
+        return match.group(1).strip(), int(match.group(2))
+    return value, 0
+
+
+class _Encoder:
+    def __init__(self, categories=None):
+        self.categories = list(categories or [""])
+        self.codes = {value: code for code, value in enumerate(self.categories)}
+
+    def encode(self, value):
+        try:
+            return self.codes[value]
+        except KeyError:
+            code = self.codes[value] = len(self.categories)
+            self.categories.append(value)
+            return code
+
+
+class Library:
+    """
+    Columnar book table.
+
+    Text columns are `array('I')` codes into `categories[column]` (code 0 is "");
+    numeric columns are typed arrays with NaN (floats) or 0 (ints) for missing values.
+    """
+
+    def __init__(self, columns, categories):
+        self.columns = columns
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.columns["author"])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def labels(self, column):
+        return self.categories[column]
+
+    # Persistence -----------------------------------------------------------
+
+    def save(self, directory):
+        """Write the library as raw column files plus a JSON manifest."""
+        os.makedirs(directory, exist_ok=True)
+        manifest = {"rows": len(self), "types": {}, "categories": self.categories}
+        for name, values in self.columns.items():
+            manifest["types"][name] = values.typecode
+            with open(os.path.join(directory, f"{name}.bin"), mode="wb") as file:
+                values.tofile(file)
+        with open(os.path.join(directory, "manifest.json"), mode="w", encoding="utf-8") as file:
+            json.dump(manifest, file, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, "manifest.json"), mode="r", encoding="utf-8") as file:
+            manifest = json.load(file)
+        columns = {}
+        for name, typecode in manifest["types"].items():
+            values = array(typecode)
+            with open(os.path.join(directory, f"{name}.bin"), mode="rb") as file:
+                values.fromfile(file, manifest["rows"])
+            columns[name] = values
+        return cls(columns, manifest["categories"])
+
+    # Aggregations ----------------------------------------------------------
+
+    def _mask(self, profile=None):
+        """Per-row selector for `itertools.compress`, or None for all rows."""
+        if profile is None:
+            return None
+        labels = self.categories["profile"]
+        code = labels.index(profile) if profile in labels else -1
+        return list(map(code.__eq__, self.columns["profile"]))
+
+    def _select(self, column, mask):
+        values = self.columns[column]
+        return values if mask is None else compress(values, mask)
+
+    def group_by(self, key, value=None, agg="count", profile=None):
+        """
+        Aggregate `value` per distinct `key` label.
+
+        Args:
+            key (str): Text column ("author", "profile", ...) or numeric column ("read_year")
+            value (str): Numeric column to aggregate; NaN / 0 entries are skipped
+            agg (str): "count", "sum", "mean", "min" or "max"
+            profile (str): Restrict to one profile
+
+        Returns:
+            dict: label -> aggregate; empty / missing keys are left out
+        """
+        if agg not in ("count", "sum", "mean", "min", "max"):
+            raise ValueError(f"Unknown aggregation '{agg}'")
+        mask = self._mask(profile)
+        keys = self._select(key, mask)
+
+        if value is None:
+            if agg != "count":
+                raise ValueError(f"Aggregation '{agg}' needs a value column")
+            result = Counter(keys)
+        else:
+            values = self._select(value, mask)
+            result = _aggregate(keys, values, agg, zero_missing=self.columns[value].typecode != "d")
+
+        labels = self.categories.get(key)
+        if labels is None:
+            return {k: v for k, v in result.items() if k and k == k}
+        return {labels[k]: v for k, v in result.items() if k}
+
+    def books_read_per_year(self, profile=None):
+        """Books with a read date, per year."""
+        return dict(sorted(self.group_by("read_year", profile=profile).items()))
+
+    def rating_distribution(self, profile=None):
+        """Number of books per user rating value."""
+        return dict(sorted(self.group_by("user_rating", profile=profile).items()))
+
+    def rating_deltas(self, key="profile", profile=None):
+        """Mean (user rating - average rating) per `key`, over books with both ratings."""
+        # Lubimyczytac averages use the same 1-10 scale as user ratings.
+        mask = self._mask(profile)
+        # NaN propagates through the subtraction, so one check drops rows missing either rating.
+        deltas = map(sub, self._select("user_rating", mask), self._select("avg_rating", mask))
+        result = _aggregate(self._select(key, mask), deltas, "mean")
+        labels = self.categories.get(key)
+        if labels is None:
+            return {k: v for k, v in result.items() if k}
+        return {labels[k]: v for k, v in result.items() if k}
+
+    def top_authors(self, n=10, profile=None, by="count"):
+        """
+        Authors ranked by number of books (`by="count"`) or mean user rating (`by="rating"`).
+
+        Returns:
+            list[tuple[str, float]]
+        """
+        if by == "rating":
+            scores = self.group_by("author", "user_rating", agg="mean", profile=profile)
+        else:
+            scores = self.group_by("author", profile=profile)
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+    def cycle_completion(self, profile=None):
+        """
+        Per cycle: (read volumes, highest volume seen in the data, completion ratio).
+
+        A volume counts as read when its row has a read date; the cycle length is
+        the highest volume number present in any loaded profile.
+        """
+        volumes = self.columns["cycle_volume"]
+        mask = self._mask(profile)
+        cycles = list(compress(self.columns["cycle"], volumes))
+        read = compress(self.columns["read_year"], volumes)
+        selected = compress(mask, volumes) if mask is not None else repeat(True)
+        volumes = list(compress(volumes, volumes))
+
+        known = defaultdict(int)
+        for cycle, volume in zip(cycles, volumes):
+            if volume > known[cycle]:
+                known[cycle] = volume
+        done = defaultdict(set)
+        for cycle, volume, year, keep in zip(cycles, volumes, read, selected):
+            if year and keep and cycle:
+                done[cycle].add(volume)
+
+        labels = self.categories["cycle"]
+        return {
+            labels[cycle]: (len(read_volumes), known[cycle], len(read_volumes) / known[cycle])
+            for cycle, read_volumes in done.items()
+        }
+
+
+def _aggregate(keys, values, agg, zero_missing=False):
+    """Fold paired keys and values into key -> count / sum / mean / min / max, skipping missing values."""
+    totals = defaultdict(float)
+    counts = defaultdict(int)
+    best = {}
+    pick = {"min": min, "max": max}.get(agg)
+    for k, v in zip(keys, values):
+        if v != v or (zero_missing and not v):
+            continue
+        counts[k] += 1
+        if pick is not None:
+            best[k] = pick(best[k], v) if k in best else v
+        else:
+            totals[k] += v
+    if agg == "count":
+        return counts
+    if agg == "sum":
+        return totals
+    if pick is not None:
+        return best
+    return {k: totals[k] / counts[k] for k in counts}
+
+
+def _profile_name(path):
+    parent = os.path.basename(os.path.dirname(os.path.abspath(path)))
+    return parent if parent and parent != "dane" else os.path.splitext(os.path.basename(path))[0]
+
+
+def load_library(paths, profiles=None):
+    """
+    Load one or many books CSV exports (or saved columnar directories) into a Library.
+
+    Args:
+        paths (str | list): CSV files written by `save_books_to_csv`, or
+            directories written by `Library.save`
+        profiles (list): Profile label per CSV path; defaults to the parent
+            directory name (`dane/<profile>/books.csv`) or the file name.
+            Columnar directories keep the labels they were saved with.
+
+    Returns:
+        Library
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    profiles = profiles or [_profile_name(path) for path in paths]
+
+    encoders = {name: _Encoder() for name in TEXT_COLUMNS}
+    columns = {name: array("I") for name in TEXT_COLUMNS}
+    columns.update({name: array(code) for name, code in NUMERIC_COLUMNS.items()})
+
+    for path, profile in zip(paths, profiles):
+        if os.path.isdir(path):
+            _append_columnar(columns, encoders, Library.load(path))
+            continue
+        profile_code = encoders["profile"].encode(profile)
+        with open(path, mode="r", encoding="utf-8", newline="") as file:
+            reader = csv.reader(file)
+            next(reader, None)
+            _append_rows(columns, encoders, reader, profile_code)
+
+    return Library(columns, {name: encoder.categories for name, encoder in encoders.items()})
+
+
+def _parsed(column, parse):
+    """Parse each distinct string of a column once and map the column through the results."""
+    lookup = {value: parse(value) for value in dict.fromkeys(column)}
+    return map(lookup.__getitem__, column)
+
+
+def _main_shelf(value):
+    return value.split(",")[0].strip()
+
+
+def _append_rows(columns, encoders, rows, profile_code):
+    # Work column by column: ratings, counts and dates repeat heavily, so each
+    # distinct string is parsed once and the column is mapped through a dict.
+    rows = [row if len(row) >= 13 else row + [""] * (13 - len(row)) for row in rows if row]
+    if not rows:
+        return
+    raw = [list(map(itemgetter(idx), rows)) for idx in range(13)]
+    del rows
+
+    def encode(name, values):
+        columns[name].extend(_parsed(values, encoders[name].encode))
+
+    columns["profile"].extend(repeat(profile_code, len(raw[0])))
+    encode("author", raw[2])
+    encode("title", raw[1])
+    cycles = list(_parsed(raw[4], parse_cycle))
+    encode("cycle", [name for name, _ in cycles])
+    columns["cycle_volume"].extend(volume for _, volume in cycles)
+    encode("main_shelf", list(_parsed(raw[12], _main_shelf)))
+    columns["avg_rating"].extend(_parsed(raw[5], parse_float))
+    columns["user_rating"].extend(_parsed(raw[9], parse_float))
+    columns["rating_count"].extend(_parsed(raw[6], parse_int))
+    columns["readers"].extend(_parsed(raw[7], parse_int))
+    columns["opinions"].extend(_parsed(raw[8], parse_int))
+    dates = list(_parsed(raw[11], parse_read_date))
+    columns["read_year"].extend(year for year, _ in dates)
+    columns["read_ordinal"].extend(ordinal for _, ordinal in dates)
+
+
+def _append_columnar(columns, encoders, library):
+    for name in TEXT_COLUMNS:
+        labels = library.categories[name]
+        recode = [encoders[name].encode(label) for label in labels]
+        columns[name].extend(map(recode.__getitem__, library.columns[name]))
+    for name in NUMERIC_COLUMNS:
+        columns[name].extend(library.columns[name])
@@ -62,3 +62,44 @@ def mock_driver():
     isbn_meta.get_attribute.return_value = "9781234567890"
     driver.find_element.return_value = isbn_meta
     return driver
+
+
+@pytest.fixture
+def profile_page_html():
+    return """
+    <html><body>
+    <div class="authorAllBooks__single" id="listBookElement101">
+      <a class="authorAllBooks__singleTextTitle" href="/ksiazka/101/wiedzmin">Wiedźmin</a>
+      <div class="authorAllBooks__singleTextAuthor"><a href="/autor/1/sapkowski">Andrzej Sapkowski</a></div>
+      <span class="listLibrary__info--cycles">Cykl: Saga o wiedźminie (tom 1)</span>
+      <div class="listLibrary__rating"><span class="listLibrary__ratingStarsNumber">7,9</span></div>
+      <div class="listLibrary__rating"><span class="listLibrary__ratingStarsNumber">9,0</span></div>
+      <span class="listLibrary__ratingAll">1200 ocen</span>
+      <span class="small grey">Czytelnicy: 5000</span>
+      <span class="small grey">Opinie: 300</span>
+      <div class="authorAllBooks__read-dates">Przeczytał: 2023-01-01</div>
+      <div class="authorAllBooks__singleTextShelfRight">
+        <a href="#">Przeczytane</a><a href="#">Fantasy</a><a href="#">Dodaj na półkę</a>
+      </div>
+    </div>
+    <div class="authorAllBooks__single" id="listBookElement102">
+      <a href="/ksiazka/102/diuna">
+        <span class="listLibrary__title">Diuna</span>
+      </a>
+      <div>Frank Herbert</div>
+      <div>Teraz czytam</div>
+    </div>
+    <ul class="pagination"><li class="next-page"><a href="?page=2">Dalej</a></li></ul>
+    </body></html>
+    """
+
+
+@pytest.fixture
+def book_page_html():
+    return """
+    <html><head><meta property="books:isbn" content="9788375780635"></head>
+    <body><div id="book-details"><dl>
+      <dt>Tytuł oryginału:</dt>
+      <dd>Ostatnie życzenie</dd>
+    </dl></div></body></html>
+    """
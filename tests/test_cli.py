@@ -0,0 +1,79 @@
+import csv
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+from cli import main, profile_key
+from data_io.csv_utils import load_books_from_csv, save_books_to_csv
+from models import Book
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def test_export_command(sample_books, tmp_path):
+    input_file = os.path.join(tmp_path, "enriched.csv")
+    output_file = os.path.join(tmp_path, "goodreads.csv")
+    save_books_to_csv(sample_books, input_file)
+
+    assert main(["export", "--config", "missing.ini", "--input", input_file, "--output", output_file]) == 0
+
+    with open(output_file, mode="r", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert [row["Title"] for row in rows] == ["Original Title 1", "Original Title 2"]
+
+
+def test_export_command_does_not_import_selenium(sample_books, tmp_path):
+    input_file = os.path.join(tmp_path, "enriched.csv")
+    save_books_to_csv(sample_books, input_file)
+    code = (
+        "import sys, cli; "
+        f"cli.main(['export', '--config', 'missing.ini', '--input', {input_file!r}, "
+        f"'--output', {os.path.join(tmp_path, 'gr.csv')!r}]); "
+        "assert 'selenium' not in sys.modules, 'selenium imported'"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, check=True, capture_output=True)
+
+
+@patch("scraper.profile_scraper.scrape_books")
+def test_scrape_command_with_profile_list(mock_scrape, tmp_path):
+    profiles = os.path.join(tmp_path, "profiles.txt")
+    with open(profiles, mode="w", encoding="utf-8") as file:
+        file.write("# nightly\nhttps://lubimyczytac.pl/profil/1/anna\n\nhttps://lubimyczytac.pl/profil/2/jan\n")
+    mock_scrape.return_value = [Book(book_id="1", polish_title="T")]
+    output = os.path.join(tmp_path, "out", "books.csv")
+
+    cache_dir = os.path.join(tmp_path, "cache")
+    main(["scrape", "--config", "missing.ini", "--profiles", profiles, "--output", output, "--rate", "3",
+          "--cache-dir", cache_dir])
+
+    assert mock_scrape.call_count == 2
+    first_url = mock_scrape.call_args_list[0].args[0]
+    assert first_url.startswith("https://lubimyczytac.pl/profil/1/anna/biblioteczka/lista?page=1")
+    assert mock_scrape.call_args_list[0].kwargs["rate"] == 3.0
+    assert os.path.exists(os.path.join(tmp_path, "out", "1-anna", "books.csv"))
+    assert os.path.exists(os.path.join(tmp_path, "out", "2-jan", "books.csv"))
+
+
+@patch("scraper.enrichment.fill_isbn_and_original_titles")
+def test_enrich_command_resume(mock_fill, sample_books, tmp_path):
+    input_file = os.path.join(tmp_path, "books.csv")
+    output_file = os.path.join(tmp_path, "enriched.csv")
+    for book in sample_books:
+        book.title = ""
+    save_books_to_csv(sample_books, input_file)
+    done = Book(**{**sample_books[0].__dict__, "title": "Done Title", "isbn": "X"})
+    save_books_to_csv([done], output_file)
+
+    main(["enrich", "--config", "missing.ini", "--input", input_file, "--output", output_file, "--resume"])
+
+    pending = mock_fill.call_args.args[0]
+    assert [book.book_id for book in pending] == ["2"]
+    saved = load_books_from_csv(output_file)
+    assert saved[0].title == "Done Title"
+    assert len(saved) == 2
+
+
+def test_profile_key():
+    assert profile_key("https://lubimyczytac.pl/profil/605200/stokuj") == "605200-stokuj"
+    assert profile_key("https://lubimyczytac.pl/profil/605200") == "605200"
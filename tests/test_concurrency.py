@@ -0,0 +1,139 @@
+import threading
+import time
+
+from scraper.concurrency import AIMDController
+from scraper.pipeline import ParsePipeline
+
+
+class SimulatedServer:
+    """Server that serves `capacity` requests at base latency, queues beyond that and throttles when swamped."""
+
+    def __init__(self, capacity, base_latency=0.2, throttle_at=3.0):
+        self.capacity = capacity
+        self.base_latency = base_latency
+        self.throttle_at = throttle_at
+
+    def round(self, in_flight):
+        latency = self.base_latency * max(1.0, in_flight / self.capacity)
+        ok = in_flight <= self.capacity * self.throttle_at
+        return latency, ok
+
+
+def simulate(controller, server, rounds):
+    limits = []
+    for _ in range(rounds):
+        in_flight = controller.limit
+        latency, ok = server.round(in_flight)
+        for _ in range(in_flight):
+            controller.record(latency, ok=ok)
+        limits.append(controller.limit)
+    return limits
+
+
+def test_aimd_controller_converges_to_server_capacity():
+    server = SimulatedServer(capacity=8)
+    controller = AIMDController(min_limit=1, max_limit=64)
+
+    limits = simulate(controller, server, rounds=300)
+
+    steady = limits[100:]
+    average = sum(steady) / len(steady)
+    assert 0.6 * server.capacity <= average <= 1.6 * server.capacity
+    assert max(steady) < 64
+    assert min(steady) >= server.capacity // 2
+
+
+def test_aimd_controller_backs_off_on_errors_and_respects_bounds():
+    controller = AIMDController(min_limit=2, max_limit=10, initial=10)
+    controller.record(0.1, ok=False)
+    assert controller.limit == 5
+    # Later failures from the same burst do not cut again.
+    for _ in range(4):
+        controller.record(0.1, ok=False)
+    assert controller.limit == 5
+
+    for _ in range(200):
+        controller.record(0.1, ok=False)
+    assert controller.limit == 2
+
+    for _ in range(1000):
+        controller.record(0.1)
+    assert controller.limit == 10
+
+
+def test_aimd_controller_limits_in_flight_fetches():
+    controller = AIMDController(min_limit=1, max_limit=3, initial=2)
+    lock = threading.Lock()
+    state = {"now": 0, "peak": 0}
+
+    def fetch(item):
+        with lock:
+            state["now"] += 1
+            state["peak"] = max(state["peak"], state["now"])
+        time.sleep(0.01)
+        with lock:
+            state["now"] -= 1
+        return "<html></html>"
+
+    pipeline = ParsePipeline(len, workers=0, fetch_workers=controller.max_limit)
+    results = list(pipeline.run(range(30), fetch=controller.track(fetch)))
+
+    assert len(results) == 30
+    assert state["peak"] <= controller.max_limit
+    assert controller.completed == 30
+
+
+def test_list_page_speculation_follows_the_controller_limit():
+    from scraper.profile_scraper import _iter_http_pages_parallel
+
+    controller = AIMDController(min_limit=1, max_limit=8, initial=2)
+    requested = []
+    ahead = []
+
+    def fetch(page):
+        requested.append(page)
+        if page == 1:
+            # A slow first page must not let the other fetchers race ahead.
+            time.sleep(0.2)
+            ahead.append(max(requested))
+        return f"page-{page}"
+
+    def parse(html):
+        page = int(html.split("-")[1])
+        return (["book"] if page <= 30 else []), page < 30
+
+    pages = list(_iter_http_pages_parallel(fetch, parse, 0, controller.max_limit, controller))
+
+    assert [books for books, _ in pages] == [["book"]] * 30
+    # Two pages per in-flight fetch ahead of page 1, never all eight fetchers' worth.
+    assert ahead[0] <= 2 * 2
+    assert max(requested) <= 30 + 2 * 2
+
+
+def test_list_page_speculation_stops_when_a_fetch_raises():
+    from scraper.profile_scraper import _iter_http_pages_parallel
+
+    def fetch(page):
+        if page == 1:
+            # By now the other fetcher has run ahead and waits in the speculation window.
+            time.sleep(0.2)
+            raise RuntimeError("page 1 failed")
+        return f"page-{page}"
+
+    def parse(html):
+        return ["book"], True
+
+    errors = []
+
+    def scrape():
+        try:
+            list(_iter_http_pages_parallel(fetch, parse, 0, 2))
+        except RuntimeError as exc:
+            errors.append(str(exc))
+
+    thread = threading.Thread(target=scrape, daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert errors == ["page 1 failed"]
@@ -0,0 +1,61 @@
+import pytest
+
+from settings import PRESETS, RunConfig, load_config
+
+
+def write_ini(tmp_path, text):
+    path = tmp_path / "config.ini"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_load_config_defaults_without_file(tmp_path):
+    config = load_config(str(tmp_path / "missing.ini"), env={})
+    assert config == RunConfig()
+    assert config.steps == ("scrape", "enrich", "export")
+
+
+def test_load_config_layers(tmp_path):
+    path = write_ini(
+        tmp_path,
+        "[settings]\n"
+        "profile_url = https://lubimyczytac.pl/profil/123/someone\n"
+        "preset = fast-local\n"
+        "workers = 3\n"
+        "min_delay = 0.4\n"
+        "steps = enrich, export\n",
+    )
+    env = {"LUBIMY_WORKERS": "5", "LUBIMY_RATE": "1.5"}
+
+    config = load_config(path, env=env, overrides={"rate": "2", "backend": None, "unknown": "x"})
+
+    assert config.preset == "fast-local"
+    assert config.backend == PRESETS["fast-local"]["backend"]
+    assert config.parse_workers == PRESETS["fast-local"]["parse_workers"]
+    assert config.min_delay == 0.4
+    assert config.workers == 5
+    assert config.rate == 2.0
+    assert config.steps == ("enrich", "export")
+    assert "objectId=123&" in config.list_url
+    assert config.list_url.startswith("https://lubimyczytac.pl/profil/123/someone/biblioteczka/lista?page=1")
+
+
+def test_load_config_custom_preset_section(tmp_path):
+    path = write_ini(tmp_path, "[settings]\npreset = box\n\n[preset:box]\nbackend = http\nworkers = 7\n")
+    config = load_config(path, env={})
+    assert (config.backend, config.workers) == ("http", 7)
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [{"preset": "nope"}, {"backend": "curl"}, {"steps": "scrape,upload"}, {"workers": "many"}],
+)
+def test_load_config_rejects_invalid_values(tmp_path, overrides):
+    with pytest.raises(ValueError):
+        load_config(str(tmp_path / "missing.ini"), env={}, overrides=overrides)
+
+
+def test_load_config_rejects_negative_http_retries(tmp_path):
+    assert load_config(str(tmp_path / "missing.ini"), env={"LUBIMY_HTTP_RETRIES": "5"}).http_retries == 5
+    with pytest.raises(ValueError):
+        load_config(str(tmp_path / "missing.ini"), env={}, overrides={"http_retries": "-1"})
@@ -0,0 +1,105 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from models import Book
+from scraper.dedup import BookDetailsCache, LRUCache, normalize_book_url
+from scraper.enrichment import fill_isbn_and_original_titles
+
+
+def test_normalize_book_url():
+    assert normalize_book_url("https://lubimyczytac.pl/ksiazka/4867/wiedzmin") == "ksiazka:4867"
+    assert normalize_book_url("https://LUBIMYCZYTAC.pl/ksiazka/4867/inny-slug?x=1#top") == "ksiazka:4867"
+    assert normalize_book_url("HTTP://Example.com/book1/") == "http://example.com/book1"
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_book_details_cache_coalesces_concurrent_loads():
+    cache = BookDetailsCache()
+    calls = []
+    started = threading.Event()
+
+    def loader():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return ("978", "Original")
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.load("ksiazka:1", loader))) for _ in range(5)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == [("978", "Original")] * 5
+    assert cache.load("ksiazka:1", loader) == ("978", "Original")
+    assert calls == [1]
+
+
+def test_book_details_cache_persistent_store_skips_missing_details():
+    store = {"ksiazka:2": ["111", "Stored"]}
+    cache = BookDetailsCache(maxsize=1, store=store)
+    assert cache.get("ksiazka:2") == ("111", "Stored")
+    cache.put("ksiazka:3", ("", "BRAK"))
+    cache.put("ksiazka:4", ("222", "New"))
+    assert "ksiazka:3" not in store
+    assert store["ksiazka:4"] == ("222", "New")
+
+
+@patch("scraper.enrichment.webdriver.Chrome")
+@patch("scraper.enrichment.get_isbn_from_book_page")
+def test_fill_isbn_fetches_duplicate_links_once(mock_get_isbn, mock_chrome):
+    mock_chrome.return_value = MagicMock()
+    mock_get_isbn.return_value = ("9781234567890", "Original")
+    books = [
+        Book(book_id="1", polish_title="A", link="https://lubimyczytac.pl/ksiazka/10/a"),
+        Book(book_id="1", polish_title="A", link="https://lubimyczytac.pl/ksiazka/10/a-shelf2"),
+        Book(book_id="2", polish_title="B", link="https://lubimyczytac.pl/ksiazka/20/b"),
+    ]
+    cache = BookDetailsCache()
+
+    fill_isbn_and_original_titles(books, min_delay=0, max_delay=0, log_every=1000, cache=cache)
+    more = [Book(book_id="2", polish_title="B", link="https://lubimyczytac.pl/ksiazka/20/b")]
+    fill_isbn_and_original_titles(more, min_delay=0, max_delay=0, log_every=1000, cache=cache)
+
+    assert mock_get_isbn.call_count == 2
+    assert [book.title for book in books + more] == ["Original"] * 4
+    assert all(book.isbn == "9781234567890" for book in books + more)
+
+
+def test_book_details_cache_does_not_keep_missing_details_in_memory():
+    cache = BookDetailsCache()
+    cache.put("ksiazka:3", ("", "BRAK"))
+    assert cache.get("ksiazka:3") is None
+
+
+@patch("scraper.enrichment.parse_unless_cached", side_effect=ValueError("broken page"))
+@patch("scraper.enrichment.HttpFetcher")
+def test_enrichment_releases_claimed_pages_when_parsing_fails(mock_fetcher, mock_parse):
+    mock_fetcher.return_value.fetch.return_value = "<html></html>"
+    books = [Book(book_id="1", polish_title="A", link="https://lubimyczytac.pl/ksiazka/10/a")]
+    cache = BookDetailsCache()
+
+    try:
+        fill_isbn_and_original_titles(books, min_delay=0, max_delay=0, backend="http", cache=cache)
+    except ValueError:
+        pass
+
+    claims = []
+    waiter = threading.Thread(target=lambda: claims.append(cache.begin("ksiazka:10")), daemon=True)
+    waiter.start()
+    waiter.join(timeout=2)
+    assert claims == [(True, None)]
@@ -0,0 +1,140 @@
+import os
+import threading
+from dataclasses import replace
+
+from data_io.csv_utils import load_books_from_csv
+from distributed import SharedRateLimiter, TaskQueue, Worker, seed, wait_until_finished, write_outputs
+from replay import ReplayServer, ReplaySite
+from settings import RunConfig
+
+
+def test_expired_leases_are_reclaimed_and_results_written_once(tmp_path):
+    now = [1000.0]
+    queue = TaskQueue(str(tmp_path / "tasks.sqlite"), max_attempts=2, clock=lambda: now[0])
+    queue.add([("a", "details", {"url": "u"}), ("b", "details", {"url": "v"})])
+    assert queue.add([("a", "details", {"url": "other"})]) == 0
+
+    first = queue.claim("host-1", lease=60, limit=1)
+    assert [task.key for task in first] == ["a"]
+    (second,) = queue.claim("host-2", lease=60, limit=5)
+    assert second.key == "b"
+    assert queue.claim("host-2", lease=60) == []
+    # An owner extends the lease on the task it is running.
+    now[0] += 30
+    assert queue.renew(second, lease=60)
+    queue.complete(second, ["", "BRAK"])
+
+    # host-1 stalls; its lease runs out and host-2 takes the task over.
+    now[0] += 61
+    (retry,) = queue.claim("host-2", lease=60)
+    assert retry.key == "a" and retry.attempts == 2
+    assert not queue.renew(first[0], lease=60)
+    queue.complete(retry, ["978", "Original"], follow_up=[("c", "details", {})])
+    queue.complete(first[0], ["late", "result"], follow_up=[("c", "details", {})])
+
+    assert queue.result("a") == ["978", "Original"]
+    assert queue.counts() == {"done": 2, "pending": 1}
+
+    (task,) = queue.claim("host-3", lease=60, kind="details", limit=5)
+    assert task.key == "c"
+    # host-3's lease runs out and host-4 claims the task; host-3's late failure must not reset it.
+    now[0] += 61
+    (taken,) = queue.claim("host-4", lease=60)
+    queue.fail(task, "too late")
+    assert queue.counts() == {"done": 2, "leased": 1}
+    task = taken
+    queue.fail(task, "boom")
+    assert queue.failures() == [("c", "boom")]
+    queue.close()
+
+
+def test_shared_rate_limiter_spaces_requests_across_processes(tmp_path):
+    path = str(tmp_path / "tasks.sqlite")
+    now = [0.0]
+    sleeps = []
+    with TaskQueue(path) as queue:
+        queue.set_setting("rate", 4)
+
+    limiters = [SharedRateLimiter(path, clock=lambda: now[0], sleep=sleeps.append) for _ in range(2)]
+    for limiter in limiters * 2:
+        limiter.wait()
+
+    assert limiters[0].rate == 4
+    assert sleeps == [0.25, 0.5, 0.75]
+
+    # A new rate from the coordinator applies to limiters that already exist.
+    with TaskQueue(path) as queue:
+        queue.set_setting("rate", 1)
+    limiters[0].wait()
+    assert sleeps[-1] == 1.0
+
+
+def test_worker_claims_profiles_one_at_a_time(tmp_path):
+    site = ReplaySite.synthetic(books=5, per_page=20, seed=2)
+    queue_path = str(tmp_path / "tasks.sqlite")
+    with ReplayServer(site) as server:
+        config = RunConfig(backend="http", scrape_log_every=0, http_timeout=5)
+        list_urls = [replace(config, profile_url=f"{server.url}/profil/{idx}/user").list_url for idx in (1, 2)]
+        with TaskQueue(queue_path) as queue:
+            seed(queue, list_urls)
+            Worker(queue_path, config, owner="host-1").run(max_tasks=1)
+            # The second profile was never leased, so another worker can start it right away.
+            assert queue.counts() == {"done": 1, "pending": 6}
+            (task,) = queue.claim("host-2", limit=10, kind="scrape")
+            assert task.attempts == 1
+
+
+def test_worker_waits_for_seeding_and_fails_unreachable_pages(tmp_path):
+    queue_path = str(tmp_path / "tasks.sqlite")
+    with ReplayServer(error_rate=1.0) as server:
+        config = RunConfig(backend="http", scrape_log_every=0, http_timeout=5, http_retries=0)
+        worker = Worker(queue_path, config, owner="early", poll=0.05)
+        thread = threading.Thread(target=worker.run)
+        thread.start()
+        # The worker started on an empty queue; it keeps polling until the coordinator seeds it.
+        thread.join(timeout=0.3)
+        assert thread.is_alive()
+
+        list_url = RunConfig(profile_url=server.profile_url).list_url
+        with TaskQueue(queue_path) as queue:
+            seed(queue, [list_url])
+            thread.join(timeout=30)
+            assert not thread.is_alive()
+            # Every attempt failed to load the list, so nothing was stored as an empty result.
+            assert queue.failures() == [(f"scrape:{list_url}", "first list page could not be loaded")]
+            assert queue.result(f"scrape:{list_url}") is None
+
+
+def test_workers_crawl_profiles_from_the_shared_queue(tmp_path):
+    site = ReplaySite.synthetic(books=45, per_page=20, seed=5)
+    queue_path = str(tmp_path / "tasks.sqlite")
+    with ReplayServer(site, error_rate=0.05, seed=3) as server:
+        config = RunConfig(backend="http", scrape_log_every=0, http_timeout=5)
+        profiles = [server.url + "/profil/1/anna", server.url + "/profil/2/jan"]
+        list_urls = [replace(config, profile_url=profile).list_url for profile in profiles]
+        with TaskQueue(queue_path) as queue:
+            assert seed(queue, list_urls, rate=200) == 2
+
+            workers = [Worker(queue_path, config, owner=f"host-{idx}", poll=0.05) for idx in range(3)]
+            threads = [threading.Thread(target=worker.run) for worker in workers]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=60)
+            counts = wait_until_finished(queue, log=lambda line: None)
+
+            outputs = [
+                (str(tmp_path / f"books-{idx}.csv"), str(tmp_path / f"enriched-{idx}.csv")) for idx in range(2)
+            ]
+            for list_url, (books_csv, enriched_csv) in zip(list_urls, outputs):
+                assert write_outputs(queue, list_url, books_csv, enriched_csv) == 45
+        book_requests = server.stats["book"]
+
+    # Two lists with the same 45 books: each book page was fetched once.
+    assert counts == {"done": 47}
+    assert book_requests == 45
+    for books_csv, enriched_csv in outputs:
+        assert os.path.exists(books_csv)
+        enriched = load_books_from_csv(enriched_csv)
+        assert all(book.isbn.startswith("978") for book in enriched)
+        assert sum(book.title.startswith("Original ") for book in enriched) == 23
@@ -0,0 +1,82 @@
+import csv
+import os
+
+from data_io.csv_utils import save_books_to_csv
+from metadata.goodreads_match import GoodreadsEntry, GoodreadsMatcher, load_goodreads_library, reconcile_goodreads
+from models import Book
+
+GOODREADS_HEADERS = ["Book Id", "Title", "Author", "Author l-f", "ISBN", "ISBN13", "Publisher", "Year Published"]
+
+
+def write_goodreads_export(path, rows):
+    with open(path, mode="w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(GOODREADS_HEADERS)
+        writer.writerows(rows)
+
+
+def test_load_goodreads_library_normalizes_isbns(tmp_path):
+    path = os.path.join(tmp_path, "goodreads_library_export.csv")
+    write_goodreads_export(path, [["1", "Dune", "Frank Herbert", "Herbert, Frank", '="0441172717"', '=""', "Ace", "1990"]])
+
+    (entry,) = load_goodreads_library(path)
+    assert entry.isbn == "9780441172719"
+    assert entry.year == "1990"
+
+
+def test_matcher_uses_isbn_author_and_title_blocks():
+    matcher = GoodreadsMatcher(
+        [
+            GoodreadsEntry("11", "The Last Wish (The Witcher, #0.5)", "Andrzej Sapkowski", "", "", ""),
+            GoodreadsEntry("12", "Sword of Destiny (The Witcher, #0.7)", "Andrzej Sapkowski", "", "", ""),
+            GoodreadsEntry("13", "Dune", "Frank Herbert", "9780441172719", "", ""),
+            GoodreadsEntry("14", "Solaris", "Stanisław Lem", "", "", ""),
+        ]
+    )
+
+    assert matcher.match(Book(isbn="0-441-17271-7", title="Diuna")).method == "isbn"
+
+    by_author = matcher.match(Book(title="The Last Wish", author="Andrzej Sapkowski"))
+    assert (by_author.entry.book_id, by_author.method) == ("11", "author+title")
+    assert by_author.score == 1.0
+
+    # Diacritics and a missing surname block still find the title.
+    by_title = matcher.match(Book(title="Solaris", author="Stanislaw Lem."))
+    assert by_title.entry.book_id == "14"
+    by_title = matcher.match(Book(title="Solaris", author="S. Lem-Author"))
+    assert (by_title.entry.book_id, by_title.method) == ("14", "title")
+    assert by_title.score < 1.0
+
+    assert matcher.match(Book(title="Zupełnie inna książka", author="Nieznany Autor")).score < 0.6
+
+
+def test_reconcile_goodreads_writes_export_and_report(tmp_path):
+    enriched = os.path.join(tmp_path, "books_enriched.csv")
+    library = os.path.join(tmp_path, "goodreads_library_export.csv")
+    output = os.path.join(tmp_path, "goodreads.csv")
+    report = os.path.join(tmp_path, "goodreads_matches.csv")
+    save_books_to_csv(
+        [
+            Book(book_id="1", polish_title="Ostatnie życzenie", title="Ostatnie życzenie", author="Andrzej Sapkowski"),
+            Book(book_id="2", polish_title="Nieznana", title="Nieznana", author="Anonim"),
+        ],
+        enriched,
+    )
+    write_goodreads_export(
+        library,
+        [["77", "Ostatnie Zyczenie (Saga o Wiedzminie, #1)", "Andrzej Sapkowski", "", "", '="9788375780635"', "", ""]],
+    )
+
+    statuses = reconcile_goodreads(enriched, library, output, report)
+
+    assert statuses == {"matched": 1, "unmatched": 1}
+    with open(output, mode="r", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert rows[0]["Book Id"] == "77"
+    assert rows[0]["ISBN"] == "9788375780635"
+    assert rows[0]["Polish Title"] == "Ostatnie życzenie"
+    assert rows[1]["Book Id"] == ""
+    with open(report, mode="r", encoding="utf-8") as file:
+        report_rows = list(csv.DictReader(file))
+    assert [row["Status"] for row in report_rows] == ["matched", "unmatched"]
+    assert report_rows[0]["Match"] == "author+title"
@@ -0,0 +1,95 @@
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from metadata import DumpIndex, build_index
+from metadata.normalize import author_surname, fold_diacritics, normalize_isbn
+from models import Book
+from scraper.enrichment import fill_isbn_and_original_titles
+
+
+def ol_line(kind, key, data):
+    return "\t".join([kind, key, "1", "2020-01-01T00:00:00", json.dumps({"key": key, **data})])
+
+
+@pytest.fixture
+def metadata_index(tmp_path):
+    dump = os.path.join(tmp_path, "ol_dump.txt")
+    lines = [
+        ol_line(
+            "/type/edition",
+            "/books/OL1M",
+            {
+                "title": "Ostatnie życzenie",
+                "isbn_10": ["83-7578-063-0"],
+                "publishers": ["SuperNOWA"],
+                "publish_date": "2014",
+                "works": [{"key": "/works/OL1W"}],
+                "authors": [{"key": "/authors/OL1A"}],
+            },
+        ),
+        ol_line("/type/work", "/works/OL1W", {"title": "Ostatnie życzenie (The Last Wish)"}),
+        ol_line("/type/author", "/authors/OL1A", {"name": "Andrzej Sapkowski"}),
+        json.dumps(
+            {
+                "isbn": ["9788381883009"],
+                "title": "Diuna",
+                "original_title": "Dune",
+                "authors": ["Frank Herbert"],
+                "year": "2020",
+                "publisher": "Rebis",
+            }
+        ),
+        "not a record",
+    ]
+    with open(dump, mode="w", encoding="utf-8") as file:
+        file.write("\n".join(lines))
+
+    index_path = os.path.join(tmp_path, "index.sqlite")
+    assert build_index(dump, index_path) == 2
+    index = DumpIndex(index_path)
+    yield index
+    index.close()
+
+
+def test_normalize_helpers():
+    assert fold_diacritics("Łódź, żółć") == "Lodz, zolc"
+    assert normalize_isbn("83-7578-063-0") == "9788375780635"
+    assert normalize_isbn("=\"9788375780635\"") == "9788375780635"
+    assert normalize_isbn("12345") == ""
+    assert author_surname("Sapkowski, Andrzej") == author_surname("Andrzej Sapkowski") == "sapkowski"
+
+
+def test_dump_index_isbn_lookup(metadata_index):
+    record = metadata_index.lookup_isbn("8375780630")
+    assert record.title == "Ostatnie życzenie"
+    assert record.original_title == "Ostatnie życzenie (The Last Wish)"
+    assert record.authors == "Andrzej Sapkowski"
+    assert (record.year, record.publisher, record.isbn) == ("2014", "SuperNOWA", "9788375780635")
+    assert metadata_index.lookup_isbn("9780000000002") is None
+
+
+def test_dump_index_title_author_match(metadata_index):
+    assert metadata_index.match("Diuna", "Frank Herbert").original_title == "Dune"
+    assert metadata_index.match("Ostatnie zyczenie", "Sapkowski, Andrzej").isbn == "9788375780635"
+    assert metadata_index.match("Diuna", "Jan Kowalski") is None
+    assert metadata_index.match("Zupełnie inna książka", "Frank Herbert") is None
+
+
+@patch("scraper.enrichment.webdriver.Chrome")
+@patch("scraper.enrichment.get_isbn_from_book_page")
+def test_fill_isbn_uses_resolver_before_page_visits(mock_get_isbn, mock_chrome, metadata_index):
+    mock_chrome.return_value = MagicMock()
+    mock_get_isbn.return_value = ("9780000000001", "Unknown Original")
+    books = [
+        Book(book_id="1", polish_title="Diuna", author="Frank Herbert", link="https://lubimyczytac.pl/ksiazka/1/d"),
+        Book(book_id="2", polish_title="Nieznana", author="Ktoś", link="https://lubimyczytac.pl/ksiazka/2/n"),
+    ]
+
+    fill_isbn_and_original_titles(books, min_delay=0, max_delay=0, log_every=1000, resolver=metadata_index)
+
+    assert (books[0].title, books[0].isbn, books[0].publisher, books[0].year) == ("Dune", "9788381883009", "Rebis", "2020")
+    assert books[1].title == "Unknown Original"
+    mock_get_isbn.assert_called_once_with(mock_chrome.return_value, "https://lubimyczytac.pl/ksiazka/2/n", timeout=5)
@@ -0,0 +1,94 @@
+import time
+
+from scraper.http_backend import page_url
+from scraper.parsing import card_fingerprints, has_next_page, parse_book_details, parse_profile_page
+from scraper.pipeline import ParsePipeline
+
+
+def test_parse_profile_page(profile_page_html):
+    books, has_next = parse_profile_page(profile_page_html, base_url="https://lubimyczytac.pl/profil/1/x")
+
+    assert has_next is True
+    assert len(books) == 2
+    first = books[0]
+    assert first.book_id == "101"
+    assert first.polish_title == "Wiedźmin"
+    assert first.author == "Andrzej Sapkowski"
+    assert first.link == "https://lubimyczytac.pl/ksiazka/101/wiedzmin"
+    assert first.cycle == "Saga o wiedźminie (tom 1)"
+    assert first.avg_rating == "7,9"
+    assert first.user_rating == "9,0"
+    assert first.rating_count == "1200"
+    assert first.readers == "5000"
+    assert first.opinions == "300"
+    assert first.read_date == "2023-01-01"
+    assert first.main_shelves == "Przeczytane"
+    assert first.other_shelves == "Fantasy"
+
+    second = books[1]
+    assert second.polish_title == "Diuna"
+    assert second.author == "Frank Herbert"
+    assert second.main_shelves == "Teraz czytam"
+
+
+def test_parse_profile_page_last_page():
+    html = '<div class="next-page disabled"></div>'
+    assert parse_profile_page(html) == ([], False)
+    assert parse_profile_page("") == ([], False)
+
+
+def test_card_fingerprints_track_ratings_counts_and_shelves(profile_page_html):
+    fingerprints = card_fingerprints(profile_page_html)
+    assert [book_id for book_id, _ in fingerprints] == ["101", "102"]
+
+    def changed(old, new):
+        after = card_fingerprints(profile_page_html.replace(old, new))
+        return [book_id for (book_id, before), (_, now) in zip(fingerprints, after) if before != now]
+
+    assert changed("5000", "5100") == ["101"]
+    assert changed("1200 ocen", "1201 ocen") == ["101"]
+    assert changed("Opinie: 300", "Opinie: 301") == ["101"]
+    assert changed("<html>", "<html lang=\"pl\">") == []
+    assert changed("9,0", "8,0") == ["101"]
+    assert changed(">Fantasy<", ">Ulubione<") == ["101"]
+    # A card's fingerprint does not depend on its position on the page.
+    second = profile_page_html.split('<div class="authorAllBooks__single"', 2)[2]
+    assert card_fingerprints('<div class="authorAllBooks__single"' + second) == fingerprints[1:]
+
+
+def test_parse_book_details(book_page_html):
+    assert parse_book_details(book_page_html) == ("9788375780635", "Ostatnie życzenie")
+    assert parse_book_details("<html></html>") == ("", "BRAK")
+
+
+def test_parse_pipeline_in_processes(book_page_html):
+    pages = {f"http://example.com/book{idx}": book_page_html for idx in range(6)}
+    pipeline = ParsePipeline(parse_book_details, workers=2, max_pending=2)
+
+    results = list(pipeline.run(pages, fetch=pages.get))
+
+    assert [url for url, _ in results] == list(pages)
+    assert all(parsed == ("9788375780635", "Ostatnie życzenie") for _, parsed in results)
+
+
+def test_parse_pipeline_applies_backpressure():
+    fetched = []
+
+    def fetch(item):
+        fetched.append(item)
+        return ""
+
+    results = ParsePipeline(parse_book_details, workers=0, max_pending=2).run(range(20), fetch=fetch)
+    assert next(results) == (0, ("", "BRAK"))
+    time.sleep(0.2)
+    # One consumed, two queued and one blocked on put.
+    assert len(fetched) <= 4
+    results.close()
+
+
+def test_has_next_page_and_page_url():
+    assert has_next_page('<li class="next-page"><a href="?page=2">Dalej</a></li>')
+    assert not has_next_page('<li class="next-page disabled"></li>')
+    assert not has_next_page("")
+    url = page_url("https://lubimyczytac.pl/profil/1/x/biblioteczka/lista?page=1&listId=a&findString=", 3)
+    assert url == "https://lubimyczytac.pl/profil/1/x/biblioteczka/lista?page=3&listId=a&findString="
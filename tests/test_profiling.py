@@ -0,0 +1,99 @@
+import os
+from unittest.mock import MagicMock
+
+from cli import main
+from replay import ReplayServer, ReplaySite
+from scraper.profile_scraper import _first_text, _get_card_lines
+from scraper.profiling import Profiler, count, profiled, section
+
+
+def test_profiler_records_self_time_stacks_and_branches(tmp_path):
+    @profiled()
+    def leaf(fail=False):
+        if fail:
+            raise ValueError("boom")
+
+    @profiled("outer")
+    def outer():
+        leaf()
+        with section("wait"):
+            count("site", "hit")
+        try:
+            leaf(fail=True)
+        except ValueError:
+            count("site", "miss")
+
+    outer()  # inactive: nothing is recorded
+    with Profiler() as profiler:
+        outer()
+    outer()
+
+    assert profiler.functions["outer"][0] == 1
+    assert profiler.functions["leaf"][0] == 2
+    assert profiler.functions["leaf"][3] == 1
+    assert set(profiler.stacks) == {"outer", "outer;leaf", "outer;wait"}
+    assert profiler.branches == {("site", "hit"): 1, ("site", "miss"): 1}
+    outer_calls, outer_total, outer_self, _ = profiler.functions["outer"]
+    assert outer_self <= outer_total
+
+    path = tmp_path / "out.collapsed"
+    profiler.write_collapsed(str(path))
+    for line in path.read_text(encoding="utf-8").splitlines():
+        stack, micros = line.rsplit(" ", 1)
+        assert stack.startswith("outer") and int(micros) > 0
+    assert "50.0%" in profiler.report()
+
+
+def test_card_helpers_count_locator_exceptions_and_fallbacks():
+    title = MagicMock(text="Wiedźmin")
+    book = MagicMock(text="")
+    book.find_element.side_effect = [Exception("no such element"), title]
+    driver = MagicMock()
+    driver.execute_script.return_value = "Wiedźmin\nAndrzej Sapkowski"
+
+    with Profiler() as profiler:
+        text = _first_text(book, [("class name", "missing"), ("css selector", ".title")])
+        lines = _get_card_lines(driver, book)
+
+    assert text == "Wiedźmin"
+    assert lines == ["Wiedźmin", "Andrzej Sapkowski"]
+    assert profiler.branches[("locator missing", "exception")] == 1
+    assert profiler.branches[("locator .title", "hit")] == 1
+    assert profiler.branches[("_get_card_lines", "execute_script")] == 1
+
+
+def test_branch_sites_are_formatted_only_while_profiling():
+    formatted = []
+
+    class Locator:
+        def __str__(self):
+            formatted.append(self)
+            return ".title"
+
+        def __format__(self, spec):
+            return str(self)
+
+    book = MagicMock()
+    book.find_element.return_value = MagicMock(text="Wiedźmin")
+    assert _first_text(book, [("css selector", Locator())]) == "Wiedźmin"
+    assert formatted == []
+
+    with Profiler() as profiler:
+        _first_text(book, [("css selector", Locator())])
+    assert profiler.branches[("locator .title", "hit")] == 1
+
+
+def test_profile_flag_writes_collapsed_stacks(tmp_path, capsys):
+    output = os.path.join(tmp_path, "books.csv")
+    collapsed = os.path.join(tmp_path, "scrape.collapsed")
+    with ReplayServer(ReplaySite.synthetic(books=40, per_page=20)) as server:
+        main(["scrape", "--config", "missing.ini", "--profile-url", server.profile_url, "--backend", "http",
+              "--output", output, "--cache-dir", os.path.join(tmp_path, "cache"), "--profile", collapsed])
+
+    with open(collapsed, encoding="utf-8") as file:
+        stacks = [line.rsplit(" ", 1)[0] for line in file]
+    assert "lubimy scrape;scrape_books;HttpFetcher.fetch" in stacks
+    assert "lubimy scrape;scrape_books;parse_profile_page" in stacks
+    report = capsys.readouterr().out
+    assert "build_book polish_title" in report
+    assert "ms/call" in report
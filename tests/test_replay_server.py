@@ -0,0 +1,154 @@
+import re
+import shutil
+from functools import partial
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from replay import ReplayServer, ReplaySite
+from replay.site import render_list_page
+from scraper.enrichment import fill_isbn_and_original_titles
+from scraper.http_backend import HttpFetcher, page_url
+from scraper.page_cache import PageCache
+from scraper.profile_scraper import scrape_books
+from settings import RunConfig
+
+CHROME = shutil.which("google-chrome") or shutil.which("chromium") or shutil.which("chromium-browser")
+
+
+def list_url(server):
+    return RunConfig(profile_url=server.profile_url).list_url
+
+
+def test_server_paginates_like_the_site():
+    with ReplayServer(ReplaySite.synthetic(books=45, per_page=20)) as server:
+        url = list_url(server)
+        pages = [requests.get(page_url(url, page), timeout=5).text for page in (1, 3, 4)]
+        book = requests.get(server.url + "/ksiazka/100000/slug", timeout=5)
+        missing = requests.get(server.url + "/ksiazka/1/none", timeout=5)
+
+    assert pages[0].count("authorAllBooks__single\"") == 20
+    assert 'class="next-page"' in pages[0]
+    assert pages[1].count("authorAllBooks__single\"") == 5
+    assert "next-page disabled" in pages[1]
+    assert "authorAllBooks__single\"" not in pages[2]
+    assert 'property="books:isbn"' in book.text
+    assert missing.status_code == 404
+
+
+def test_fetcher_retries_throttled_and_failed_requests():
+    with ReplayServer(rate_limit=2, retry_after=0.5) as server:
+        fetcher = HttpFetcher(timeout=5, retries=4)
+        pages = [fetcher.fetch(page_url(list_url(server), 1)) for _ in range(4)]
+        assert server.stats["throttled"] >= 1
+
+    assert all("authorAllBooks__single" in page for page in pages)
+
+
+def test_http_backend_end_to_end(tmp_path):
+    site = ReplaySite.synthetic(books=70, per_page=30, seed=3)
+    # Errors are independent per request, so allow enough retries that a URL failing every time is negligible.
+    fetcher = partial(HttpFetcher, backoff=0.05)
+    with (
+        ReplayServer(site, latency=0.01, error_rate=0.1, seed=1) as server,
+        patch("scraper.profile_scraper.HttpFetcher", fetcher),
+        patch("scraper.enrichment.HttpFetcher", fetcher),
+    ):
+        books = scrape_books(list_url(server), log_every=0, backend="http", workers=3, http_retries=6)
+        fill_isbn_and_original_titles(
+            books, min_delay=0, max_delay=0, log_every=0, backend="http", workers=4, timeout=5, retries=6
+        )
+        stats = dict(server.stats)
+
+    assert len(books) == 70
+    assert len({book.book_id for book in books}) == 70
+    assert books[0].link.startswith(server.url + "/ksiazka/")
+    assert all(book.isbn.startswith("978") for book in books)
+    assert sum(book.title.startswith("Original ") for book in books) == 35
+    # Every 500 was retried, so nothing was lost.
+    assert stats["errors"] > 0
+    assert stats["book"] == 70
+
+
+@pytest.mark.skipif(CHROME is None, reason="Chrome is not installed")
+def test_selenium_backend_end_to_end():
+    from selenium.webdriver.chrome.options import Options
+
+    def headless_options():
+        options = Options()
+        options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        return options
+
+    with ReplayServer(ReplaySite.synthetic(books=12, per_page=5)) as server:
+        with patch("scraper.profile_scraper.Options", headless_options):
+            books = scrape_books(list_url(server), log_every=0, consent_timeout=2, page_timeout=3)
+
+    assert len(books) == 12
+    assert all(book.polish_title and book.author for book in books)
+
+
+def test_parallel_list_fetching_stays_near_the_last_page():
+    with ReplayServer(ReplaySite.synthetic(books=50, per_page=10), latency=0.01, jitter=0.05, seed=2) as server:
+        books = scrape_books(list_url(server), log_every=0, backend="http", workers=6)
+        list_requests = server.stats["list"]
+
+    assert len(books) == 50
+    # 5 real pages plus at most 2 * workers speculative ones.
+    assert list_requests <= 5 + 12
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_strict_scrape_fails_when_a_middle_page_does_not_load(workers):
+    site = ReplaySite.synthetic(books=50, per_page=10, seed=6)
+    site.list_pages[2] = ""
+    with ReplayServer(site) as server:
+        scrape = partial(scrape_books, list_url(server), log_every=0, backend="http", workers=workers)
+        # Without `strict` the books before the failed page are returned, as before.
+        assert len(scrape()) == 20
+        with pytest.raises(RuntimeError, match="list page 3 could not be loaded"):
+            scrape(strict=True)
+
+
+def test_rescrape_reuses_unchanged_pages(tmp_path):
+    site = ReplaySite.synthetic(books=90, per_page=30, seed=4)
+    with ReplayServer(site) as server, PageCache(str(tmp_path / "pages.sqlite"), list_url(server)) as cache:
+        first = scrape_books(list_url(server), log_every=0, backend="http", page_cache=cache)
+        # A new rating on page 2 and a reader count drifting on page 3.
+        rating = 'class="listLibrary__ratingStarsNumber">'
+        site.list_pages[1] = site.list_pages[1].replace(rating, rating + "1", 1)
+        site.list_pages[2] = site.list_pages[2].replace("Czytelnicy: ", "Czytelnicy: 9", 1)
+        cache.hits = cache.misses = 0
+        second = scrape_books(list_url(server), log_every=0, backend="http", workers=2, page_cache=cache)
+
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert len(second) == 90
+    assert second[:30] == first[:30] and second[61:] == first[61:]
+    assert second[30].avg_rating == "1" + first[30].avg_rating
+    assert second[60].readers == "9" + first[60].readers
+
+
+def test_rescrape_reuses_pages_whose_cards_moved(tmp_path):
+    site = ReplaySite.synthetic(books=91, per_page=30, seed=4)
+    card = re.compile(r'<div class="authorAllBooks__single".*?\n</div>', re.S)
+    cards = [match for page in site.list_pages for match in card.findall(page)]
+
+    def paginate(cards):
+        starts = range(0, len(cards), 30)
+        return [
+            render_list_page(cards[start: start + 30], number, start + 30 < len(cards))
+            for number, start in enumerate(starts, start=1)
+        ]
+
+    with ReplayServer(site) as server, PageCache(str(tmp_path / "pages.sqlite"), list_url(server)) as cache:
+        site.list_pages = paginate(cards[1:])
+        first = scrape_books(list_url(server), log_every=0, backend="http", page_cache=cache)
+        # A book added at the top moves every other card down by one position.
+        site.list_pages = paginate(cards)
+        cache.hits = cache.misses = 0
+        second = scrape_books(list_url(server), log_every=0, backend="http", page_cache=cache)
+
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert second[1:] == first
+    assert second[0].book_id == "100000"
@@ -1,6 +1,14 @@
-﻿from unittest.mock import MagicMock, patch
+﻿import os
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+import requests
 
 from scraper import fill_isbn_and_original_titles, get_isbn_from_book_page, scrape_books
+from scraper.locators import LocatorStats
+from scraper.profile_scraper import TITLE_LOCATORS, _first_text
+from scraper.throttle import RateLimiter
 
 
 @patch("scraper.book_details.WebDriverWait")
@@ -47,8 +55,8 @@ def test_fill_isbn_and_original_titles(mock_get_isbn, mock_chrome, sample_books)
     assert enriched_books[1].isbn == "9780987654321"
     assert enriched_books[1].title == sample_books[1].polish_title
 
-    mock_get_isbn.assert_any_call(mock_driver, "http://example.com/book1")
-    mock_get_isbn.assert_any_call(mock_driver, "http://example.com/book2")
+    mock_get_isbn.assert_any_call(mock_driver, "http://example.com/book1", timeout=5)
+    mock_get_isbn.assert_any_call(mock_driver, "http://example.com/book2", timeout=5)
 
 
 @patch("scraper.profile_scraper.webdriver.Chrome")
@@ -121,3 +129,94 @@ def test_scrape_books(mock_sleep, mock_wait, mock_chrome):
     mock_chrome.assert_called_once()
     mock_driver.get.assert_called_once_with("http://example.com/profile")
     mock_driver.quit.assert_called_once()
+
+
+def test_rate_limiter_spaces_requests():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(rate=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        limiter.wait()
+
+    assert sleeps == [0.5, 0.5]
+
+
+def _card_with_title_at(value):
+    """A mocked card whose only title element is found by the locator with `value`."""
+
+    def find_element(by, locator_value):
+        if locator_value != value:
+            raise Exception("no such element")
+        return MagicMock(text="Wiedźmin")
+
+    card = MagicMock()
+    card.find_element.side_effect = find_element
+    return card
+
+
+def test_first_text_learns_locator_order_across_runs(tmp_path):
+    drifted = TITLE_LOCATORS[2][1]
+    stats = LocatorStats()
+    cards = [_card_with_title_at(drifted) for _ in range(5)]
+
+    titles = [_first_text(card, TITLE_LOCATORS, "polish_title", stats) for card in cards]
+
+    assert titles == ["Wiedźmin"] * 5
+    assert cards[0].find_element.call_count == 3
+    assert [card.find_element.call_count for card in cards[1:]] == [1, 1, 1, 1]
+
+    path = str(tmp_path / "locators.json")
+    stats.save(path)
+    card = _card_with_title_at(drifted)
+    assert _first_text(card, TITLE_LOCATORS, "polish_title", LocatorStats.load(path)) == "Wiedźmin"
+    assert card.find_element.call_count == 1
+
+
+def test_first_text_skips_locators_that_keep_missing():
+    stats = LocatorStats(probe_every=1000)
+    cards = [_card_with_title_at("gone") for _ in range(40)]
+
+    for card in cards:
+        assert _first_text(card, TITLE_LOCATORS, "polish_title", stats) == ""
+
+    assert cards[0].find_element.call_count == 3
+    assert cards[-1].find_element.call_count == 0
+
+
+def test_scraper_package_imports_selenium_lazily():
+    code = (
+        "import sys, scraper, scraper.parsing, data_io, models; "
+        "assert 'selenium' not in sys.modules; "
+        "scraper.scrape_books; "
+        "assert 'selenium' in sys.modules"
+    )
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+
+def test_http_fetcher_retries_with_retry_after_and_gives_up():
+    from scraper.http_backend import HttpFetcher
+
+    def response(status, headers=None):
+        return MagicMock(status_code=status, headers=headers or {}, text="<html>ok</html>")
+
+    fetcher = HttpFetcher(retries=2, backoff=0.5, max_backoff=5)
+    session = MagicMock()
+    fetcher._local.session = session
+    session.get.side_effect = [response(429, {"Retry-After": "60"}), response(503), response(200)]
+    with patch("scraper.http_backend.time.sleep") as mock_sleep:
+        assert fetcher.fetch("https://lubimyczytac.pl/ksiazka/1/a") == "<html>ok</html>"
+    # Retry-After is capped at max_backoff; without it the wait is backoff * 2**attempt.
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [5, 1.0]
+
+    failing = response(500)
+    failing.raise_for_status.side_effect = requests.HTTPError("500")
+    session.get.side_effect = [failing] * 3
+    with patch("scraper.http_backend.time.sleep"):
+        assert fetcher.fetch("https://lubimyczytac.pl/ksiazka/1/a") == ""
+    assert session.get.call_count == 6
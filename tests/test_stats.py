@@ -0,0 +1,103 @@
+import math
+import os
+
+import pytest
+
+from data_io.csv_utils import save_books_to_csv
+from models import Book
+from stats import Library, load_library
+from stats.library import parse_cycle, parse_float, parse_int, parse_read_date
+
+
+def book(title, author, user_rating="", avg_rating="", read_date="", cycle="", rating_count=""):
+    return Book(
+        polish_title=title,
+        author=author,
+        user_rating=user_rating,
+        avg_rating=avg_rating,
+        read_date=read_date,
+        cycle=cycle,
+        rating_count=rating_count,
+        main_shelves="Przeczytane" if read_date else "Chcę przeczytać",
+    )
+
+
+@pytest.fixture
+def exports(tmp_path):
+    alice = os.path.join(tmp_path, "alice", "books.csv")
+    bob = os.path.join(tmp_path, "bob", "books.csv")
+    os.makedirs(os.path.dirname(alice))
+    os.makedirs(os.path.dirname(bob))
+    save_books_to_csv(
+        [
+            book("Ostatnie życzenie", "Andrzej Sapkowski", "8", "7,5", "Przeczytał: 2022-03-01",
+                 "Saga o wiedźminie (tom 1)", "1 234"),
+            book("Miecz przeznaczenia", "Andrzej Sapkowski", "9", "7,0", "Przeczytał: 2023-01-01",
+                 "Saga o wiedźminie (tom 2)"),
+            book("Diuna", "Frank Herbert", "10", "8,0", "2023-06-15"),
+            book("Solaris", "Stanisław Lem"),
+        ],
+        alice,
+    )
+    save_books_to_csv(
+        [
+            book("Krew elfów", "Andrzej Sapkowski", "6", "7,0", "01.02.2021", "Saga o wiedźminie (tom 3)"),
+            book("Diuna", "Frank Herbert", "7", "8,0", "2021-05-05"),
+        ],
+        bob,
+    )
+    return [alice, bob]
+
+
+def test_parsers_handle_site_formats():
+    assert parse_float("4,5") == 4.5
+    assert math.isnan(parse_float(""))
+    assert parse_int("1 234") == 1234
+    assert parse_read_date("Przeczytał: 2023-01-01")[0] == 2023
+    assert parse_read_date("01.02.2021")[0] == 2021
+    assert parse_read_date("") == (0, 0)
+    assert parse_cycle("Saga o wiedźminie (tom 2)") == ("Saga o wiedźminie", 2)
+
+
+def test_reports_over_multiple_profiles(exports):
+    library = load_library(exports)
+
+    assert len(library) == 6
+    assert library.labels("profile")[1:] == ["alice", "bob"]
+    assert library["rating_count"][0] == 1234
+    assert library.books_read_per_year() == {2021: 2, 2022: 1, 2023: 2}
+    assert library.books_read_per_year(profile="alice") == {2022: 1, 2023: 2}
+    assert library.rating_distribution(profile="bob") == {6.0: 1, 7.0: 1}
+    assert library.top_authors(1) == [("Andrzej Sapkowski", 3)]
+    assert library.top_authors(1, by="rating")[0][0] == "Frank Herbert"
+
+    deltas = library.rating_deltas()
+    assert deltas["alice"] == pytest.approx((0.5 + 2.0 + 2.0) / 3)
+    assert deltas["bob"] == pytest.approx((-1.0 - 1.0) / 2)
+
+    # The cycle length comes from every profile; completion is per profile.
+    assert library.cycle_completion(profile="alice") == {"Saga o wiedźminie": (2, 3, 2 / 3)}
+    assert library.group_by("author", "user_rating", agg="max") == {
+        "Andrzej Sapkowski": 9.0,
+        "Frank Herbert": 10.0,
+    }
+
+
+def test_columnar_round_trip(exports, tmp_path):
+    library = load_library(exports)
+    columnar = os.path.join(tmp_path, "columnar")
+    library.save(columnar)
+
+    reloaded = Library.load(columnar)
+    assert reloaded.books_read_per_year() == library.books_read_per_year()
+    assert reloaded.top_authors() == library.top_authors()
+
+    # Columnar directories and CSV exports can be mixed.
+    combined = load_library([columnar, exports[1]], profiles=["all", "bob-again"])
+    assert len(combined) == 8
+    assert combined.group_by("profile") == {"alice": 4, "bob": 2, "bob-again": 2}
+
+
+def test_unknown_aggregation_is_rejected(exports):
+    with pytest.raises(ValueError):
+        load_library(exports).group_by("author", "user_rating", agg="median")
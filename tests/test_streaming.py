@@ -0,0 +1,94 @@
+import os
+
+from cli import main
+from data_io.book_queue import BookQueue
+from data_io.csv_utils import load_books_from_csv, save_books_to_csv
+from models import Book
+from replay import ReplayServer, ReplaySite
+from scraper.enrichment import iter_enriched_books
+
+
+def test_book_queue_acknowledges_in_order(tmp_path):
+    path = os.path.join(tmp_path, "queue.sqlite")
+    with BookQueue(path, batch_size=2) as queue:
+        assert queue.push(Book(book_id=str(idx)) for idx in range(5)) == 5
+        books = iter(queue)
+        assert [next(books).book_id for _ in range(3)] == ["0", "1", "2"]
+        queue.ack(2)
+
+    # A new run sees only what was never acknowledged.
+    with BookQueue(path) as queue:
+        assert [book.book_id for book in queue] == ["2", "3", "4"]
+        queue.ack(3)
+        assert len(queue) == 0
+
+
+def test_book_queue_counts_done_books(tmp_path):
+    path = os.path.join(tmp_path, "queue.sqlite")
+    with BookQueue(path, batch_size=2) as queue:
+        queue.clear(done=3)
+        queue.push(Book(book_id=str(idx)) for idx in range(3, 8))
+        next(iter(queue))
+        queue.ack(1)
+        assert queue.drop(2) == 2
+        assert [book.book_id for book in queue] == ["6", "7"]
+
+    with BookQueue(path) as queue:
+        assert queue.done == 6
+        assert queue.drop(5) == 2
+        assert queue.done == 8
+
+
+def test_iter_enriched_books_reads_one_window_at_a_time():
+    site = ReplaySite.synthetic(books=12, per_page=12)
+    with ReplayServer(site) as server:
+        books = [Book(book_id=str(100000 + idx), link=f"{server.url}/ksiazka/{100000 + idx}/x") for idx in range(12)]
+        consumed = []
+
+        def source():
+            for book in books:
+                consumed.append(book.book_id)
+                yield book
+
+        stream = iter_enriched_books(source(), window=5, log_every=0, min_delay=0, max_delay=0, backend="http")
+        first = next(stream)
+        assert len(consumed) == 5
+        rest = list(stream)
+
+    assert [book.book_id for book in [first, *rest]] == [book.book_id for book in books]
+    assert all(book.isbn for book in books)
+
+
+def test_enrich_command_streams_and_resumes(tmp_path):
+    site = ReplaySite.synthetic(books=9, per_page=9)
+    books_csv = os.path.join(tmp_path, "books.csv")
+    output = os.path.join(tmp_path, "books_enriched.csv")
+    queue_path = os.path.join(tmp_path, "books_enriched.queue.sqlite")
+
+    with ReplayServer(site) as server:
+        books = [Book(book_id=str(100000 + idx), link=f"{server.url}/ksiazka/{100000 + idx}/x") for idx in range(9)]
+        # Lists may repeat a book; the output keeps one row per input row.
+        books.insert(6, books[1])
+        save_books_to_csv(books, books_csv)
+        args = [
+            "enrich", "--config", "missing.ini", "--input", books_csv, "--output", output,
+            "--backend", "http", "--enrich-window", "4", "--min-delay", "0", "--max-delay", "0",
+        ]
+
+        # Simulate a run interrupted after the first window was written but before it was acknowledged.
+        with BookQueue(queue_path) as queue:
+            queue.push(load_books_from_csv(books_csv))
+        save_books_to_csv(load_books_from_csv(books_csv)[:4], output)
+
+        assert main([*args, "--resume"]) == 0
+        assert server.stats["book"] == 6
+        assert not os.path.exists(queue_path)
+
+        # Resuming a finished run keeps the output and fetches nothing.
+        assert main([*args, "--resume"]) == 0
+        assert server.stats["book"] == 6
+
+    enriched = load_books_from_csv(output)
+    assert [book.book_id for book in enriched] == [book.book_id for book in books]
+    assert all(book.isbn for book in enriched[4:])
+    assert not os.path.exists(queue_path)